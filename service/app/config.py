@@ -1,5 +1,6 @@
 import os
-from typing import List
+import tempfile
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
@@ -32,12 +33,169 @@ class Settings(BaseModel):
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 60
+
+    # Users allowed to use the admin/diagnostics endpoints (comma-separated emails)
+    ADMIN_EMAILS: List[str] = [
+        email.strip().lower() for email in os.environ.get("ADMIN_EMAILS", "").split(",") if email.strip()
+    ]
     
     # OpenAI LLM Configuration
     OPENAI_API_KEY: str = os.environ.get("OPENAI_API_KEY")
     OPENAI_MODEL: str = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
     OPENAI_TEMPERATURE: float = float(os.environ.get("OPENAI_TEMPERATURE", "0.7"))
 
+    # LLM provider: "openai", or "fake" for offline load/latency testing
+    LLM_PROVIDER: str = os.environ.get("LLM_PROVIDER", "openai")
+    # Record provider responses (JSONL) for replay by the fake provider
+    LLM_RECORD_RESPONSES_PATH: Optional[str] = os.environ.get("LLM_RECORD_RESPONSES_PATH")
+    LLM_FAKE_RECORDINGS_PATH: Optional[str] = os.environ.get("LLM_FAKE_RECORDINGS_PATH")
+    LLM_FAKE_LATENCY_DISTRIBUTION: str = os.environ.get("LLM_FAKE_LATENCY_DISTRIBUTION", "lognormal")
+    LLM_FAKE_TTFT_MS: float = float(os.environ.get("LLM_FAKE_TTFT_MS", "300"))
+    LLM_FAKE_LATENCY_SIGMA: float = float(os.environ.get("LLM_FAKE_LATENCY_SIGMA", "0.5"))
+    LLM_FAKE_TOKEN_MS: float = float(os.environ.get("LLM_FAKE_TOKEN_MS", "15"))
+    LLM_FAKE_RESPONSE_WORDS: int = int(os.environ.get("LLM_FAKE_RESPONSE_WORDS", "150"))
+    LLM_FAKE_ERROR_RATE: float = float(os.environ.get("LLM_FAKE_ERROR_RATE", "0"))
+    LLM_FAKE_SEED: Optional[int] = int(os.environ["LLM_FAKE_SEED"]) if os.environ.get("LLM_FAKE_SEED") else None
+
+    # LLM resilience (concurrency limit, deadlines, retries, circuit breaker)
+    LLM_MAX_CONCURRENCY: int = int(os.environ.get("LLM_MAX_CONCURRENCY", "8"))
+    LLM_TIMEOUT_SECONDS: float = float(os.environ.get("LLM_TIMEOUT_SECONDS", "60"))
+    LLM_MAX_RETRIES: int = int(os.environ.get("LLM_MAX_RETRIES", "2"))
+    LLM_RETRY_BASE_DELAY_SECONDS: float = float(os.environ.get("LLM_RETRY_BASE_DELAY_SECONDS", "0.5"))
+    LLM_RETRY_MAX_DELAY_SECONDS: float = float(os.environ.get("LLM_RETRY_MAX_DELAY_SECONDS", "8"))
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = int(os.environ.get("LLM_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    LLM_CIRCUIT_RESET_SECONDS: float = float(os.environ.get("LLM_CIRCUIT_RESET_SECONDS", "30"))
+
+    # Outbound HTTP: one pooled, keep-alive client per upstream for the app's lifetime.
+    # HTTP/2 is used when the optional `h2` package is installed.
+    HTTP2_ENABLED: bool = os.environ.get("HTTP2_ENABLED", "true").lower() == "true"
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = float(os.environ.get("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY_SECONDS", "60"))
+    HTTP_UPSTREAMS: Dict[str, Dict[str, Any]] = {
+        "google": {"timeout": 10.0, "max_connections": 20, "max_keepalive_connections": 10},
+        "openai": {"timeout": LLM_TIMEOUT_SECONDS, "max_connections": 50, "max_keepalive_connections": 20},
+    }
+    GOOGLE_CERTS_URL: str = "https://www.googleapis.com/oauth2/v1/certs"
+
+    # Per-task model routing. Each task lists profiles in order of preference;
+    # a profile whose first token misses its latency SLO is cut off and the next one is used.
+    LLM_FAST_MODEL: str = os.environ.get("LLM_FAST_MODEL", "gpt-4o-mini")
+    LLM_STRONG_MODEL: str = os.environ.get("LLM_STRONG_MODEL", "gpt-4o")
+    LLM_FAST_SLO_SECONDS: float = float(os.environ.get("LLM_FAST_SLO_SECONDS", "10"))
+    LLM_STRONG_SLO_SECONDS: float = float(os.environ.get("LLM_STRONG_SLO_SECONDS", "30"))
+    LLM_ROUTER_COOLDOWN_SECONDS: float = float(os.environ.get("LLM_ROUTER_COOLDOWN_SECONDS", "60"))
+    LLM_MODEL_PROFILES: Dict[str, Dict[str, Any]] = {
+        "fast": {
+            "model": LLM_FAST_MODEL,
+            "temperature": 0.0,
+            "max_tokens": 2048,
+            "timeout": LLM_TIMEOUT_SECONDS,
+            "latency_slo": LLM_FAST_SLO_SECONDS,
+        },
+        "default": {
+            "model": OPENAI_MODEL,
+            "temperature": OPENAI_TEMPERATURE,
+            "max_tokens": 2048,
+            "timeout": LLM_TIMEOUT_SECONDS,
+            "latency_slo": LLM_TIMEOUT_SECONDS,
+        },
+        "strong": {
+            "model": LLM_STRONG_MODEL,
+            "temperature": OPENAI_TEMPERATURE,
+            "max_tokens": 4096,
+            "timeout": LLM_TIMEOUT_SECONDS,
+            "latency_slo": LLM_STRONG_SLO_SECONDS,
+        },
+    }
+    LLM_TASK_ROUTES: Dict[str, List[str]] = {
+        "chat": ["default"],
+        "analysis": ["default"],
+        "extraction": ["fast", "default"],
+        "comparison": ["strong", "default"],
+        "summarization": ["fast", "default"],
+    }
+
+    # Call telemetry: per-user usage is buffered and written every FLUSH seconds.
+    # Prices are USD per 1M tokens, for cost estimates only.
+    LLM_USAGE_FLUSH_SECONDS: float = float(os.environ.get("LLM_USAGE_FLUSH_SECONDS", "30"))
+    LLM_MODEL_PRICES: Dict[str, Dict[str, float]] = {
+        "gpt-4o-mini": {"input": 0.15, "output": 0.60},
+        "gpt-4o": {"input": 2.50, "output": 10.00},
+    }
+
+    # Server-side chat conversations: once more than MAX recent messages pile up,
+    # older ones are folded into a rolling summary, keeping the last KEEP verbatim
+    LLM_CHAT_MAX_RECENT_MESSAGES: int = int(os.environ.get("LLM_CHAT_MAX_RECENT_MESSAGES", "12"))
+    LLM_CHAT_KEEP_RECENT_MESSAGES: int = int(os.environ.get("LLM_CHAT_KEEP_RECENT_MESSAGES", "6"))
+
+    # Prompt construction (token budget for scenario data, items listed per category)
+    LLM_PROMPT_TOKEN_BUDGET: int = int(os.environ.get("LLM_PROMPT_TOKEN_BUDGET", "3000"))
+    LLM_PROMPT_TOP_K: int = int(os.environ.get("LLM_PROMPT_TOP_K", "5"))
+
+    # Background LLM jobs
+    LLM_JOB_WORKERS: int = int(os.environ.get("LLM_JOB_WORKERS", "4"))
+    LLM_JOB_QUEUE_SIZE: int = int(os.environ.get("LLM_JOB_QUEUE_SIZE", "100"))
+    LLM_JOB_STALE_SECONDS: int = int(os.environ.get("LLM_JOB_STALE_SECONDS", "600"))
+    # How often pending jobs that didn't fit in the queue (or were requeued) are loaded
+    LLM_JOB_POLL_SECONDS: float = float(os.environ.get("LLM_JOB_POLL_SECONDS", "5"))
+
+    # NLP fast path (local rule-based parser tried before the LLM)
+    NLP_FAST_PATH_ENABLED: bool = os.environ.get("NLP_FAST_PATH_ENABLED", "true").lower() == "true"
+    NLP_FAST_PATH_MIN_CONFIDENCE: float = float(os.environ.get("NLP_FAST_PATH_MIN_CONFIDENCE", "1.0"))
+
+    # Near-duplicate cache for NLP parses (cosine similarity over hashed features)
+    NLP_SEMANTIC_CACHE_ENABLED: bool = os.environ.get("NLP_SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    NLP_SEMANTIC_CACHE_THRESHOLD: float = float(os.environ.get("NLP_SEMANTIC_CACHE_THRESHOLD", "0.95"))
+    NLP_SEMANTIC_CACHE_SIZE: int = int(os.environ.get("NLP_SEMANTIC_CACHE_SIZE", "500"))
+
+    # Batch NLP parsing: provider calls in flight per batch request
+    NLP_BATCH_CONCURRENCY: int = int(os.environ.get("NLP_BATCH_CONCURRENCY", "4"))
+
+    # Live scenario updates: writes within DEBOUNCE are merged into one delta;
+    # a subscriber more than QUEUE_SIZE deltas behind is told to resync
+    SCENARIO_EVENTS_DEBOUNCE_MS: int = int(os.environ.get("SCENARIO_EVENTS_DEBOUNCE_MS", "50"))
+    SCENARIO_EVENTS_QUEUE_SIZE: int = int(os.environ.get("SCENARIO_EVENTS_QUEUE_SIZE", "100"))
+    SCENARIO_EVENTS_KEEPALIVE_SECONDS: float = float(os.environ.get("SCENARIO_EVENTS_KEEPALIVE_SECONDS", "15"))
+
+    # Send per-request phase timings (auth, db, handler, serialize, llm) in a Server-Timing header.
+    # Off by default: the header shows every client how long DB and LLM work took
+    SERVER_TIMING_ENABLED: bool = os.environ.get("SERVER_TIMING_ENABLED", "false").lower() == "true"
+
+    # Prometheus /metrics. With several worker processes, point MULTIPROC_DIR at a
+    # directory shared by them: each writes a snapshot every SNAPSHOT seconds and a
+    # scrape of any worker reports the sum. TOKEN is required as a Bearer token; without
+    # it /metrics is not mounted.
+    METRICS_MULTIPROC_DIR: str = os.environ.get("METRICS_MULTIPROC_DIR", "")
+    METRICS_SNAPSHOT_SECONDS: float = float(os.environ.get("METRICS_SNAPSHOT_SECONDS", "5"))
+    METRICS_TOKEN: str = os.environ.get("METRICS_TOKEN", "")
+    # Event-loop lag sampling period. A loop stalled for BLOCK_THRESHOLD ms gets the
+    # blocking stack logged (0 disables). Test mode: with BLOCK_ASSERT ms > 0, any
+    # request that holds the loop longer fails with BlockingCallError.
+    LOOP_MONITOR_INTERVAL_SECONDS: float = float(os.environ.get("LOOP_MONITOR_INTERVAL_SECONDS", "0.5"))
+    LOOP_BLOCK_THRESHOLD_MS: float = float(os.environ.get("LOOP_BLOCK_THRESHOLD_MS", "100"))
+    LOOP_BLOCK_ASSERT_MS: float = float(os.environ.get("LOOP_BLOCK_ASSERT_MS", "0"))
+
+    # Slow-query log: statements over THRESHOLD ms (0 disables) are logged with an
+    # EXPLAIN plan and the last SAMPLE_SIZE are kept for GET /admin/slow-queries
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", "200"))
+    SLOW_QUERY_SAMPLE_SIZE: int = int(os.environ.get("SLOW_QUERY_SAMPLE_SIZE", "100"))
+    SLOW_QUERY_EXPLAIN: bool = os.environ.get("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+
+    # Log requests that run one query shape at least this many times (N+1 candidates; 0 disables)
+    QUERY_REPEAT_WARN_THRESHOLD: int = int(os.environ.get("QUERY_REPEAT_WARN_THRESHOLD", "5"))
+
+    # On-demand profiling of single requests by admins (X-Profile: 1 header or
+    # ?_profile=1). Profiles are written to DIR, keeping the newest KEEP. Off by
+    # default; point DIR at a private directory when enabling it.
+    PROFILING_ENABLED: bool = os.environ.get("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILE_DIR: str = os.environ.get("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "hch-profiles"))
+    PROFILE_KEEP: int = int(os.environ.get("PROFILE_KEEP", "50"))
+
+    # Response compression (gzip, or brotli when installed) for bodies of at least MIN_SIZE bytes
+    COMPRESSION_MIN_SIZE: int = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "4"))
+
     # Tortoise ORM Configuration
 
 settings = Settings()
@@ -53,6 +211,9 @@ TORTOISE_ORM: dict = {
                 "app.models.scenario",
                 "app.models.cost",
                 "app.models.revenue",
+                "app.models.llm_job",
+                "app.models.llm_conversation",
+                "app.models.llm_usage",
                 "aerich.models"
             ],
             "default_connection": "default",
@@ -1,4 +1,5 @@
 # app/main.py
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from tortoise.contrib.fastapi import register_tortoise
@@ -8,7 +9,28 @@ from app.router.costs import router as costs_router
 from app.router.scenarios import router as scenarios_router
 from app.router.revenues import router as revenues_router
 from app.config import settings, TORTOISE_ORM
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.loop_guard import BlockingCallGuardMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.query_audit import QueryAuditMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware, install_phase_hooks
+from app.utils.db_hooks import add_acquire_listener, add_query_listener, install_query_hooks
+from app.utils.request_timing import record_query
 from app.router.llm import router as llm_router
+from app.router.batch import router as batch_router
+from app.router.metrics import router as metrics_router
+from app.router.admin import router as admin_router
+from app.services.request_profiles import profile_store
+from app.services.slow_queries import slow_query_log
+from app.services.app_metrics import app_metrics
+from app.services.llm_job_queue import llm_job_queue
+from app.services.llm_telemetry import llm_telemetry
+from app.services.prompt_builder import load_tokenizer
+from app.services.default.auth_serivce import google_auth_service
+from app.utils.http_clients import http_clients
+
+logger = logging.getLogger(__name__)
 
 # Create FastAPI application
 app = FastAPI(
@@ -29,6 +51,40 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Negotiated gzip/brotli compression for larger responses
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
+# Warn about repeated query shapes within a request (N+1 candidates)
+if settings.QUERY_REPEAT_WARN_THRESHOLD > 0:
+    app.add_middleware(QueryAuditMiddleware, repeat_threshold=settings.QUERY_REPEAT_WARN_THRESHOLD)
+
+# Test mode: fail requests that block the event loop for too long
+if settings.LOOP_BLOCK_ASSERT_MS > 0:
+    app.add_middleware(BlockingCallGuardMiddleware, max_block_ms=settings.LOOP_BLOCK_ASSERT_MS)
+
+# On-demand profiling of single requests by admins
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, store=profile_store)
+
+# Prometheus request/DB metrics (served at /metrics)
+app.add_middleware(MetricsMiddleware, metrics=app_metrics)
+add_query_listener(app_metrics.record_query)
+add_acquire_listener(app_metrics.record_acquire)
+
+# Slow-query log with EXPLAIN plans (GET /admin/slow-queries)
+if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+    add_query_listener(slow_query_log.record)
+
+# Per-request phase timings (Server-Timing header and structured logs); outermost
+app.add_middleware(ServerTimingMiddleware, emit_header=settings.SERVER_TIMING_ENABLED)
+install_phase_hooks()
+add_query_listener(record_query)
+
 # ============================================================================
 # PUBLIC ROUTES (No authentication required)
 # ============================================================================
@@ -36,6 +92,12 @@ app.add_middleware(
 # Authentication routes - /auth/google (public), /auth/me (protected)
 app.include_router(google_auth_router)
 
+# Prometheus scrape endpoint (bearer METRICS_TOKEN); not mounted without a token
+if settings.METRICS_TOKEN:
+    app.include_router(metrics_router)
+else:
+    logger.warning("⚠️ METRICS_TOKEN is not set, /metrics is disabled")
+
 # ============================================================================
 # PROTECTED ROUTES (Authentication required)
 # ============================================================================
@@ -52,6 +114,12 @@ app.include_router(revenues_router)
 # LLM routes - all require authentication
 app.include_router(llm_router)
 
+# Batch route - runs several of the above in one round trip, authenticated once
+app.include_router(batch_router)
+
+# Admin/diagnostics routes - require an ADMIN_EMAILS user
+app.include_router(admin_router)
+
 # ============================================================================
 # DATABASE CONFIGURATION
 # ============================================================================
@@ -64,6 +132,29 @@ register_tortoise(
     add_exception_handlers=True,
 )
 
+# ============================================================================
+# BACKGROUND WORKERS
+# ============================================================================
+
+@app.on_event("startup")
+async def start_background_workers():
+    """Start background workers (runs after Tortoise is initialized)"""
+    install_query_hooks()
+    await llm_job_queue.start()
+    await llm_telemetry.start()
+    await app_metrics.start()
+    await google_auth_service.warm_up()
+    await load_tokenizer(settings.OPENAI_MODEL)
+
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    """Stop background workers"""
+    await llm_job_queue.stop()
+    await llm_telemetry.stop()
+    await app_metrics.stop()
+    await http_clients.aclose()
+
 # ============================================================================
 # HEALTH CHECK ENDPOINTS
 # ============================================================================
@@ -1,20 +1,16 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.utils.tokens import verify_token
+from app.config import settings
 from app.models.user import User
 from app.repositories.user_repo import UserRepository
+from app.utils.request_context import current_user_id
+from app.utils.request_timing import phase
 
 security = HTTPBearer()
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> User:
-    """
-    Dependency to get the current authenticated user from JWT token
-    Used for protected routes
-    """
-    token = credentials.credentials
-    
+async def authenticate_token(token: str) -> User:
+    """Resolve a JWT access token to its user, raising 401 if it isn't valid"""
     # Verify token
     payload = verify_token(token)
     if not payload:
@@ -40,4 +36,39 @@ async def get_current_user(
             detail="User not found",
         )
     
-    return user
\ No newline at end of file
+    return user
+
+async def get_current_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> User:
+    """
+    Dependency to get the current authenticated user from JWT token
+    Used for protected routes
+    """
+    # Sub-requests of POST /batch reuse the user authenticated for the batch
+    batch_user = getattr(request.state, "current_user", None)
+    if batch_user is not None:
+        current_user_id.set(batch_user.id)
+        return batch_user
+    
+    with phase("auth"):
+        user = await authenticate_token(credentials.credentials)
+    
+    current_user_id.set(user.id)
+    return user
+
+def is_admin(user: User) -> bool:
+    """Whether the user is listed in ADMIN_EMAILS"""
+    return user.email.lower() in settings.ADMIN_EMAILS
+
+async def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    """
+    Dependency for admin/diagnostics routes
+    """
+    if not is_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return current_user
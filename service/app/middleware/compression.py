@@ -0,0 +1,113 @@
+import gzip
+from typing import Optional
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/msgpack", "application/x-msgpack", "text/")
+
+# Bodies larger than this are compressed in a worker thread so the event loop isn't blocked
+THREADED_COMPRESSION_SIZE = 256 * 1024
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the content coding from an Accept-Encoding header: the highest
+    q-value among those available, preferring brotli on ties.
+    """
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in ("br", "gzip") if brotli else ("gzip",):
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress complete responses with gzip or brotli as negotiated by
+    Accept-Encoding. Streaming responses (SSE, NDJSON) are passed through
+    untouched so events aren't held back by the compressor.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSender(self, encoding, send).send)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+
+class _CompressingSender:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self.passthrough:
+            await self._send(message)
+        elif message["type"] == "http.response.start":
+            self.start_message = message
+        elif message["type"] == "http.response.body":
+            await self._send_body(message)
+        else:
+            await self._send(message)
+
+    async def _send_body(self, message: Message) -> None:
+        self.passthrough = True  # Everything after the first body message goes straight out
+        body = message.get("body", b"")
+        headers = MutableHeaders(raw=self.start_message["headers"])
+
+        if (
+            message.get("more_body", False)
+            or len(body) < self.middleware.minimum_size
+            or "content-encoding" in headers
+            or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        ):
+            await self._send(self.start_message)
+            await self._send(message)
+            return
+
+        if len(body) >= THREADED_COMPRESSION_SIZE:
+            body = await anyio.to_thread.run_sync(self.middleware.compress, self.encoding, body)
+        else:
+            body = self.middleware.compress(self.encoding, body)
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(body))
+        headers.add_vary_header("Accept-Encoding")
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": body})
@@ -0,0 +1,30 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.utils.loop_monitor import BlockingCallError
+from app.utils.profiling import CoroutineProfile
+
+
+class BlockingCallGuardMiddleware:
+    """
+    Test-mode check (LOOP_BLOCK_ASSERT_MS): fail any request whose handling
+    ran longer than `max_block_ms` without yielding to the event loop, e.g. a
+    synchronous HTTP call or a CPU-heavy loop inside an async handler. The
+    error is raised after the response, so TestClient re-raises it in the test.
+    """
+
+    def __init__(self, app: ASGIApp, max_block_ms: float):
+        self.app = app
+        self.max_block_ms = max_block_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        steps = CoroutineProfile(cpu=False)
+        await steps.run(self.app(scope, receive, send))
+        if steps.max_step_ms > self.max_block_ms:
+            raise BlockingCallError(
+                f"{scope['method']} {scope['path']} blocked the event loop for "
+                f"{steps.max_step_ms:.0f} ms (limit {self.max_block_ms:g} ms) "
+                f"after resuming from {steps.max_step_site}"
+            )
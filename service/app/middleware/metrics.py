@@ -0,0 +1,42 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.services.app_metrics import AppMetrics
+
+
+class MetricsMiddleware:
+    """
+    Count requests and time them per route template (e.g. /costs/{cost_id},
+    or "unmatched" for 404s, so paths can't blow up label cardinality).
+    Streaming responses are timed until their last chunk.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: AppMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.metrics.request_started(method)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            self.metrics.request_finished(
+                method,
+                getattr(route, "path", "unmatched"),
+                status_code,
+                (time.perf_counter() - started) * 1000,
+            )
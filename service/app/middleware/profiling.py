@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from urllib.parse import parse_qs
+from fastapi import HTTPException
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.middleware.auth import authenticate_token, is_admin
+from app.services.request_profiles import ProfileStore
+from app.utils.profiling import CoroutineProfile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "_profile"
+
+
+def _flag_set(value: str) -> bool:
+    return value.lower() in ("1", "true", "yes")
+
+
+class ProfilingMiddleware:
+    """
+    Profile a single request when an admin asks for it with an `X-Profile: 1`
+    header or `?_profile=1`. The response carries an X-Profile-Id header; the
+    profile is served by /admin/profiles/{id}. Requests without the flag only
+    pay for the header/query check.
+    """
+
+    def __init__(self, app: ASGIApp, store: ProfileStore):
+        self.app = app
+        self.store = store
+
+    def _requested(self, scope: Scope) -> bool:
+        if _flag_set(Headers(scope=scope).get(PROFILE_HEADER, "")):
+            return True
+        query = scope.get("query_string", b"")
+        if PROFILE_QUERY_PARAM.encode() not in query:
+            return False
+        values = parse_qs(query.decode("latin-1")).get(PROFILE_QUERY_PARAM, [])
+        return any(_flag_set(value) for value in values)
+
+    async def _is_admin(self, scope: Scope) -> bool:
+        scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        try:
+            return is_admin(await authenticate_token(token))
+        except HTTPException:
+            return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._requested(scope) or not await self._is_admin(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = self.store.new_id()
+        profile = CoroutineProfile()
+        status_code = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        try:
+            await profile.run(self.app(scope, receive, send_with_profile_id))
+        finally:
+            route = scope.get("route")
+            request = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(route, "path", None),
+                "status": status_code,
+            }
+            try:
+                await asyncio.to_thread(self.store.save, profile_id, profile, request)
+                logger.info(f"Profiled {scope['method']} {scope['path']} as {profile_id} ({profile.wall_ms:.0f} ms)")
+            except Exception as e:
+                logger.error(f"❌ Failed to store profile {profile_id}: {str(e)}")
@@ -0,0 +1,35 @@
+import logging
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.utils.query_capture import capture_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryAuditMiddleware:
+    """
+    Log requests that run the same query shape `repeat_threshold` or more
+    times - usually an N+1 pattern (a query per item of a list).
+    """
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with capture_queries(current_context_only=True) as queries:
+            await self.app(scope, receive, send)
+
+        if queries.count < self.repeat_threshold:
+            return
+        repeated = queries.repeated_queries(self.repeat_threshold)
+        if repeated:
+            route = scope.get("route")
+            details = "\n".join(f"  {count}x {shape}" for shape, count in repeated.items())
+            logger.warning(
+                f"⚠️ Possible N+1 queries in {scope['method']} {getattr(route, 'path', scope['path'])} "
+                f"({queries.count} queries):\n{details}"
+            )
@@ -0,0 +1,100 @@
+import inspect
+import logging
+from functools import wraps
+from typing import Callable, List
+import fastapi.routing
+from starlette.datastructures import MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils.request_timing import RequestTimings, current_timings, phase
+
+logger = logging.getLogger(__name__)
+
+
+class ServerTimingMiddleware:
+    """
+    Track phase timings for each request, report them in a Server-Timing
+    header (when enabled) and log them as structured fields once the
+    response has been sent. Register it last so it wraps everything else.
+    """
+
+    def __init__(self, app: ASGIApp, emit_header: bool = False):
+        self.app = app
+        self.emit_header = emit_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.emit_header:
+                    MutableHeaders(scope=message).append("Server-Timing", timings.server_timing_header())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_timings.reset(token)
+            self._log(scope, status_code, timings)
+
+    def _log(self, scope: Scope, status_code: int, timings: RequestTimings) -> None:
+        route = scope.get("route")
+        fields = {
+            "method": scope["method"],
+            "route": getattr(route, "path", scope["path"]),  # Template, e.g. /costs/{cost_id}
+            "status": status_code,
+            "total_ms": round(timings.elapsed_ms(), 1),
+            **timings.log_fields(),
+        }
+        logger.info(
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+            extra={"request_timing": fields},
+        )
+
+
+def _timed(phase_name: str, fn: Callable) -> Callable:
+    if getattr(fn, "__timed_phase__", None):
+        return fn
+
+    @wraps(fn)
+    async def async_wrapper(*args, **kwargs):
+        with phase(phase_name):
+            return await fn(*args, **kwargs)
+
+    @wraps(fn)
+    def sync_wrapper(*args, **kwargs):
+        with phase(phase_name):
+            return fn(*args, **kwargs)
+
+    wrapper = async_wrapper if inspect.iscoroutinefunction(fn) else sync_wrapper
+    wrapper.__timed_phase__ = phase_name
+    return wrapper
+
+
+def _response_classes(cls: type) -> List[type]:
+    classes = [cls]
+    for subclass in cls.__subclasses__():
+        classes.extend(_response_classes(subclass))
+    return classes
+
+
+def install_phase_hooks() -> None:
+    """
+    Time FastAPI's handler and serialization steps. FastAPI looks these
+    functions up in fastapi.routing at call time, so replacing them there
+    covers every route. Call after all routers are imported; safe to repeat.
+    """
+    fastapi.routing.run_endpoint_function = _timed("handler", fastapi.routing.run_endpoint_function)
+    fastapi.routing.serialize_response = _timed("serialize", fastapi.routing.serialize_response)
+    # Response.render itself only encodes str/bytes bodies
+    for cls in _response_classes(Response)[1:]:
+        if "render" in cls.__dict__:
+            cls.render = _timed("serialize", cls.__dict__["render"])
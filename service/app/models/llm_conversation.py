@@ -0,0 +1,36 @@
+from tortoise.models import Model
+from tortoise import fields
+import uuid
+
+class LLMConversation(Model):
+    id = fields.UUIDField(pk=True, default=uuid.uuid4)
+    system_prompt = fields.TextField(null=True)
+    summary = fields.TextField(default="")  # rolling summary of older turns
+    summarized_through = fields.IntField(default=0)  # seq of the last message folded into the summary
+    last_seq = fields.IntField(default=0)  # seq of the latest message
+    user = fields.ForeignKeyField(
+        "models.User",
+        related_name="llm_conversations",
+        on_delete=fields.CASCADE
+    )
+    created_at = fields.DatetimeField(auto_now_add=True)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "llm_conversations"
+
+
+class LLMConversationMessage(Model):
+    id = fields.BigIntField(pk=True)
+    seq = fields.IntField()  # 1-based position within the conversation
+    role = fields.CharField(max_length=10)  # user | assistant
+    content = fields.TextField()
+    conversation = fields.ForeignKeyField(
+        "models.LLMConversation",
+        related_name="messages",
+        on_delete=fields.CASCADE
+    )
+
+    class Meta:
+        table = "llm_conversation_messages"
+        unique_together = (("conversation", "seq"),)
@@ -0,0 +1,22 @@
+from tortoise.models import Model
+from tortoise import fields
+import uuid
+
+class LLMJob(Model):
+    id = fields.UUIDField(pk=True, default=uuid.uuid4)
+    task = fields.CharField(max_length=20)  # compare | analyze | parse
+    status = fields.CharField(max_length=20, default="pending")  # pending | running | completed | failed
+    payload = fields.JSONField()
+    result = fields.JSONField(null=True)
+    error = fields.TextField(null=True)
+    user = fields.ForeignKeyField(
+        "models.User",
+        related_name="llm_jobs",
+        on_delete=fields.CASCADE
+    )
+    created_at = fields.DatetimeField(auto_now_add=True)
+    started_at = fields.DatetimeField(null=True)
+    finished_at = fields.DatetimeField(null=True)
+
+    class Meta:
+        table = "llm_jobs"
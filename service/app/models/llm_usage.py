@@ -0,0 +1,25 @@
+from tortoise.models import Model
+from tortoise import fields
+
+class LLMUsage(Model):
+    """Daily LLM usage per user, task and model"""
+    id = fields.BigIntField(pk=True)
+    day = fields.DateField()
+    task = fields.CharField(max_length=20)
+    model = fields.CharField(max_length=100)
+    calls = fields.IntField(default=0)
+    errors = fields.IntField(default=0)
+    cache_hits = fields.IntField(default=0)  # Served by fast path, semantic cache or coalescing
+    prompt_tokens = fields.BigIntField(default=0)
+    completion_tokens = fields.BigIntField(default=0)
+    cost_usd = fields.DecimalField(max_digits=12, decimal_places=6, default=0)
+    total_latency_ms = fields.FloatField(default=0)
+    user = fields.ForeignKeyField(
+        "models.User",
+        related_name="llm_usage",
+        on_delete=fields.CASCADE
+    )
+
+    class Meta:
+        table = "llm_usage"
+        unique_together = (("user", "day", "task", "model"),)
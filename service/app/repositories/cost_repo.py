@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 from uuid import UUID
 from tortoise.exceptions import DoesNotExist
 from app.models.cost import Cost
@@ -83,17 +83,24 @@ class CostRepository:
 
     @staticmethod
     async def create_costs_bulk(costs_data: List[dict]) -> List[Cost]:
-        """Create multiple cost items in bulk"""
+        """Create multiple cost items in bulk (one scenario lookup and one insert)"""
+        scenario_ids = {UUID(str(data["scenario_id"])) for data in costs_data if "scenario_id" in data}
+        scenarios = {}
+        if scenario_ids:
+            scenarios = {scenario.id: scenario for scenario in await Scenario.filter(id__in=scenario_ids)}
+        
         costs = []
         for cost_data in costs_data:
             # Convert scenario_id to scenario object
             if "scenario_id" in cost_data:
-                scenario_id = cost_data.pop("scenario_id")
-                scenario = await Scenario.get(id=scenario_id)
-                cost_data["scenario"] = scenario
-            
-            cost = await Cost.create(**cost_data)
-            costs.append(cost)
+                scenario_id = UUID(str(cost_data.pop("scenario_id")))
+                if scenario_id not in scenarios:
+                    raise DoesNotExist(Scenario)
+                cost_data["scenario"] = scenarios[scenario_id]
+            costs.append(Cost(**cost_data))
+        
+        if costs:
+            await Cost.bulk_create(costs)
         return costs
 
     @staticmethod
@@ -101,6 +108,17 @@ class CostRepository:
         """Get all costs for a scenario"""
         return await Cost.filter(scenario_id=scenario_id).all()
 
+    @staticmethod
+    async def get_costs_by_scenarios(scenario_ids: List[UUID]) -> List[Cost]:
+        """Get all costs for several scenarios in one query"""
+        return await Cost.filter(scenario_id__in=scenario_ids).all()
+
+    @staticmethod
+    async def get_cost_rows(fields: Tuple[str, ...], scenario_id: Optional[UUID] = None) -> List[Dict[str, Any]]:
+        """Get costs as `.values()` dicts (no model instances), optionally for one scenario"""
+        query = Cost.filter(scenario_id=scenario_id) if scenario_id else Cost.all()
+        return await query.values(*fields)
+
     @staticmethod
     async def get_all_costs() -> List[Cost]:
         """Get all costs"""
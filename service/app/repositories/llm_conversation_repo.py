@@ -0,0 +1,75 @@
+from typing import Optional, List, Dict
+from uuid import UUID
+from tortoise.exceptions import DoesNotExist
+from tortoise.expressions import F
+from tortoise.transactions import in_transaction
+from app.models.llm_conversation import LLMConversation, LLMConversationMessage
+
+class LLMConversationRepository:
+    """Repository for LLMConversation and LLMConversationMessage operations"""
+
+    @staticmethod
+    async def create_conversation(user_id: UUID, system_prompt: Optional[str] = None) -> LLMConversation:
+        """Create an empty conversation"""
+        return await LLMConversation.create(user_id=user_id, system_prompt=system_prompt)
+
+    @staticmethod
+    async def get_conversation_for_user(conversation_id: UUID, user_id: UUID) -> Optional[LLMConversation]:
+        """Get a conversation by ID, only if it belongs to the user"""
+        try:
+            return await LLMConversation.get(id=conversation_id, user_id=user_id)
+        except DoesNotExist:
+            return None
+
+    @staticmethod
+    async def delete_conversation(conversation_id: UUID, user_id: UUID) -> bool:
+        """Delete a conversation and its messages"""
+        deleted = await LLMConversation.filter(id=conversation_id, user_id=user_id).delete()
+        return deleted > 0
+
+    @staticmethod
+    async def append_messages(conversation_id: UUID, messages: List[Dict[str, str]]) -> int:
+        """
+        Append role/content messages, numbering them after the current last seq.
+        Returns the new last seq.
+        """
+        async with in_transaction():
+            # Reserve seq numbers atomically so concurrent appends don't collide
+            await LLMConversation.filter(id=conversation_id).update(last_seq=F("last_seq") + len(messages))
+            last_seq = await LLMConversation.filter(id=conversation_id).first().values_list("last_seq", flat=True)
+            first_seq = last_seq - len(messages) + 1
+            await LLMConversationMessage.bulk_create([
+                LLMConversationMessage(
+                    conversation_id=conversation_id,
+                    seq=first_seq + offset,
+                    role=message["role"],
+                    content=message["content"],
+                )
+                for offset, message in enumerate(messages)
+            ])
+        return last_seq
+
+    @staticmethod
+    async def get_messages_after(conversation_id: UUID, seq: int) -> List[LLMConversationMessage]:
+        """Messages with seq greater than the given one, oldest first"""
+        return await LLMConversationMessage.filter(
+            conversation_id=conversation_id,
+            seq__gt=seq
+        ).order_by("seq")
+
+    @staticmethod
+    async def update_summary(conversation_id: UUID, expected_through: int, summary: str, summarized_through: int) -> bool:
+        """
+        Store a new rolling summary, unless another summarization already
+        moved summarized_through past expected_through.
+        """
+        updated = await LLMConversation.filter(
+            id=conversation_id,
+            summarized_through=expected_through
+        ).update(summary=summary, summarized_through=summarized_through)
+        return updated == 1
+
+    @staticmethod
+    async def delete_messages_through(conversation_id: UUID, seq: int) -> int:
+        """Drop messages already folded into the summary"""
+        return await LLMConversationMessage.filter(conversation_id=conversation_id, seq__lte=seq).delete()
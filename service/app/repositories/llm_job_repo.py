@@ -0,0 +1,83 @@
+from datetime import datetime, timezone
+from typing import Optional, List, Any, Iterable
+from uuid import UUID
+from tortoise.exceptions import DoesNotExist
+from app.models.llm_job import LLMJob
+
+class LLMJobRepository:
+    """Repository for LLMJob model operations"""
+
+    @staticmethod
+    async def create_job(user_id: UUID, task: str, payload: dict) -> LLMJob:
+        """Create a new pending job"""
+        return await LLMJob.create(
+            user_id=user_id,
+            task=task,
+            payload=payload,
+            status="pending"
+        )
+
+    @staticmethod
+    async def get_job_by_id(job_id: UUID) -> Optional[LLMJob]:
+        """Get job by ID"""
+        try:
+            return await LLMJob.get(id=job_id)
+        except DoesNotExist:
+            return None
+
+    @staticmethod
+    async def get_job_for_user(job_id: UUID, user_id: UUID) -> Optional[LLMJob]:
+        """Get a job by ID, only if it belongs to the user"""
+        try:
+            return await LLMJob.get(id=job_id, user_id=user_id)
+        except DoesNotExist:
+            return None
+
+    @staticmethod
+    async def claim_job(job_id: UUID) -> bool:
+        """
+        Atomically move a pending job to running.
+        Returns False if another worker already claimed it.
+        """
+        updated = await LLMJob.filter(id=job_id, status="pending").update(
+            status="running",
+            started_at=datetime.now(timezone.utc)
+        )
+        return updated == 1
+
+    @staticmethod
+    async def complete_job(job_id: UUID, result: Any) -> None:
+        """Store the result of a finished job"""
+        await LLMJob.filter(id=job_id).update(
+            status="completed",
+            result=result,
+            finished_at=datetime.now(timezone.utc)
+        )
+
+    @staticmethod
+    async def fail_job(job_id: UUID, error: str) -> None:
+        """Mark a job as failed"""
+        await LLMJob.filter(id=job_id).update(
+            status="failed",
+            error=error,
+            finished_at=datetime.now(timezone.utc)
+        )
+
+    @staticmethod
+    async def requeue_stale_jobs(started_before: datetime) -> int:
+        """Reset jobs left running by a dead worker back to pending"""
+        return await LLMJob.filter(status="running", started_at__lt=started_before).update(
+            status="pending",
+            started_at=None
+        )
+
+    @staticmethod
+    async def get_pending_job_ids(limit: Optional[int] = None, exclude: Iterable[UUID] = ()) -> List[UUID]:
+        """IDs of pending jobs, oldest first"""
+        query = LLMJob.filter(status="pending").order_by("created_at")
+        exclude = list(exclude)
+        if exclude:
+            query = query.exclude(id__in=exclude)
+        if limit is not None:
+            query = query.limit(limit)
+        return await query.values_list("id", flat=True)
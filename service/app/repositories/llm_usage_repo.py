@@ -0,0 +1,35 @@
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List
+from uuid import UUID
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import F
+from app.models.llm_usage import LLMUsage
+
+USAGE_COUNTERS = ("calls", "errors", "cache_hits", "prompt_tokens", "completion_tokens", "cost_usd", "total_latency_ms")
+
+class LLMUsageRepository:
+    """Repository for LLMUsage model operations"""
+
+    @staticmethod
+    async def add_usage(user_id: UUID, day: date, task: str, model: str, counters: Dict[str, Any]) -> None:
+        """Add counters to the (user, day, task, model) row, creating it if needed"""
+        counters = {
+            name: Decimal(str(value)) if name == "cost_usd" else value
+            for name, value in counters.items() if name in USAGE_COUNTERS
+        }
+        lookup = {"user_id": user_id, "day": day, "task": task, "model": model}
+        increments = {name: F(name) + value for name, value in counters.items()}
+
+        if await LLMUsage.filter(**lookup).update(**increments):
+            return
+        try:
+            await LLMUsage.create(**lookup, **counters)
+        except IntegrityError:
+            # Another worker created the row in the meantime
+            await LLMUsage.filter(**lookup).update(**increments)
+
+    @staticmethod
+    async def get_usage_for_user(user_id: UUID, since: date) -> List[LLMUsage]:
+        """Usage rows for a user since a day, newest first"""
+        return await LLMUsage.filter(user_id=user_id, day__gte=since).order_by("-day", "task", "model")
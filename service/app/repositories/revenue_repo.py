@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 from uuid import UUID
 from tortoise.exceptions import DoesNotExist
 from app.models.revenue import Revenue
@@ -83,17 +83,24 @@ class RevenueRepository:
 
     @staticmethod
     async def create_revenues_bulk(revenues_data: List[dict]) -> List[Revenue]:
-        """Create multiple revenue items in bulk"""
+        """Create multiple revenue items in bulk (one scenario lookup and one insert)"""
+        scenario_ids = {UUID(str(data["scenario_id"])) for data in revenues_data if "scenario_id" in data}
+        scenarios = {}
+        if scenario_ids:
+            scenarios = {scenario.id: scenario for scenario in await Scenario.filter(id__in=scenario_ids)}
+        
         revenues = []
         for revenue_data in revenues_data:
             # Convert scenario_id to scenario object
             if "scenario_id" in revenue_data:
-                scenario_id = revenue_data.pop("scenario_id")
-                scenario = await Scenario.get(id=scenario_id)
-                revenue_data["scenario"] = scenario
-            
-            revenue = await Revenue.create(**revenue_data)
-            revenues.append(revenue)
+                scenario_id = UUID(str(revenue_data.pop("scenario_id")))
+                if scenario_id not in scenarios:
+                    raise DoesNotExist(Scenario)
+                revenue_data["scenario"] = scenarios[scenario_id]
+            revenues.append(Revenue(**revenue_data))
+        
+        if revenues:
+            await Revenue.bulk_create(revenues)
         return revenues
 
     @staticmethod
@@ -101,6 +108,17 @@ class RevenueRepository:
         """Get all revenues for a scenario"""
         return await Revenue.filter(scenario_id=scenario_id).all()
 
+    @staticmethod
+    async def get_revenues_by_scenarios(scenario_ids: List[UUID]) -> List[Revenue]:
+        """Get all revenues for several scenarios in one query"""
+        return await Revenue.filter(scenario_id__in=scenario_ids).all()
+
+    @staticmethod
+    async def get_revenue_rows(fields: Tuple[str, ...], scenario_id: Optional[UUID] = None) -> List[Dict[str, Any]]:
+        """Get revenues as `.values()` dicts (no model instances), optionally for one scenario"""
+        query = Revenue.filter(scenario_id=scenario_id) if scenario_id else Revenue.all()
+        return await query.values(*fields)
+
     @staticmethod
     async def get_all_revenues() -> List[Revenue]:
         """Get all revenues"""
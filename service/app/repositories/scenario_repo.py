@@ -30,6 +30,11 @@ class ScenarioRepository:
         except DoesNotExist:
             return None
 
+    @staticmethod
+    async def get_scenarios_by_ids(scenario_ids: List[UUID]) -> List[Scenario]:
+        """Get several scenarios in one query (missing IDs are skipped)"""
+        return await Scenario.filter(id__in=scenario_ids).all()
+
     @staticmethod
     async def get_all_scenarios() -> List[Scenario]:
         """Get all scenarios"""
@@ -0,0 +1,58 @@
+from typing import Any, Dict, List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+from app.middleware.auth import require_admin
+from app.models.user import User
+from app.services.app_metrics import app_metrics
+from app.services.request_profiles import profile_store
+from app.services.slow_queries import slow_query_log
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/profiles", response_model=List[Dict[str, Any]])
+async def list_profiles(_admin: User = Depends(require_admin)):
+    """Stored request profiles, newest first (record one with `X-Profile: 1`)"""
+    return profile_store.list()
+
+
+@router.get("/profiles/{profile_id}", response_model=Dict[str, Any])
+async def get_profile(profile_id: str, _admin: User = Depends(require_admin)):
+    """Profile summary: wall/on-loop/await time, slowest await sites and the pstats report"""
+    profile = profile_store.get(profile_id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return profile
+
+
+@router.get("/profiles/{profile_id}/download")
+async def download_profile(profile_id: str, _admin: User = Depends(require_admin)):
+    """Raw cProfile data (open with pstats or snakeviz)"""
+    path = profile_store.raw_path(profile_id)
+    if not path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+
+@router.get("/event-loop", response_model=Dict[str, Any])
+async def event_loop_stats(_admin: User = Depends(require_admin)):
+    """Event-loop lag and the stacks of recent blocking calls"""
+    return app_metrics.loop_monitor.stats()
+
+
+@router.get("/slow-queries", response_model=Dict[str, Any])
+async def slow_queries(
+    limit: int = Query(50, ge=1, le=500),
+    _admin: User = Depends(require_admin)
+):
+    """Recent slow statements of this worker (normalized SQL, redacted params, caller, EXPLAIN plan)"""
+    return {
+        **slow_query_log.stats(),
+        "samples": slow_query_log.recent(limit),
+    }
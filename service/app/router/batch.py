@@ -0,0 +1,165 @@
+import asyncio
+import json
+import logging
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List, Literal, Optional
+from fastapi import APIRouter, Depends, Request
+from pydantic import BaseModel, Field, field_validator
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from app.middleware.auth import get_current_user
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["Batch"])
+
+MAX_BATCH_REQUESTS = 20
+
+# Sub-request headers forwarded from the batch request
+FORWARDED_HEADERS = ("host", "authorization", "accept-language", "user-agent")
+
+# Responses that never complete (SSE) or complete only when a job finishes;
+# buffering them would hold the whole batch
+STREAMING_CONTENT_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+class _StreamingSubResponse(Exception):
+    """Raised from a sub-request's send() to abort a streaming response"""
+
+
+class SubRequest(BaseModel):
+    """One request inside a batch"""
+    id: Optional[str] = None  # Echoed back to match responses; defaults to the index
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str = Field(..., min_length=1)
+    body: Optional[Any] = None
+
+    @field_validator("path")
+    @classmethod
+    def validate_path(cls, path: str) -> str:
+        if not path.startswith("/"):
+            raise ValueError("path must start with '/'")
+        if path.split("?", 1)[0].rstrip("/") == "/batch":
+            raise ValueError("batches cannot be nested")
+        return path
+
+
+class BatchRequest(BaseModel):
+    requests: List[SubRequest] = Field(..., min_length=1, max_length=MAX_BATCH_REQUESTS)
+
+
+def group_requests(requests: List[SubRequest]) -> List[List[int]]:
+    """
+    Split sub-requests (by index) into groups run one after another.
+    Consecutive GETs are independent and share a group that runs
+    concurrently; each write gets its own group, so it sees every earlier
+    sub-request's effects and later ones see its effects.
+    """
+    groups: List[List[int]] = []
+    for index, sub in enumerate(requests):
+        if sub.method == "GET" and groups and requests[groups[-1][0]].method == "GET":
+            groups[-1].append(index)
+        else:
+            groups.append([index])
+    return groups
+
+
+async def dispatch(request: Request, user: User, sub: SubRequest) -> Dict[str, Any]:
+    """
+    Run a sub-request through the app's router in-process (no HTTP round trip
+    or outer middleware) as the already authenticated user.
+    """
+    path, _, query = sub.path.partition("?")
+    body = b"" if sub.body is None else json.dumps(sub.body).encode()
+    headers = [
+        (name.encode(), value.encode())
+        for name, value in request.headers.items() if name in FORWARDED_HEADERS
+    ]
+    if sub.body is not None:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+
+    body_sent = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal body_sent
+        if body_sent:
+            # Like a client that stays connected: wait (until cancelled) instead of
+            # handing streaming responses' disconnect listeners a busy loop
+            await asyncio.Event().wait()
+        body_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status_code = 500
+    response_headers: Dict[str, str] = {}
+    chunks: List[bytes] = []
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status_code, response_headers
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            response_headers = {name.decode().lower(): value.decode() for name, value in message["headers"]}
+            if response_headers.get("content-type", "").startswith(STREAMING_CONTENT_TYPES):
+                raise _StreamingSubResponse()
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    async with AsyncExitStack() as stack:
+        scope = {
+            "type": "http",
+            "asgi": request.scope.get("asgi", {"version": "3.0"}),
+            "http_version": request.scope.get("http_version", "1.1"),
+            "scheme": request.scope.get("scheme", "http"),
+            "server": request.scope.get("server"),
+            "client": request.scope.get("client"),
+            "root_path": request.scope.get("root_path", ""),
+            "method": sub.method,
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "headers": headers,
+            "app": request.scope["app"],
+            "state": {"current_user": user},
+            # Normally set by the outer middleware this dispatch bypasses
+            "starlette.exception_handlers": request.scope["starlette.exception_handlers"],
+            "fastapi_middleware_astack": stack,
+        }
+        try:
+            await request.app.router(scope, receive, send)
+        except _StreamingSubResponse:
+            return {"status": 400, "body": {"detail": "Streaming responses (SSE, NDJSON) cannot be batched"}}
+        except StarletteHTTPException as e:
+            # Raised by the router itself for unknown paths / methods
+            return {"status": e.status_code, "body": {"detail": e.detail}}
+        except Exception as e:
+            logger.error(f"❌ Batch sub-request {sub.method} {sub.path} failed: {str(e)}")
+            return {"status": 500, "body": {"detail": "Internal server error"}}
+
+    raw = b"".join(chunks)
+    if response_headers.get("content-type", "").startswith("application/json") and raw:
+        content = json.loads(raw)
+    else:
+        content = raw.decode("utf-8", errors="replace") or None
+    return {"status": status_code, "body": content}
+
+
+@router.post("/batch", response_model=Dict[str, Any])
+async def batch(
+    request: Request,
+    batch_request: BatchRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Execute several API requests in one round trip.
+    
+    The batch is authenticated once and every sub-request runs as that user.
+    Consecutive GETs run concurrently; writes run in order. Sub-request
+    failures are reported per response, the batch itself returns 200.
+    Streaming endpoints (SSE, NDJSON) are answered with a 400 sub-response.
+    """
+    subs = batch_request.requests
+    results: List[Optional[Dict[str, Any]]] = [None] * len(subs)
+    for group in group_requests(subs):
+        responses = await asyncio.gather(*(dispatch(request, current_user, subs[i]) for i in group))
+        for index, response in zip(group, responses):
+            results[index] = {"id": subs[index].id or str(index), **response}
+    return {"responses": results}
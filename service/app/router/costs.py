@@ -1,11 +1,15 @@
 from uuid import UUID
 from typing import Optional, List
 from enum import Enum
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, Request, status, Depends, Query
 from pydantic import BaseModel, Field
 from app.middleware.auth import get_current_user
 from app.models.user import User
+from app.models.cost import Cost
 from app.repositories.cost_repo import CostRepository
+from app.utils.fast_json import FastJSONResponse, response_fields
+from app.utils.wire_format import ListLayout, list_response
+from app.services.scenario_events import scenario_events
 import logging
 
 logger = logging.getLogger(__name__)
@@ -81,6 +85,9 @@ def _cost_to_dict(cost) -> dict:
         "updated_at": cost.updated_at.isoformat(),
     }
 
+# List endpoints serialize DB rows directly (see FastJSONResponse)
+COST_LIST_FIELDS = response_fields(CostResponse, Cost)
+
 # API Endpoints
 
 @router.post("", response_model=CostResponse, status_code=status.HTTP_201_CREATED)
@@ -104,7 +111,9 @@ async def create_cost(
         )
         
         logger.info(f"✅ Cost created: ID={cost.id}")
-        return CostResponse(**_cost_to_dict(cost))
+        cost_dict = _cost_to_dict(cost)
+        scenario_events.publish_rows("costs", [cost_dict])
+        return CostResponse(**cost_dict)
         
     except Exception as e:
         logger.error(f"❌ Error creating cost: {str(e)}")
@@ -138,7 +147,9 @@ async def create_costs_bulk(
         costs = await CostRepository.create_costs_bulk(costs_data)
         
         logger.info(f"✅ {len(costs)} costs created")
-        return [CostResponse(**_cost_to_dict(cost)) for cost in costs]
+        cost_dicts = [_cost_to_dict(cost) for cost in costs]
+        scenario_events.publish_rows("costs", cost_dicts)
+        return [CostResponse(**cost_dict) for cost_dict in cost_dicts]
         
     except Exception as e:
         logger.error(f"❌ Error creating costs in bulk: {str(e)}")
@@ -183,7 +194,11 @@ async def update_cost(
             )
         
         logger.info(f"✅ Cost updated: ID={updated_cost.id}")
-        return CostResponse(**_cost_to_dict(updated_cost))
+        cost_dict = _cost_to_dict(updated_cost)
+        if existing_cost.scenario_id != updated_cost.scenario_id:
+            scenario_events.publish(existing_cost.scenario_id, "costs", deleted_ids=[cost_id])
+        scenario_events.publish_rows("costs", [cost_dict])
+        return CostResponse(**cost_dict)
         
     except HTTPException:
         raise
@@ -194,18 +209,20 @@ async def update_cost(
             detail=f"Error updating cost: {str(e)}"
         )
 
-@router.get("", response_model=List[CostResponse])
+@router.get("", response_model=List[CostResponse], response_class=FastJSONResponse)
 async def get_costs(
+    request: Request,
     scenario_id: Optional[UUID] = Query(None, description="Filter costs by scenario ID"),
+    layout: ListLayout = Query(ListLayout.ROWS, description="'columns' returns one array per field"),
     _current_user: User = Depends(get_current_user)
 ):
-    """Get all costs, optionally filtered by scenario_id"""
+    """
+    Get all costs, optionally filtered by scenario_id.
+    Sent as MessagePack when the Accept header asks for application/msgpack.
+    """
     try:
-        if scenario_id:
-            costs = await CostRepository.get_costs_by_scenario(scenario_id)
-        else:
-            costs = await CostRepository.get_all_costs()
-        return [CostResponse(**_cost_to_dict(cost)) for cost in costs]
+        rows = await CostRepository.get_cost_rows(COST_LIST_FIELDS, scenario_id)
+        return list_response(request, rows, COST_LIST_FIELDS, layout)
     except Exception as e:
         logger.error(f"❌ Error getting costs: {str(e)}")
         raise HTTPException(
@@ -1,19 +1,66 @@
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel, Field
+from uuid import UUID
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query, status
+from pydantic import BaseModel, Field, ValidationError
 from typing import Optional, List, Dict, Any
+from app.config import settings
 from app.middleware.auth import get_current_user
 from app.models.user import User
 from app.services.llm_service import get_llm_service, LLMService
 from app.repositories.scenario_repo import ScenarioRepository
 from app.repositories.cost_repo import CostRepository
 from app.repositories.revenue_repo import RevenueRepository
+from app.services.scenario_comparison import (
+    load_comparison_data,
+    load_multi_comparison,
+    ScenarioNotFoundError,
+)
+from app.repositories.llm_job_repo import LLMJobRepository
+from app.repositories.llm_conversation_repo import LLMConversationRepository
+from app.repositories.llm_usage_repo import LLMUsageRepository
+from app.services.llm_conversation import (
+    chat_in_conversation,
+    store_turn,
+    stream_chat_in_conversation,
+    summarize_conversation,
+)
+from app.services.llm_job_queue import (
+    llm_job_queue,
+    job_to_dict,
+    LLMJobTask,
+    QueueFullError,
+    FINISHED_STATUSES,
+)
+from app.services.nlp_batch import parse_nlp_batch
+from app.services.llm_telemetry import llm_telemetry
+from app.utils.sse import sse_response, stream_llm_events, format_sse, SSE_HEADERS
+from fastapi.responses import StreamingResponse
+from app.utils.resilience import CircuitOpenError
+import asyncio
+import json
+import openai
 
 router = APIRouter(prefix="/llm", tags=["LLM"])
 
 
+def _llm_http_error(e: Exception, message: str = "LLM error") -> HTTPException:
+    """Map LLM service errors to HTTP errors (503 when the breaker is open, 504 on timeout)"""
+    if isinstance(e, CircuitOpenError):
+        return HTTPException(
+            status_code=503,
+            detail=f"{message}: {str(e)}",
+            headers={"Retry-After": str(int(e.retry_after) + 1)},
+        )
+    if isinstance(e, (asyncio.TimeoutError, openai.APITimeoutError)):
+        return HTTPException(status_code=504, detail=f"{message}: LLM provider timed out")
+    return HTTPException(status_code=500, detail=f"{message}: {str(e)}")
+
+
 class ChatRequest(BaseModel):
     messages: List[Dict[str, str]]
     system_prompt: Optional[str] = None
+    # With a conversation ID, send only the new messages; history is kept server-side
+    conversation_id: Optional[UUID] = None
 
 
 class TextGenerationRequest(BaseModel):
@@ -34,10 +81,14 @@ class NLPToScenarioRequest(BaseModel):
 @router.post("/chat", response_model=Dict[str, str])
 async def chat(
     request: ChatRequest,
-    _current_user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
     llm_service: LLMService = Depends(get_llm_service)
 ):
     """Chat endpoint for LLM interactions"""
+    if request.conversation_id:
+        return await _chat_in_conversation(request, current_user, llm_service, background_tasks)
+    
     try:
         response = await llm_service.chat(
             messages=request.messages,
@@ -45,7 +96,41 @@ async def chat(
         )
         return {"response": response}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"LLM error: {str(e)}")
+        raise _llm_http_error(e)
+
+
+async def _conversation_and_messages(request: ChatRequest, current_user: User):
+    """The user's conversation and the request's new messages, validated (404/400)"""
+    conversation = await LLMConversationRepository.get_conversation_for_user(
+        request.conversation_id, current_user.id
+    )
+    if not conversation:
+        raise HTTPException(status_code=404, detail=f"Conversation with ID {request.conversation_id} not found")
+    
+    new_messages = [
+        {"role": message.get("role", "user"), "content": message.get("content", "")}
+        for message in request.messages
+    ]
+    if not new_messages or any(message["role"] not in ("user", "assistant") for message in new_messages):
+        raise HTTPException(status_code=400, detail="Messages must be a non-empty list of user/assistant messages")
+    return conversation, new_messages
+
+
+async def _chat_in_conversation(
+    request: ChatRequest,
+    current_user: User,
+    llm_service: LLMService,
+    background_tasks: BackgroundTasks
+) -> Dict[str, str]:
+    conversation, new_messages = await _conversation_and_messages(request, current_user)
+    try:
+        response, needs_summary = await chat_in_conversation(llm_service, conversation, new_messages)
+    except Exception as e:
+        raise _llm_http_error(e)
+    
+    if needs_summary:
+        background_tasks.add_task(summarize_conversation, conversation.id)
+    return {"response": response, "conversation_id": str(conversation.id)}
 
 
 @router.post("/generate", response_model=Dict[str, str])
@@ -62,7 +147,7 @@ async def generate_text(
         )
         return {"response": response}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"LLM error: {str(e)}")
+        raise _llm_http_error(e)
 
 
 @router.post("/analyze-scenario", response_model=Dict[str, str])
@@ -79,7 +164,7 @@ async def analyze_scenario(
         )
         return {"response": response}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"LLM error: {str(e)}")
+        raise _llm_http_error(e)
 
 
 @router.post("/nlp-to-scenario", response_model=Dict[str, Any])
@@ -153,7 +238,7 @@ async def nlp_to_scenario(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Failed to parse input: {str(e)}")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error creating scenario: {str(e)}")
+        raise _llm_http_error(e, "Error creating scenario")
 
 class NLPToTemplateRequest(BaseModel):
     """Request schema for NLP to template conversion (preview only)"""
@@ -171,20 +256,62 @@ async def nlp_to_template(
         # Parse NLP input using LLM and return in template format
         template_data = await llm_service.parse_nlp_to_template(request.nlp_input)
         
-        return {
-            "scenario": {
-                "name": template_data["scenario"]["name"],
-                "description": template_data["scenario"].get("description", ""),
-                "funding": template_data["scenario"].get("funding"),
-            },
-            "costs": template_data.get("costs", []),
-            "revenues": template_data.get("revenues", []),
-        }
+        return _template_payload(template_data)
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Failed to parse input: {str(e)}")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"LLM error: {str(e)}")
+        raise _llm_http_error(e)
+
+
+def _template_payload(template_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape parsed template data for the preview modal"""
+    return {
+        "scenario": {
+            "name": template_data["scenario"]["name"],
+            "description": template_data["scenario"].get("description", ""),
+            "funding": template_data["scenario"].get("funding"),
+        },
+        "costs": template_data.get("costs", []),
+        "revenues": template_data.get("revenues", []),
+    }
+
+
+MAX_BATCH_NLP_INPUTS = 200
+
+
+class NLPToTemplateBatchRequest(BaseModel):
+    """Request schema for batch NLP to template conversion"""
+    nlp_inputs: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_NLP_INPUTS,
+        description="Natural language descriptions, e.g. one per spreadsheet row"
+    )
+
+
+@router.post("/nlp-to-template/batch")
+async def nlp_to_template_batch(
+    request: NLPToTemplateBatchRequest,
+    _current_user: User = Depends(get_current_user),
+    llm_service: LLMService = Depends(get_llm_service)
+):
+    """
+    Convert many inputs to template format, streamed as NDJSON in completion order.
+    
+    Each line is {index, status: "ok", source, result} or {index, status: "error", error};
+    the last line is {summary: {total, ok, error, sources}}.
+    """
+    async def lines():
+        async for item in parse_nlp_batch(llm_service, request.nlp_inputs, settings.NLP_BATCH_CONCURRENCY):
+            if item.get("status") == "ok":
+                try:
+                    item["result"] = _template_payload(item["result"])
+                except (KeyError, TypeError) as e:
+                    item = {"index": item["index"], "status": "error", "error": f"Failed to parse input: {str(e)}"}
+            yield json.dumps(item) + "\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson", headers=SSE_HEADERS)
 
 class CompareScenariosRequest(BaseModel):
     """Request schema for comparing two scenarios"""
@@ -192,7 +319,17 @@ class CompareScenariosRequest(BaseModel):
     scenario2_id: str = Field(..., description="UUID of the second scenario")
 
 
-@router.post("/compare-scenarios", response_model=Dict[str, str])
+async def _load_comparison_data(request: CompareScenariosRequest):
+    """Load comparison data, mapping lookup errors to HTTP errors"""
+    try:
+        return await load_comparison_data(request.scenario1_id, request.scenario2_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ScenarioNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/compare-scenarios", response_model=Dict[str, Any])
 async def compare_scenarios(
     request: CompareScenariosRequest,
     _current_user: User = Depends(get_current_user),
@@ -200,164 +337,7 @@ async def compare_scenarios(
 ):
     """Compare two scenarios and generate a comprehensive comparison report"""
     try:
-        from uuid import UUID
-        from app.repositories.scenario_repo import ScenarioRepository
-        from app.repositories.cost_repo import CostRepository
-        from app.repositories.revenue_repo import RevenueRepository
-        
-        # Validate UUIDs
-        try:
-            scenario1_uuid = UUID(request.scenario1_id)
-            scenario2_uuid = UUID(request.scenario2_id)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid scenario ID format")
-        
-        # Fetch scenarios
-        scenario1 = await ScenarioRepository.get_scenario_by_id(scenario1_uuid)
-        scenario2 = await ScenarioRepository.get_scenario_by_id(scenario2_uuid)
-        
-        if not scenario1:
-            raise HTTPException(status_code=404, detail=f"Scenario 1 with ID {request.scenario1_id} not found")
-        if not scenario2:
-            raise HTTPException(status_code=404, detail=f"Scenario 2 with ID {request.scenario2_id} not found")
-        
-        # Fetch costs and revenues for both scenarios
-        costs1 = await CostRepository.get_costs_by_scenario(scenario1_uuid)
-        revenues1 = await RevenueRepository.get_revenues_by_scenario(scenario1_uuid)
-        costs2 = await CostRepository.get_costs_by_scenario(scenario2_uuid)
-        revenues2 = await RevenueRepository.get_revenues_by_scenario(scenario2_uuid)
-        
-        # Helper function to calculate first-year value
-        def calculate_first_year_value(item, year_start_month=1, year_end_month=12):
-            """Calculate first-year value based on starts_at and ends_at"""
-            value = float(item.value)
-            starts_at = item.starts_at
-            ends_at = item.end_at
-            
-            # Calculate active months in first year
-            first_active = max(year_start_month, starts_at)
-            last_active = min(year_end_month, ends_at) if ends_at else year_end_month
-            
-            # If not active in first year
-            if first_active > year_end_month or last_active < year_start_month:
-                return 0
-            
-            # Convert annual value to monthly, then multiply by active months
-            monthly = value / 12
-            active_months = last_active - first_active + 1
-            return monthly * active_months
-        
-        # Calculate metrics for scenario 1
-        total_costs1 = sum(
-            calculate_first_year_value(cost) 
-            for cost in costs1 
-            if cost.is_active
-        )
-        total_revenue1 = sum(
-            calculate_first_year_value(revenue) 
-            for revenue in revenues1 
-            if revenue.is_active
-        )
-        net_burn1 = total_costs1 - total_revenue1
-        growth_rate1 = ((total_revenue1 - total_costs1) / total_costs1 * 100) if total_costs1 > 0 else 0
-        
-        # Calculate runway for scenario 1
-        funding1 = float(scenario1.funding) if scenario1.funding else 0
-        monthly_net_burn1 = net_burn1 / 12
-        runway1 = None
-        if funding1 and monthly_net_burn1 > 0:
-            runway1 = funding1 / monthly_net_burn1
-        elif funding1 and monthly_net_burn1 <= 0:
-            runway1 = float('inf')
-        
-        # Calculate metrics for scenario 2
-        total_costs2 = sum(
-            calculate_first_year_value(cost) 
-            for cost in costs2 
-            if cost.is_active
-        )
-        total_revenue2 = sum(
-            calculate_first_year_value(revenue) 
-            for revenue in revenues2 
-            if revenue.is_active
-        )
-        net_burn2 = total_costs2 - total_revenue2
-        growth_rate2 = ((total_revenue2 - total_costs2) / total_costs2 * 100) if total_costs2 > 0 else 0
-        
-        # Calculate runway for scenario 2
-        funding2 = float(scenario2.funding) if scenario2.funding else 0
-        monthly_net_burn2 = net_burn2 / 12
-        runway2 = None
-        if funding2 and monthly_net_burn2 > 0:
-            runway2 = funding2 / monthly_net_burn2
-        elif funding2 and monthly_net_burn2 <= 0:
-            runway2 = float('inf')
-        
-        # Format scenario data for LLM
-        def format_scenario_data(scenario, costs, revenues, metrics):
-            """Format scenario data for LLM comparison"""
-            return {
-                "scenario": {
-                    "name": scenario.name,
-                    "description": scenario.description or "",
-                    "funding": float(scenario.funding) if scenario.funding else None,
-                },
-                "costs": [
-                    {
-                        "title": cost.title,
-                        "value": str(float(cost.value)),
-                        "category": cost.category,
-                        "starts_at": str(cost.starts_at),
-                        "end_at": str(cost.end_at) if cost.end_at else "",
-                        "freq": cost.freq,
-                    }
-                    for cost in costs if cost.is_active
-                ],
-                "revenues": [
-                    {
-                        "title": revenue.title,
-                        "value": str(float(revenue.value)),
-                        "category": revenue.category or "",
-                        "starts_at": str(revenue.starts_at),
-                        "end_at": str(revenue.end_at) if revenue.end_at else "",
-                        "freq": revenue.freq,
-                    }
-                    for revenue in revenues if revenue.is_active
-                ],
-                "metrics": {
-                    "total_costs": metrics["total_costs"],
-                    "total_revenue": metrics["total_revenue"],
-                    "net_burn": metrics["net_burn"],
-                    "growth_rate": metrics["growth_rate"],
-                    "runway": metrics["runway"],
-                }
-            }
-        
-        scenario1_data = format_scenario_data(
-            scenario1,
-            costs1,
-            revenues1,
-            {
-                "total_costs": total_costs1,
-                "total_revenue": total_revenue1,
-                "net_burn": net_burn1,
-                "growth_rate": growth_rate1,
-                "runway": runway1,
-            }
-        )
-        
-        scenario2_data = format_scenario_data(
-            scenario2,
-            costs2,
-            revenues2,
-            {
-                "total_costs": total_costs2,
-                "total_revenue": total_revenue2,
-                "net_burn": net_burn2,
-                "growth_rate": growth_rate2,
-                "runway": runway2,
-            }
-        )
+        scenario1, scenario2, scenario1_data, scenario2_data = await _load_comparison_data(request)
         
         # Call LLM service to generate comparison report
         comparison_report = await llm_service.compare_scenarios(
@@ -380,4 +360,367 @@ async def compare_scenarios(
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error comparing scenarios: {str(e)}")
\ No newline at end of file
+        raise _llm_http_error(e, "Error comparing scenarios")
+
+
+# Upper bound on scenarios per N-way comparison to keep the prompt compact
+MAX_COMPARE_SCENARIOS = 10
+
+
+class CompareManyScenariosRequest(BaseModel):
+    """Request schema for comparing several scenarios"""
+    scenario_ids: List[str] = Field(
+        ...,
+        min_length=2,
+        max_length=MAX_COMPARE_SCENARIOS,
+        description="UUIDs of the scenarios to compare"
+    )
+
+
+@router.post("/compare", response_model=Dict[str, Any])
+async def compare_many_scenarios(
+    request: CompareManyScenariosRequest,
+    _current_user: User = Depends(get_current_user),
+    llm_service: LLMService = Depends(get_llm_service)
+):
+    """Compare K scenarios using precomputed metrics and a single LLM call"""
+    try:
+        try:
+            scenarios, scenario_rows = await load_multi_comparison(request.scenario_ids)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except ScenarioNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        
+        if len(scenarios) < 2:
+            raise HTTPException(status_code=400, detail="At least two distinct scenarios are required")
+        
+        comparison_report = await llm_service.compare_many_scenarios(scenario_rows)
+        
+        return {
+            "report": comparison_report,
+            "scenarios": [
+                {
+                    "id": row["id"],
+                    "name": row["name"],
+                    "metrics": {
+                        "total_costs": row["total_costs"],
+                        "total_revenue": row["total_revenue"],
+                        "net_burn": row["net_burn"],
+                        "growth_rate": row["growth_rate"],
+                        # Infinite runway (not burning) isn't valid JSON
+                        "runway": None if row["runway"] == float('inf') else row["runway"],
+                        "costs_by_category": row["costs_by_category"],
+                    },
+                }
+                for row in scenario_rows
+            ],
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _llm_http_error(e, "Error comparing scenarios")
+
+
+@router.get("/metrics", response_model=Dict[str, Any])
+async def llm_metrics(
+    _current_user: User = Depends(get_current_user),
+    llm_service: LLMService = Depends(get_llm_service)
+):
+    """LLM service counters (per-task call histograms, request coalescing, circuit breaker, model routing, NLP cache)"""
+    return {
+        "calls": llm_telemetry.stats(),
+        "singleflight": llm_service.singleflight.stats(),
+        "circuit_breaker": llm_service.circuit_breaker.stats(),
+        "model_router": llm_service.router.stats(),
+        "nlp_semantic_cache": llm_service.nlp_cache.stats(),
+        "provider": {
+            "name": llm_service.provider.name,
+            **llm_service.provider.stats(),
+        },
+    }
+
+
+
+def usage_to_dict(usage) -> dict:
+    """Helper to convert LLMUsage model to dict"""
+    return {
+        "day": usage.day.isoformat(),
+        "task": usage.task,
+        "model": usage.model,
+        "calls": usage.calls,
+        "errors": usage.errors,
+        "cache_hits": usage.cache_hits,
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "cost_usd": float(usage.cost_usd),
+        "avg_latency_ms": round(usage.total_latency_ms / usage.calls, 1) if usage.calls else 0.0,
+    }
+
+
+@router.get("/usage", response_model=Dict[str, Any])
+async def llm_usage(
+    days: int = Query(30, ge=1, le=366, description="Number of days to include"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    The current user's LLM usage per day, task and model.
+    Recent calls appear after the next telemetry flush (LLM_USAGE_FLUSH_SECONDS).
+    """
+    since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    rows = await LLMUsageRepository.get_usage_for_user(current_user.id, since)
+    return {
+        "since": since.isoformat(),
+        "usage": [usage_to_dict(row) for row in rows],
+        "totals": {
+            "calls": sum(row.calls for row in rows),
+            "prompt_tokens": sum(row.prompt_tokens for row in rows),
+            "completion_tokens": sum(row.completion_tokens for row in rows),
+            "cost_usd": float(sum(row.cost_usd for row in rows)),
+        },
+    }
+
+
+# ============================================================================
+# STREAMING (SSE) VARIANTS
+# ============================================================================
+
+@router.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    llm_service: LLMService = Depends(get_llm_service)
+):
+    """
+    Streaming chat endpoint - emits `token` events followed by a final `done` event.
+    
+    With a conversation_id, the messages and the reply are stored once the
+    stream completes (before `done`); an abandoned stream stores nothing.
+    """
+    if not request.conversation_id:
+        chunks = llm_service.stream_chat(
+            messages=request.messages,
+            system_prompt=request.system_prompt
+        )
+        return sse_response(stream_llm_events(chunks))
+    
+    conversation, new_messages = await _conversation_and_messages(request, current_user)
+    chunks = await stream_chat_in_conversation(llm_service, conversation, new_messages)
+    
+    async def store(response: str) -> None:
+        if await store_turn(conversation, new_messages, response):
+            background_tasks.add_task(summarize_conversation, conversation.id)
+    
+    metadata = {"conversation_id": str(conversation.id)}
+    return sse_response(stream_llm_events(chunks, metadata, on_complete=store))
+
+
+@router.post("/analyze-scenario/stream")
+async def analyze_scenario_stream(
+    request: ScenarioAnalysisRequest,
+    _current_user: User = Depends(get_current_user),
+    llm_service: LLMService = Depends(get_llm_service)
+):
+    """Streaming scenario analysis - emits `token` events followed by a final `done` event"""
+    chunks = llm_service.stream_analyze_scenario(
+        scenario_data=request.scenario_data,
+        question=request.question
+    )
+    return sse_response(stream_llm_events(chunks))
+
+
+@router.post("/compare-scenarios/stream")
+async def compare_scenarios_stream(
+    request: CompareScenariosRequest,
+    _current_user: User = Depends(get_current_user),
+    llm_service: LLMService = Depends(get_llm_service)
+):
+    """Streaming scenario comparison - emits `token` events followed by a final `done` event"""
+    # Load data before streaming starts so 400/404 are returned as normal HTTP errors
+    scenario1, scenario2, scenario1_data, scenario2_data = await _load_comparison_data(request)
+    
+    chunks = llm_service.stream_compare_scenarios(scenario1_data, scenario2_data)
+    metadata = {
+        "scenario1": {"id": str(scenario1.id), "name": scenario1.name},
+        "scenario2": {"id": str(scenario2.id), "name": scenario2.name},
+    }
+    return sse_response(stream_llm_events(chunks, metadata))
+
+
+@router.post("/nlp-to-template/stream")
+async def nlp_to_template_stream(
+    request: NLPToTemplateRequest,
+    _current_user: User = Depends(get_current_user),
+    llm_service: LLMService = Depends(get_llm_service)
+):
+    """
+    Streaming NLP to template conversion - emits `scenario`, `cost` and `revenue`
+    events as each object completes, then a `done` event with the full template
+    """
+    async def events():
+        try:
+            async for event, value in llm_service.stream_parse_nlp_to_template(request.nlp_input):
+                if event == "done":
+                    value = _template_payload(value)
+                yield format_sse(value, event=event)
+        except ValueError as e:
+            yield format_sse({"detail": f"Failed to parse input: {str(e)}"}, event="error")
+        except Exception as e:
+            yield format_sse({"detail": f"LLM error: {str(e)}"}, event="error")
+    
+    return sse_response(events())
+
+
+# ============================================================================
+# BACKGROUND JOBS
+# ============================================================================
+
+# How often SSE subscribers re-read the job when no in-process event arrives
+# (covers jobs processed by another worker process)
+JOB_EVENTS_POLL_SECONDS = 5
+
+
+class LLMJobCreateRequest(BaseModel):
+    """Request schema for enqueuing an LLM job"""
+    task: LLMJobTask
+    payload: Dict[str, Any] = Field(..., description="Same body as the matching synchronous endpoint")
+
+
+# Payload schema per task (same as the synchronous endpoints)
+JOB_PAYLOAD_SCHEMAS = {
+    LLMJobTask.COMPARE: CompareScenariosRequest,
+    LLMJobTask.ANALYZE: ScenarioAnalysisRequest,
+    LLMJobTask.PARSE: NLPToTemplateRequest,
+}
+
+
+@router.post("/jobs", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
+async def create_llm_job(
+    request: LLMJobCreateRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Enqueue a compare, analyze or parse task and return its job ID immediately"""
+    try:
+        payload = JOB_PAYLOAD_SCHEMAS[request.task].model_validate(request.payload)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+    
+    try:
+        job = await llm_job_queue.enqueue(current_user.id, request.task, payload.model_dump())
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return {"job_id": str(job.id), "task": job.task, "status": job.status}
+
+
+@router.get("/jobs/{job_id}", response_model=Dict[str, Any])
+async def get_llm_job(
+    job_id: UUID,
+    current_user: User = Depends(get_current_user)
+):
+    """Get job status and, once finished, its result or error"""
+    job = await LLMJobRepository.get_job_for_user(job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job with ID {job_id} not found")
+    return job_to_dict(job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def llm_job_events(
+    job_id: UUID,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Subscribe to job status changes - emits `status` events and a final `done`
+    event, or an `error` event if the job is deleted while being watched.
+    """
+    # Subscribe before reading the job so no transition is missed
+    updates = llm_job_queue.subscribe(job_id)
+    job = await LLMJobRepository.get_job_for_user(job_id, current_user.id)
+    if not job:
+        llm_job_queue.unsubscribe(job_id, updates)
+        raise HTTPException(status_code=404, detail=f"Job with ID {job_id} not found")
+    
+    async def events():
+        try:
+            snapshot = job_to_dict(job)
+            while True:
+                if snapshot["status"] in FINISHED_STATUSES:
+                    yield format_sse(snapshot, event="done")
+                    return
+                yield format_sse(snapshot, event="status")
+                try:
+                    snapshot = await asyncio.wait_for(updates.get(), timeout=JOB_EVENTS_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    latest = await LLMJobRepository.get_job_by_id(job_id)
+                    if latest is None:
+                        # Deleted meanwhile (e.g. with its user)
+                        yield format_sse({"detail": f"Job with ID {job_id} no longer exists"}, event="error")
+                        return
+                    snapshot = job_to_dict(latest)
+        finally:
+            llm_job_queue.unsubscribe(job_id, updates)
+    
+    return sse_response(events())
+
+
+# ============================================================================
+# CONVERSATIONS (server-side chat history for /llm/chat)
+# ============================================================================
+
+class ConversationCreateRequest(BaseModel):
+    system_prompt: Optional[str] = None
+
+
+def conversation_to_dict(conversation) -> dict:
+    """Helper to convert LLMConversation model to dict"""
+    return {
+        "id": str(conversation.id),
+        "system_prompt": conversation.system_prompt,
+        "summary": conversation.summary,
+        "message_count": conversation.last_seq,
+        "created_at": conversation.created_at.isoformat() if conversation.created_at else None,
+        "updated_at": conversation.updated_at.isoformat() if conversation.updated_at else None,
+    }
+
+
+@router.post("/conversations", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
+async def create_conversation(
+    request: ConversationCreateRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Start a server-side conversation; pass its ID as conversation_id to /llm/chat"""
+    conversation = await LLMConversationRepository.create_conversation(current_user.id, request.system_prompt)
+    return conversation_to_dict(conversation)
+
+
+@router.get("/conversations/{conversation_id}", response_model=Dict[str, Any])
+async def get_conversation(
+    conversation_id: UUID,
+    current_user: User = Depends(get_current_user)
+):
+    """Get a conversation's rolling summary and the messages not yet summarized"""
+    conversation = await LLMConversationRepository.get_conversation_for_user(conversation_id, current_user.id)
+    if not conversation:
+        raise HTTPException(status_code=404, detail=f"Conversation with ID {conversation_id} not found")
+    
+    messages = await LLMConversationRepository.get_messages_after(conversation.id, conversation.summarized_through)
+    return {
+        **conversation_to_dict(conversation),
+        "messages": [
+            {"seq": message.seq, "role": message.role, "content": message.content}
+            for message in messages
+        ],
+    }
+
+
+@router.delete("/conversations/{conversation_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_conversation(
+    conversation_id: UUID,
+    current_user: User = Depends(get_current_user)
+):
+    """Delete a conversation and its messages"""
+    if not await LLMConversationRepository.delete_conversation(conversation_id, current_user.id):
+        raise HTTPException(status_code=404, detail=f"Conversation with ID {conversation_id} not found")
@@ -0,0 +1,35 @@
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from app.config import settings
+from app.services.app_metrics import app_metrics
+from app.utils.prometheus import CONTENT_TYPE
+
+router = APIRouter(tags=["Monitoring"])
+
+
+class PrometheusResponse(PlainTextResponse):
+    media_type = CONTENT_TYPE
+
+
+@router.get("/metrics", response_class=PrometheusResponse)
+async def metrics(authorization: Optional[str] = Header(default=None)):
+    """
+    Prometheus scrape endpoint: request rates and latencies per route, DB
+    query and pool metrics, cache hit/miss counters, LLM latencies and
+    event-loop lag, summed across worker processes. Requires METRICS_TOKEN
+    as a Bearer token (the route isn't mounted when it is unset).
+    """
+    scheme, _, token = (authorization or "").partition(" ")
+    if (
+        not settings.METRICS_TOKEN
+        or scheme.lower() != "bearer"
+        or not secrets.compare_digest(token, settings.METRICS_TOKEN)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return PrometheusResponse(await app_metrics.render())
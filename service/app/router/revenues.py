@@ -1,11 +1,15 @@
 from uuid import UUID
 from typing import Optional, List
 from enum import Enum
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, Request, status, Depends, Query
 from pydantic import BaseModel, Field
 from app.middleware.auth import get_current_user
 from app.models.user import User
+from app.models.revenue import Revenue
 from app.repositories.revenue_repo import RevenueRepository
+from app.utils.fast_json import FastJSONResponse, response_fields
+from app.utils.wire_format import ListLayout, list_response
+from app.services.scenario_events import scenario_events
 import logging
 
 logger = logging.getLogger(__name__)
@@ -81,6 +85,9 @@ def _revenue_to_dict(revenue) -> dict:
         "updated_at": revenue.updated_at.isoformat(),
     }
 
+# List endpoints serialize DB rows directly (see FastJSONResponse)
+REVENUE_LIST_FIELDS = response_fields(RevenueResponse, Revenue)
+
 # API Endpoints
 
 @router.post("", response_model=RevenueResponse, status_code=status.HTTP_201_CREATED)
@@ -103,7 +110,9 @@ async def create_revenue(
             is_active=request.is_active
         )
         
-        return _revenue_to_dict(revenue)
+        revenue_dict = _revenue_to_dict(revenue)
+        scenario_events.publish_rows("revenues", [revenue_dict])
+        return revenue_dict
     except Exception as e:
         logger.error(f"Error creating revenue: {str(e)}")
         raise HTTPException(
@@ -135,7 +144,9 @@ async def create_revenues_bulk(
         
         revenues = await RevenueRepository.create_revenues_bulk(revenues_data)
         
-        return [_revenue_to_dict(rev) for rev in revenues]
+        revenue_dicts = [_revenue_to_dict(rev) for rev in revenues]
+        scenario_events.publish_rows("revenues", revenue_dicts)
+        return revenue_dicts
     except Exception as e:
         logger.error(f"Error creating revenues in bulk: {str(e)}")
         raise HTTPException(
@@ -143,19 +154,20 @@ async def create_revenues_bulk(
             detail=f"Failed to create revenues: {str(e)}"
         )
 
-@router.get("", response_model=List[RevenueResponse])
+@router.get("", response_model=List[RevenueResponse], response_class=FastJSONResponse)
 async def get_revenues(
+    request: Request,
     scenario_id: Optional[UUID] = Query(None, description="Filter by scenario ID"),
+    layout: ListLayout = Query(ListLayout.ROWS, description="'columns' returns one array per field"),
     _current_user: User = Depends(get_current_user)
 ):
-    """Get all revenues, optionally filtered by scenario"""
+    """
+    Get all revenues, optionally filtered by scenario.
+    Sent as MessagePack when the Accept header asks for application/msgpack.
+    """
     try:
-        if scenario_id:
-            revenues = await RevenueRepository.get_revenues_by_scenario(scenario_id)
-        else:
-            revenues = await RevenueRepository.get_all_revenues()
-        
-        return [_revenue_to_dict(rev) for rev in revenues]
+        rows = await RevenueRepository.get_revenue_rows(REVENUE_LIST_FIELDS, scenario_id)
+        return list_response(request, rows, REVENUE_LIST_FIELDS, layout)
     except Exception as e:
         logger.error(f"Error fetching revenues: {str(e)}")
         raise HTTPException(
@@ -194,6 +206,9 @@ async def update_revenue(
 ):
     """Update a revenue item"""
     try:
+        # Needed to notify the old scenario when the revenue moves to another one
+        existing = await RevenueRepository.get_revenue_by_id(revenue_id) if request.scenario_id else None
+        
         revenue = await RevenueRepository.update_revenue(
             revenue_id=revenue_id,
             title=request.title,
@@ -212,7 +227,11 @@ async def update_revenue(
                 detail="Revenue not found"
             )
         
-        return _revenue_to_dict(revenue)
+        revenue_dict = _revenue_to_dict(revenue)
+        if existing and existing.scenario_id != revenue.scenario_id:
+            scenario_events.publish(existing.scenario_id, "revenues", deleted_ids=[revenue_id])
+        scenario_events.publish_rows("revenues", [revenue_dict])
+        return revenue_dict
     except HTTPException:
         raise
     except Exception as e:
@@ -237,6 +256,7 @@ async def delete_revenue(
             )
         
         await revenue.delete()
+        scenario_events.publish(revenue.scenario_id, "revenues", deleted_ids=[revenue_id])
         return None
     except HTTPException:
         raise
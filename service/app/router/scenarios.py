@@ -5,6 +5,10 @@ from pydantic import BaseModel, Field
 from app.middleware.auth import get_current_user
 from app.models.user import User
 from app.repositories.scenario_repo import ScenarioRepository
+from app.services.scenario_events import scenario_events, load_headline_metrics
+from app.utils.sse import format_sse, sse_response
+from app.config import settings
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -117,6 +121,52 @@ async def get_scenario(
             detail=f"Error getting scenario: {str(e)}"
         )
 
+@router.get("/{scenario_id}/events")
+async def scenario_live_events(
+    scenario_id: UUID,
+    _current_user: User = Depends(get_current_user)
+):
+    """
+    Subscribe to live changes to a scenario.
+    
+    Emits a `snapshot` event with the headline metrics, then a `delta` event
+    for each batch of committed writes: the changed scenario/cost/revenue
+    rows, deleted row IDs and recomputed metrics. `resync` means deltas were
+    missed and the client should refetch; `deleted` ends the stream.
+    """
+    # Subscribe before computing the snapshot so no write is missed
+    updates = scenario_events.subscribe(scenario_id)
+    try:
+        metrics = await load_headline_metrics(scenario_id)
+    except Exception:
+        scenario_events.unsubscribe(scenario_id, updates)
+        raise
+    if metrics is None:
+        scenario_events.unsubscribe(scenario_id, updates)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Scenario with ID {scenario_id} not found"
+        )
+    
+    async def events():
+        try:
+            yield format_sse({"scenario_id": str(scenario_id), "metrics": metrics}, event="snapshot")
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(
+                        updates.get(), timeout=settings.SCENARIO_EVENTS_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"  # Keeps proxies from closing an idle stream
+                    continue
+                yield format_sse(data, event=event)
+                if event == "deleted":
+                    return
+        finally:
+            scenario_events.unsubscribe(scenario_id, updates)
+    
+    return sse_response(events())
+
 @router.put("/{scenario_id}", response_model=ScenarioResponse, status_code=status.HTTP_200_OK)
 async def update_scenario(
     scenario_id: UUID,
@@ -149,7 +199,9 @@ async def update_scenario(
             )
         
         logger.info(f"✅ Scenario updated: ID={updated_scenario.id}")
-        return ScenarioResponse(**_scenario_to_dict(updated_scenario))
+        scenario_dict = _scenario_to_dict(updated_scenario)
+        scenario_events.publish(scenario_id, "scenario", rows=[scenario_dict])
+        return ScenarioResponse(**scenario_dict)
         
     except HTTPException:
         raise
@@ -186,6 +238,7 @@ async def delete_scenario(
             )
         
         logger.info(f"✅ Scenario deleted: ID={scenario_id}")
+        scenario_events.publish(scenario_id, "scenario", deleted_ids=[scenario_id])
         return None  # 204 No Content
         
     except HTTPException:
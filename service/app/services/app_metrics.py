@@ -0,0 +1,205 @@
+"""
+Process-wide metrics exported at /metrics in the Prometheus text format.
+
+Request metrics are recorded by MetricsMiddleware, DB timings by query and
+connection-acquire hooks; the rest (pool usage, caches, LLM calls, event-loop
+lag) is read from the owning services when collected. Histograms are kept
+in milliseconds and exported in seconds.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+from tortoise import connections
+from app.config import settings
+from app.services.default.auth_serivce import google_auth_service
+from app.services.llm_service import peek_llm_service
+from app.services.llm_telemetry import llm_telemetry
+from app.services.slow_queries import slow_query_log
+from app.utils import prometheus
+from app.utils.db_hooks import QueryEvent
+from app.utils.loop_monitor import LoopLagMonitor
+from app.utils.metrics import Histogram
+from app.utils.prometheus import Family, SnapshotStore, add_histogram, add_sample, family
+
+logger = logging.getLogger(__name__)
+
+REQUEST_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+DB_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+MS = 0.001  # Milliseconds to seconds
+
+
+class AppMetrics:
+    def __init__(self, multiproc_dir: str, snapshot_interval: float, loop_interval: float, block_threshold_ms: float):
+        self.started = time.time()
+        self.in_flight: Dict[str, int] = {}
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.request_ms: Dict[Tuple[str, str], Histogram] = {}
+        self.query_ms: Dict[str, Histogram] = {}
+        self.query_errors: Dict[str, int] = {}
+        self.acquire_ms: Dict[str, Histogram] = {}
+        self.loop_monitor = LoopLagMonitor(interval=loop_interval, block_threshold_ms=block_threshold_ms)
+        self.store: Optional[SnapshotStore] = (
+            SnapshotStore(multiproc_dir, snapshot_interval) if multiproc_dir else None
+        )
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def request_started(self, method: str) -> None:
+        self.in_flight[method] = self.in_flight.get(method, 0) + 1
+
+    def request_finished(self, method: str, route: str, status: int, duration_ms: float) -> None:
+        self.in_flight[method] -= 1
+        key = (method, route, str(status))
+        self.requests[key] = self.requests.get(key, 0) + 1
+        histogram = self.request_ms.get((method, route))
+        if histogram is None:
+            histogram = self.request_ms[(method, route)] = Histogram(REQUEST_BUCKETS_MS)
+        histogram.observe(duration_ms)
+
+    def record_query(self, event: QueryEvent) -> None:
+        """Query listener (see app.utils.db_hooks)"""
+        histogram = self.query_ms.get(event.method)
+        if histogram is None:
+            histogram = self.query_ms[event.method] = Histogram(DB_BUCKETS_MS)
+        histogram.observe(event.duration_ms)
+        if event.error:
+            self.query_errors[event.method] = self.query_errors.get(event.method, 0) + 1
+
+    def record_acquire(self, connection: str, wait_ms: float) -> None:
+        """Acquire listener (see app.utils.db_hooks)"""
+        histogram = self.acquire_ms.get(connection)
+        if histogram is None:
+            histogram = self.acquire_ms[connection] = Histogram(DB_BUCKETS_MS)
+        histogram.observe(wait_ms)
+
+    # ------------------------------------------------------------------
+    # Collection
+    # ------------------------------------------------------------------
+
+    def _http_families(self) -> List[Family]:
+        in_flight = family("http_requests_in_flight", "gauge", "Requests currently being served")
+        for method, count in sorted(self.in_flight.items()):
+            add_sample(in_flight, count, method=method)
+        total = family("http_requests_total", "counter", "Requests served")
+        for (method, route, status), count in sorted(self.requests.items()):
+            add_sample(total, count, method=method, route=route, status=status)
+        duration = family("http_request_duration_seconds", "histogram", "Time to serve a request, including the response body")
+        for (method, route), histogram in sorted(self.request_ms.items()):
+            add_histogram(duration, histogram, MS, method=method, route=route)
+        return [in_flight, total, duration]
+
+    def _db_families(self) -> List[Family]:
+        queries = family("db_query_duration_seconds", "histogram", "SQL statement execution time")
+        for method, histogram in sorted(self.query_ms.items()):
+            add_histogram(queries, histogram, MS, method=method)
+        errors = family("db_query_errors_total", "counter", "SQL statements that raised")
+        for method, count in sorted(self.query_errors.items()):
+            add_sample(errors, count, method=method)
+        slow = family("db_slow_queries_total", "counter", "Statements slower than SLOW_QUERY_THRESHOLD_MS")
+        add_sample(slow, slow_query_log.total)
+        wait = family("db_pool_wait_seconds", "histogram", "Time spent waiting for a DB connection")
+        for connection, histogram in sorted(self.acquire_ms.items()):
+            add_histogram(wait, histogram, MS, connection=connection)
+
+        size = family("db_pool_connections", "gauge", "Open pooled DB connections")
+        in_use = family("db_pool_connections_in_use", "gauge", "Pooled DB connections checked out")
+        max_size = family("db_pool_max_connections", "gauge", "Pool size limit")
+        try:
+            clients = connections.all()
+        except Exception:
+            clients = []  # Tortoise not initialized yet
+        for client in clients:
+            pool = getattr(client, "_pool", None)  # asyncpg; SQLite has no pool
+            if pool is None or not hasattr(pool, "get_size"):
+                continue
+            name = client.connection_name
+            add_sample(size, pool.get_size(), connection=name)
+            add_sample(in_use, pool.get_size() - pool.get_idle_size(), connection=name)
+            add_sample(max_size, pool.get_max_size(), connection=name)
+        return [queries, errors, slow, wait, size, in_use, max_size]
+
+    def _cache_families(self) -> List[Family]:
+        lookups = family("cache_requests_total", "counter", "Cache lookups by result (hit ratio = hit / all)")
+        llm_service = peek_llm_service()
+        if llm_service is not None:
+            cache = llm_service.nlp_cache
+            add_sample(lookups, cache.hits, cache="nlp_semantic", result="hit")
+            add_sample(lookups, cache.lookups - cache.hits, cache="nlp_semantic", result="miss")
+            singleflight = llm_service.singleflight
+            add_sample(lookups, singleflight.coalesced, cache="llm_singleflight", result="hit")
+            add_sample(lookups, singleflight.executed, cache="llm_singleflight", result="miss")
+        certs = google_auth_service.cert_cache_stats()
+        add_sample(lookups, certs["hits"], cache="google_certs", result="hit")
+        add_sample(lookups, certs["misses"], cache="google_certs", result="miss")
+        return [lookups]
+
+    def _llm_families(self) -> List[Family]:
+        calls = family("llm_calls_total", "counter", "LLM calls by task and how they were served")
+        errors = family("llm_call_errors_total", "counter", "Failed LLM calls")
+        tokens = family("llm_tokens_total", "counter", "Provider tokens used")
+        latency = family("llm_call_duration_seconds", "histogram", "LLM call latency")
+        ttft = family("llm_time_to_first_token_seconds", "histogram", "Time to first streamed token")
+        for task, stats in sorted(llm_telemetry.task_stats().items()):
+            for cache_status, count in sorted(stats.cache.items()):
+                add_sample(calls, count, task=task, cache=cache_status)
+            for error, count in sorted(stats.errors.items()):
+                add_sample(errors, count, task=task, error=error)
+            add_sample(tokens, int(stats.prompt_tokens.sum), task=task, kind="prompt")
+            add_sample(tokens, int(stats.completion_tokens.sum), task=task, kind="completion")
+            add_histogram(latency, stats.latency_ms, MS, task=task)
+            if stats.ttft_ms.count:
+                add_histogram(ttft, stats.ttft_ms, MS, task=task)
+        return [calls, errors, tokens, latency, ttft]
+
+    def _loop_families(self) -> List[Family]:
+        lag = family("event_loop_lag_seconds", "histogram", "How late the event loop ran a scheduled wake-up")
+        add_histogram(lag, self.loop_monitor.lag_ms, MS)
+        last = family("event_loop_lag_last_seconds", "gauge", "Most recent event-loop lag sample (max across workers)", aggregate="max")
+        add_sample(last, self.loop_monitor.last_lag_ms * MS)
+        blocks = family("event_loop_blocks_total", "counter", "Stalls longer than the blocking threshold (stack logged)")
+        add_sample(blocks, self.loop_monitor.blocks)
+        block_duration = family("event_loop_block_duration_seconds", "histogram", "Duration of stalls longer than the blocking threshold")
+        add_histogram(block_duration, self.loop_monitor.block_ms, MS)
+        return [lag, last, blocks, block_duration]
+
+    def collect(self) -> List[Family]:
+        """Families of this worker"""
+        workers = family("app_workers", "gauge", "Worker processes reporting metrics")
+        add_sample(workers, 1)
+        return [
+            workers,
+            *self._http_families(),
+            *self._db_families(),
+            *self._cache_families(),
+            *self._llm_families(),
+            *self._loop_families(),
+        ]
+
+    async def render(self) -> str:
+        """Prometheus text for this worker merged with the other workers' latest snapshots"""
+        snapshots = [self.collect()]
+        if self.store is not None:
+            snapshots.extend(await asyncio.to_thread(self.store.read_peers))
+        return prometheus.render(prometheus.merge(snapshots))
+
+    async def start(self) -> None:
+        await self.loop_monitor.start()
+        if self.store is not None:
+            await self.store.start(self.collect)
+
+    async def stop(self) -> None:
+        await self.loop_monitor.stop()
+        if self.store is not None:
+            await self.store.stop()
+
+
+# Singleton instance
+app_metrics = AppMetrics(
+    multiproc_dir=settings.METRICS_MULTIPROC_DIR,
+    snapshot_interval=settings.METRICS_SNAPSHOT_SECONDS,
+    loop_interval=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+    block_threshold_ms=settings.LOOP_BLOCK_THRESHOLD_MS,
+)
@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+from app.services.model_router import ModelProfile
+
+class LLMProvider(ABC):
+    """
+    Abstract base class for LLM providers
+    Creates the chat models LLMService calls for each model profile
+    """
+
+    name: str = "base"
+
+    @abstractmethod
+    def create_chat_model(self, profile: ModelProfile) -> Any:
+        """
+        Create a chat model for a routing profile.
+
+        The model must implement LangChain's `ainvoke(messages)` returning an
+        AIMessage and `astream(messages)` yielding AIMessageChunks.
+        """
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Provider-specific counters for the metrics endpoint"""
+        return {}
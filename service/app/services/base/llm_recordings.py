@@ -0,0 +1,46 @@
+"""
+Recorded LLM responses: JSONL of {"fingerprint", "response"} keyed by a
+hash of the prompt messages. Written by the recording wrapper around real
+providers (LLM_RECORD_RESPONSES_PATH) and replayed by the fake provider.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+from langchain_core.messages import BaseMessage
+
+logger = logging.getLogger(__name__)
+
+# Appends run in worker threads; keep each record's line intact
+_write_lock = threading.Lock()
+
+
+def prompt_fingerprint(messages: List[BaseMessage]) -> str:
+    """Stable hash of a message list, used to key recorded responses"""
+    payload = json.dumps([(m.type, m.content) for m in messages], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_recordings(path: Optional[str]) -> Dict[str, str]:
+    """Load fingerprint -> response from a JSONL recordings file (later lines win)"""
+    recordings: Dict[str, str] = {}
+    if not path or not os.path.exists(path):
+        return recordings
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            recordings[record["fingerprint"]] = record["response"]
+    logger.info(f"Loaded {len(recordings)} recorded LLM responses from {path}")
+    return recordings
+
+
+def append_recording(path: str, fingerprint: str, response: str) -> None:
+    """Append one record (blocking file I/O: call it from a thread)"""
+    line = json.dumps({"fingerprint": fingerprint, "response": response}) + "\n"
+    with _write_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line)
@@ -1,31 +1,87 @@
-from google.auth.transport import requests
-from google.oauth2 import id_token
+from google.auth import jwt
 from google.auth.exceptions import GoogleAuthError
 from typing import Optional, Dict, Any
 from app.config import settings
 from app.services.base.auth_service import AuthService
+from app.utils.http_clients import HTTPClients, http_clients
+import httpx
 import logging
+import re
+import time
 
 logger = logging.getLogger(__name__)
 
+# Unknown key ids trigger at most one certificate refetch per interval, so
+# tokens with made-up kids can't make every login hit Google
+CERT_REFETCH_MIN_SECONDS = 60
+
 class GoogleAuthService(AuthService):
     """
     Google OAuth authentication service implementation
     """
     
-    def __init__(self):
+    def __init__(self, clients: HTTPClients = http_clients):
         self.client_id = settings.GOOGLE_CLIENT_ID
+        self.clients = clients
+        self._certs: Dict[str, str] = {}
+        self._certs_expire_at = 0.0
+        self._certs_fetched_at: Optional[float] = None
+        self.cert_cache_hits = 0
+        self.cert_cache_misses = 0
+    
+    async def get_certs(self, refresh: bool = False) -> Dict[str, str]:
+        """
+        Google's token signing certificates (key id -> PEM), fetched over the
+        shared connection pool and cached for the response's max-age.
+        """
+        if self._certs and not refresh and time.monotonic() < self._certs_expire_at:
+            self.cert_cache_hits += 1
+            return self._certs
+        
+        self.cert_cache_misses += 1
+        self._certs_fetched_at = time.monotonic()  # Set before awaiting so concurrent refreshes are throttled too
+        response = await self.clients.get("google").get(settings.GOOGLE_CERTS_URL)
+        response.raise_for_status()
+        max_age = re.search(r"max-age=(\d+)", response.headers.get("cache-control", ""))
+        self._certs = response.json()
+        self._certs_expire_at = time.monotonic() + (int(max_age.group(1)) if max_age else 0)
+        return self._certs
+    
+    def cert_cache_stats(self) -> Dict[str, int]:
+        """Counters for the metrics endpoint"""
+        return {"hits": self.cert_cache_hits, "misses": self.cert_cache_misses}
+    
+    def _can_refetch(self) -> bool:
+        return (
+            self._certs_fetched_at is None
+            or time.monotonic() - self._certs_fetched_at >= CERT_REFETCH_MIN_SECONDS
+        )
+    
+    async def warm_up(self) -> None:
+        """Open the Google connection and cache certificates before the first login"""
+        try:
+            await self.get_certs()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not prefetch Google certificates: {e}")
     
     async def verify_google_token(self, token: str) -> Optional[Dict[str, Any]]:
         """
         Verify Google OAuth ID token using official google-auth library.
         """
         try:
+            certs = await self.get_certs()
+            kid = jwt.decode_header(token).get("kid")
+            if kid not in certs:
+                if not self._can_refetch():
+                    logger.warning(f"Unknown token key id {kid!r} (certificates refetched recently)")
+                    return None
+                certs = await self.get_certs(refresh=True)  # Google rotated its keys
+            
             # Verify token signature and claims automatically
-            idinfo = id_token.verify_oauth2_token(
+            idinfo = jwt.decode(
                 token,
-                requests.Request(),
-                self.client_id,
+                certs=certs,
+                audience=self.client_id,
                 clock_skew_in_seconds=10
             )
             
@@ -52,6 +108,9 @@ class GoogleAuthService(AuthService):
         except GoogleAuthError as e:
             logger.error(f"Google auth error: {e}")
             return None
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to fetch Google certificates: {e}")
+            return None
         except ValueError as e:
             logger.error(f"Token validation error: {e}")
             return None
@@ -0,0 +1,221 @@
+"""
+Offline LLM provider for load, latency and regression testing.
+
+Responses come from, in order:
+1. Recordings: JSONL of {"fingerprint", "response"} written by OpenAIProvider
+   when LLM_RECORD_RESPONSES_PATH is set (see app.services.base.llm_recordings)
+2. Parse prompts (NLP to scenario/template): schema-valid JSON synthesized
+   from the description with the local fast-path parser
+3. Anything else: deterministic filler text
+
+Latency is sampled per call (time to first token) plus a per-token delay,
+and streaming yields one word-sized chunk at a time.
+"""
+import asyncio
+import json
+import logging
+import math
+import random
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+import openai
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+
+from app.config import settings
+from app.services.base.llm_provider import LLMProvider
+from app.services.base.llm_recordings import load_recordings, prompt_fingerprint
+from app.services.model_router import ModelProfile
+from app.services.nlp_fast_path import ROLE_DEFINITIONS, parse_fast_path
+
+logger = logging.getLogger(__name__)
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "lognormal", "exponential")
+
+FILLER_WORDS = (
+    "runway burn revenue hiring plan cost structure growth funding margin scenario "
+    "engineering design quarter cash flow milestone risk recommendation headcount"
+).split()
+
+_DESCRIPTION_PATTERNS = (
+    re.compile(r'"""(?P<text>.*?)"""', re.DOTALL),
+    re.compile(r"extract structured data:\s*(?P<text>.*?)\s*Return ONLY", re.DOTALL),
+)
+_CHUNK_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+class LatencyModel:
+    """Samples call latencies (seconds) from a named distribution around a median"""
+
+    def __init__(self, distribution: str, median_ms: float, sigma: float, rng: random.Random):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{distribution}', expected one of {LATENCY_DISTRIBUTIONS}")
+        self.distribution = distribution
+        self.median = median_ms / 1000
+        self.sigma = sigma
+        self.rng = rng
+
+    def sample(self) -> float:
+        if self.median <= 0:
+            return 0.0
+        if self.distribution == "constant":
+            return self.median
+        if self.distribution == "uniform":
+            return self.rng.uniform(self.median * max(0.0, 1 - self.sigma), self.median * (1 + self.sigma))
+        if self.distribution == "lognormal":
+            return self.median * math.exp(self.rng.gauss(0, self.sigma))
+        # exponential: median = ln(2) / rate
+        return self.rng.expovariate(math.log(2) / self.median)
+
+
+def _synthesize_parse_response(system_prompt: str, user_prompt: str) -> str:
+    """Schema-valid JSON for the NLP parse prompts, built with the fast-path parser"""
+    description = ""
+    for pattern in _DESCRIPTION_PATTERNS:
+        match = pattern.search(user_prompt)
+        if match:
+            description = match.group("text").strip()
+            break
+
+    fast_result = parse_fast_path(description) if description else None
+    if fast_result and (fast_result.data["costs"] or fast_result.data["revenues"]):
+        data = fast_result.data
+    else:
+        engineer = ROLE_DEFINITIONS["engineer"]
+        data = {
+            "scenario": {"name": "Generated Scenario", "description": description[:200], "funding": 0},
+            "costs": [{
+                "title": f"{engineer['title']} #1",
+                "value": str(engineer["salary"]),
+                "category": engineer["category"],
+                "starts_at": "1",
+                "end_at": "",
+                "freq": "annual",
+            }],
+            "revenues": [],
+        }
+
+    if "template format" not in system_prompt:
+        # parse_nlp_to_scenario schema: numbers as numbers, is_active flags
+        for key, freq in (("costs", "yearly"), ("revenues", "monthly")):
+            for item in data[key]:
+                item["value"] = float(item["value"])
+                item["starts_at"] = int(item["starts_at"])
+                item["end_at"] = int(item["end_at"]) if item["end_at"] else None
+                item["freq"] = freq
+                item["is_active"] = True
+    return json.dumps(data, indent=2)
+
+
+class FakeChatModel:
+    """Chat model double with LangChain's ainvoke/astream interface"""
+
+    def __init__(self, provider: "FakeLLMProvider", profile: ModelProfile):
+        self.provider = provider
+        self.profile = profile
+        self.model_name = f"fake-{profile.model}"
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        recorded = self.provider.recordings.get(prompt_fingerprint(messages))
+        if recorded is not None:
+            self.provider.replayed += 1
+            return recorded
+
+        system_prompt = next((m.content for m in messages if m.type == "system"), "")
+        user_prompt = messages[-1].content if messages else ""
+        if '"costs"' in system_prompt and '"revenues"' in system_prompt:
+            self.provider.synthesized += 1
+            return _synthesize_parse_response(system_prompt, user_prompt)
+
+        self.provider.generated += 1
+        rng = random.Random(prompt_fingerprint(messages))
+        words = [rng.choice(FILLER_WORDS) for _ in range(self.provider.response_words)]
+        return f"Fake {self.profile.name} response.\n\n" + " ".join(words).capitalize() + "."
+
+    def _maybe_fail(self) -> None:
+        if self.provider.rng.random() < self.provider.error_rate:
+            raise openai.APIConnectionError(
+                message="Simulated provider failure",
+                request=httpx.Request("POST", "https://fake-llm.local/v1/chat/completions"),
+            )
+
+    def _usage(self, messages: List[BaseMessage], response: str) -> Dict[str, int]:
+        input_tokens = sum(len(m.content) for m in messages) // 4 + 1
+        output_tokens = len(response) // 4 + 1
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+    async def ainvoke(self, messages: List[BaseMessage]) -> AIMessage:
+        response = self._respond(messages)
+        chunks = _CHUNK_PATTERN.findall(response)
+        await asyncio.sleep(self.provider.ttft.sample() + len(chunks) * self.provider.token_delay)
+        self._maybe_fail()
+        return AIMessage(content=response, usage_metadata=self._usage(messages, response))
+
+    async def astream(self, messages: List[BaseMessage]) -> AsyncIterator[AIMessageChunk]:
+        response = self._respond(messages)
+        await asyncio.sleep(self.provider.ttft.sample())
+        self._maybe_fail()
+        chunks = _CHUNK_PATTERN.findall(response)
+        for i, chunk in enumerate(chunks):
+            if i:
+                await asyncio.sleep(self.provider.token_delay)
+            usage = self._usage(messages, response) if i == len(chunks) - 1 else None
+            yield AIMessageChunk(content=chunk, usage_metadata=usage)
+
+
+class FakeLLMProvider(LLMProvider):
+    """
+    Offline provider implementation (no network, no credits)
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        recordings_path: Optional[str] = None,
+        latency_distribution: str = "lognormal",
+        ttft_ms: float = 300,
+        latency_sigma: float = 0.5,
+        token_ms: float = 15,
+        response_words: int = 150,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.rng = random.Random(seed)
+        self.recordings = load_recordings(recordings_path)
+        self.ttft = LatencyModel(latency_distribution, ttft_ms, latency_sigma, self.rng)
+        self.token_delay = token_ms / 1000
+        self.response_words = response_words
+        self.error_rate = error_rate
+        self.replayed = 0
+        self.synthesized = 0
+        self.generated = 0
+
+    @classmethod
+    def from_settings(cls) -> "FakeLLMProvider":
+        return cls(
+            recordings_path=settings.LLM_FAKE_RECORDINGS_PATH,
+            latency_distribution=settings.LLM_FAKE_LATENCY_DISTRIBUTION,
+            ttft_ms=settings.LLM_FAKE_TTFT_MS,
+            latency_sigma=settings.LLM_FAKE_LATENCY_SIGMA,
+            token_ms=settings.LLM_FAKE_TOKEN_MS,
+            response_words=settings.LLM_FAKE_RESPONSE_WORDS,
+            error_rate=settings.LLM_FAKE_ERROR_RATE,
+            seed=settings.LLM_FAKE_SEED,
+        )
+
+    def create_chat_model(self, profile: ModelProfile) -> Any:
+        return FakeChatModel(self, profile)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "recordings": len(self.recordings),
+            "replayed": self.replayed,
+            "synthesized": self.synthesized,
+            "generated": self.generated,
+        }
@@ -0,0 +1,59 @@
+import asyncio
+from langchain_openai import ChatOpenAI
+from langchain_core.messages import AIMessageChunk, BaseMessage
+from typing import Any, AsyncIterator, List, Optional
+from app.config import settings
+from app.services.base.llm_provider import LLMProvider
+from app.services.base.llm_recordings import append_recording, prompt_fingerprint
+from app.services.model_router import ModelProfile
+from app.utils.http_clients import HTTPClients, http_clients
+
+
+class RecordingChatModel:
+    """Passes calls through to a chat model and appends each response to a recordings file"""
+
+    def __init__(self, model: Any, path: str):
+        self.model = model
+        self.path = path
+
+    async def ainvoke(self, messages: List[BaseMessage]) -> BaseMessage:
+        response = await self.model.ainvoke(messages)
+        await asyncio.to_thread(append_recording, self.path, prompt_fingerprint(messages), response.content)
+        return response
+
+    async def astream(self, messages: List[BaseMessage]) -> AsyncIterator[AIMessageChunk]:
+        parts = []
+        async for chunk in self.model.astream(messages):
+            parts.append(chunk.content)
+            yield chunk
+        await asyncio.to_thread(append_recording, self.path, prompt_fingerprint(messages), "".join(parts))
+
+
+class OpenAIProvider(LLMProvider):
+    """
+    OpenAI provider implementation (ChatOpenAI via LangChain)
+    """
+
+    name = "openai"
+
+    def __init__(self, record_path: Optional[str] = None, clients: HTTPClients = http_clients):
+        if not settings.OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY is not set in environment variables")
+        self.clients = clients
+        # When set, responses are recorded for replay by the fake provider
+        self.record_path = record_path
+
+    def create_chat_model(self, profile: ModelProfile) -> Any:
+        model = ChatOpenAI(
+            model=profile.model,
+            api_key=settings.OPENAI_API_KEY,
+            temperature=profile.temperature,
+            max_tokens=profile.max_tokens,
+            timeout=profile.timeout,
+            max_retries=0,  # Retries are handled by LLMService so they respect the circuit breaker
+            stream_usage=True,  # Token usage on the last streamed chunk, for telemetry
+            http_async_client=self.clients.get("openai"),  # Shared keep-alive pool across profiles
+        )
+        if self.record_path:
+            return RecordingChatModel(model, self.record_path)
+        return model
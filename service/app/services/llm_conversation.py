@@ -0,0 +1,136 @@
+"""
+Server-held chat conversations.
+
+Each call sends the conversation's system prompt, a rolling summary of
+older turns and a bounded window of recent messages, so prompt size stays
+constant however long the conversation runs. Messages folded into the
+summary are deleted, keeping storage to a few rows per conversation.
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from app.config import settings
+from app.models.llm_conversation import LLMConversation
+from app.repositories.llm_conversation_repo import LLMConversationRepository
+from app.services.llm_service import LLMService, LLMStream, get_llm_service
+from app.services.model_router import LLMTask
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_SYSTEM_PROMPT = """You maintain a running summary of a conversation between a user and a financial planning assistant.
+Update the existing summary with the new messages. Keep facts, numbers, decisions and open questions; drop pleasantries.
+Write at most 200 words of plain prose. Return ONLY the updated summary."""
+
+
+async def build_conversation_context(
+    conversation: LLMConversation
+) -> Tuple[Optional[str], List[Dict[str, str]]]:
+    """
+    Build the (system_prompt, messages) context for the next call:
+    the rolling summary is appended to the system prompt and only the
+    last LLM_CHAT_MAX_RECENT_MESSAGES messages are included.
+    """
+    recent = await LLMConversationRepository.get_messages_after(
+        conversation.id, conversation.summarized_through
+    )
+    # Summarization runs after the response, so a burst of calls can briefly
+    # outrun it; the window cap keeps the prompt bounded meanwhile
+    recent = recent[-settings.LLM_CHAT_MAX_RECENT_MESSAGES:]
+
+    system_parts = [part for part in (conversation.system_prompt,) if part]
+    if conversation.summary:
+        system_parts.append(f"Summary of the earlier conversation:\n{conversation.summary}")
+    system_prompt = "\n\n".join(system_parts) or None
+
+    return system_prompt, [{"role": message.role, "content": message.content} for message in recent]
+
+
+async def store_turn(
+    conversation: LLMConversation,
+    new_messages: List[Dict[str, str]],
+    response: str
+) -> bool:
+    """
+    Store the new messages and the reply.
+
+    Returns:
+        Whether the conversation is due for summarization
+    """
+    last_seq = await LLMConversationRepository.append_messages(
+        conversation.id,
+        new_messages + [{"role": "assistant", "content": response}]
+    )
+    return last_seq - conversation.summarized_through > settings.LLM_CHAT_MAX_RECENT_MESSAGES
+
+
+async def chat_in_conversation(
+    llm_service: LLMService,
+    conversation: LLMConversation,
+    new_messages: List[Dict[str, str]]
+) -> Tuple[str, bool]:
+    """
+    Send new messages in the context of a stored conversation and store
+    both them and the reply.
+
+    Returns:
+        (reply, whether the conversation is due for summarization)
+    """
+    system_prompt, context = await build_conversation_context(conversation)
+    response = await llm_service.chat(messages=context + new_messages, system_prompt=system_prompt)
+    return response, await store_turn(conversation, new_messages, response)
+
+
+async def stream_chat_in_conversation(
+    llm_service: LLMService,
+    conversation: LLMConversation,
+    new_messages: List[Dict[str, str]]
+) -> LLMStream:
+    """
+    Streaming variant of chat_in_conversation. Nothing is stored here: the
+    caller passes the full reply to store_turn once the stream completes,
+    so an abandoned stream leaves the conversation unchanged.
+    """
+    system_prompt, context = await build_conversation_context(conversation)
+    return llm_service.stream_chat(messages=context + new_messages, system_prompt=system_prompt)
+
+
+async def summarize_conversation(conversation_id: UUID) -> None:
+    """
+    Fold all but the last LLM_CHAT_KEEP_RECENT_MESSAGES messages into the
+    rolling summary. Runs as a background task after the chat response.
+    """
+    conversation = await LLMConversation.get_or_none(id=conversation_id)
+    if conversation is None:
+        return
+
+    messages = await LLMConversationRepository.get_messages_after(
+        conversation.id, conversation.summarized_through
+    )
+    to_fold = messages[:-settings.LLM_CHAT_KEEP_RECENT_MESSAGES] if settings.LLM_CHAT_KEEP_RECENT_MESSAGES else messages
+    if not to_fold:
+        return
+
+    transcript = "\n".join(f"{message.role}: {message.content}" for message in to_fold)
+    prompt = f"""Existing summary:
+{conversation.summary or "(none)"}
+
+New messages:
+{transcript}"""
+
+    try:
+        summary = await get_llm_service().generate_text(prompt, SUMMARY_SYSTEM_PROMPT, LLMTask.SUMMARIZATION)
+    except Exception as e:
+        # The window cap keeps prompts bounded; the next turn will retry
+        logger.warning(f"Conversation {conversation_id} summarization failed: {str(e)}")
+        return
+
+    summarized_through = to_fold[-1].seq
+    stored = await LLMConversationRepository.update_summary(
+        conversation.id,
+        expected_through=conversation.summarized_through,
+        summary=summary.strip(),
+        summarized_through=summarized_through,
+    )
+    if stored:
+        await LLMConversationRepository.delete_messages_through(conversation.id, summarized_through)
+        logger.info(f"Conversation {conversation_id}: folded {len(to_fold)} messages into summary")
@@ -0,0 +1,244 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional, Set
+from uuid import UUID
+from app.config import settings
+from app.models.llm_job import LLMJob
+from app.repositories.llm_job_repo import LLMJobRepository
+from app.services.llm_service import get_llm_service
+from app.services.scenario_comparison import load_comparison_data
+from app.utils.request_context import current_user_id
+
+logger = logging.getLogger(__name__)
+
+
+class LLMJobTask(str, Enum):
+    """Tasks that can run as background jobs"""
+    COMPARE = "compare"
+    ANALYZE = "analyze"
+    PARSE = "parse"
+
+
+class LLMJobStatus(str, Enum):
+    """Job lifecycle states"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+FINISHED_STATUSES = {LLMJobStatus.COMPLETED.value, LLMJobStatus.FAILED.value}
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity"""
+
+
+def job_to_dict(job: LLMJob) -> dict:
+    """Helper to convert LLMJob model to dict"""
+    return {
+        "id": str(job.id),
+        "task": job.task,
+        "status": job.status,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+class LLMJobQueue:
+    """
+    Bounded in-process queue with a fixed pool of async workers.
+
+    Jobs are persisted in the llm_jobs table, so they survive client
+    disconnects; the queue only carries job IDs. Pending jobs that didn't
+    fit are loaded from the table as slots free up. Status changes are pushed
+    to in-process subscribers (used by the SSE endpoint).
+    """
+
+    def __init__(self, worker_count: int, max_size: int, poll_interval: float):
+        self.worker_count = worker_count
+        self.max_size = max_size
+        self.poll_interval = poll_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._poller: Optional[asyncio.Task] = None
+        self._reserved = 0  # Slots held by enqueue() calls still inserting their row
+        self._scheduled: Set[UUID] = set()  # Queued or being processed here
+        self._backlog = False  # Pending rows may be waiting for a free slot
+        self._subscribers: Dict[UUID, Set[asyncio.Queue]] = {}
+
+    def _free_slots(self) -> int:
+        return self.max_size - self._queue.qsize() - self._reserved
+
+    def _schedule(self, job_id: UUID) -> None:
+        self._scheduled.add(job_id)
+        self._queue.put_nowait(job_id)
+
+    async def _fill_from_db(self) -> int:
+        """
+        Queue pending jobs from the database while there is room: jobs that
+        didn't fit at startup or when enqueued elsewhere, and requeued stale
+        jobs. claim_job() keeps a job from running twice.
+        """
+        free = self._free_slots()
+        if free <= 0:
+            self._backlog = True
+            return 0
+        job_ids = await LLMJobRepository.get_pending_job_ids(limit=free, exclude=self._scheduled)
+        self._backlog = len(job_ids) >= free  # There may be more than fitted
+        scheduled = 0
+        for job_id in job_ids:
+            if self._free_slots() <= 0:
+                break  # enqueue() calls took the room meanwhile
+            if job_id not in self._scheduled:
+                self._schedule(job_id)
+                scheduled += 1
+        return scheduled
+
+    async def _requeue_stale(self) -> None:
+        """Reset jobs whose worker died mid-run back to pending"""
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.LLM_JOB_STALE_SECONDS)
+        requeued = await LLMJobRepository.requeue_stale_jobs(stale_before)
+        if requeued:
+            logger.warning(f"Requeued {requeued} stale LLM jobs")
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self._requeue_stale()
+                await self._fill_from_db()
+            except Exception as e:
+                logger.error(f"❌ Failed to load pending LLM jobs: {str(e)}")
+
+    async def start(self) -> None:
+        """Start workers and pick up jobs left over from a previous run"""
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        await self._requeue_stale()
+        await self._fill_from_db()
+
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"llm-job-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        self._poller = asyncio.create_task(self._poll(), name="llm-job-poller")
+        logger.info(f"✅ LLM job queue started with {self.worker_count} workers")
+
+    async def stop(self) -> None:
+        """Cancel workers; running jobs are picked up again on next start"""
+        tasks = self._workers + ([self._poller] if self._poller else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._poller = None
+
+    async def enqueue(self, user_id: UUID, task: LLMJobTask, payload: dict) -> LLMJob:
+        """Persist a job and schedule it"""
+        # Reserve the slot before inserting, so concurrent calls can't overfill the queue
+        if self._queue is None or self._free_slots() <= 0:
+            raise QueueFullError("LLM job queue is full, try again later")
+        self._reserved += 1
+        try:
+            job = await LLMJobRepository.create_job(user_id, task.value, payload)
+        finally:
+            self._reserved -= 1
+        self._schedule(job.id)
+        logger.info(f"Enqueued LLM job {job.id} ({task.value})")
+        return job
+
+    def subscribe(self, job_id: UUID) -> asyncio.Queue:
+        """Receive job snapshots (dicts) whenever the job changes state"""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: UUID, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(job_id)
+        if subscribers:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[job_id]
+
+    async def _notify(self, job_id: UUID) -> None:
+        if job_id not in self._subscribers:
+            return
+        job = await LLMJobRepository.get_job_by_id(job_id)
+        if job:
+            snapshot = job_to_dict(job)
+            for queue in self._subscribers.get(job_id, ()):
+                queue.put_nowait(snapshot)
+
+    async def _worker(self, worker_number: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._process(job_id)
+            except Exception as e:
+                logger.error(f"❌ LLM job worker {worker_number} error on {job_id}: {str(e)}")
+            finally:
+                self._scheduled.discard(job_id)
+                self._queue.task_done()
+            if self._backlog:
+                try:
+                    await self._fill_from_db()
+                except Exception as e:
+                    logger.error(f"❌ Failed to load pending LLM jobs: {str(e)}")
+
+    async def _process(self, job_id: UUID) -> None:
+        if not await LLMJobRepository.claim_job(job_id):
+            return  # Already claimed by another worker/process
+        await self._notify(job_id)
+
+        job = await LLMJobRepository.get_job_by_id(job_id)
+        current_user_id.set(job.user_id)
+        try:
+            result = await self._run(job)
+        except Exception as e:
+            logger.error(f"❌ LLM job {job_id} failed: {str(e)}")
+            await LLMJobRepository.fail_job(job_id, str(e))
+        else:
+            logger.info(f"✅ LLM job {job_id} completed")
+            await LLMJobRepository.complete_job(job_id, result)
+        await self._notify(job_id)
+
+    async def _run(self, job: LLMJob) -> Any:
+        """Execute the job's task and return a JSON-serializable result"""
+        llm_service = get_llm_service()
+        payload = job.payload
+
+        if job.task == LLMJobTask.COMPARE.value:
+            scenario1, scenario2, scenario1_data, scenario2_data = await load_comparison_data(
+                payload["scenario1_id"], payload["scenario2_id"]
+            )
+            report = await llm_service.compare_scenarios(scenario1_data, scenario2_data)
+            return {
+                "report": report,
+                "scenario1": {"id": str(scenario1.id), "name": scenario1.name},
+                "scenario2": {"id": str(scenario2.id), "name": scenario2.name},
+            }
+
+        if job.task == LLMJobTask.ANALYZE.value:
+            response = await llm_service.analyze_scenario(
+                scenario_data=payload["scenario_data"],
+                question=payload.get("question")
+            )
+            return {"response": response}
+
+        if job.task == LLMJobTask.PARSE.value:
+            return await llm_service.parse_nlp_to_template(payload["nlp_input"])
+
+        raise ValueError(f"Unknown job task: {job.task}")
+
+
+# Singleton instance
+llm_job_queue = LLMJobQueue(
+    worker_count=settings.LLM_JOB_WORKERS,
+    max_size=settings.LLM_JOB_QUEUE_SIZE,
+    poll_interval=settings.LLM_JOB_POLL_SECONDS,
+)
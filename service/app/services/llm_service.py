@@ -1,39 +1,174 @@
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
+import openai
+from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, AIMessageChunk, BaseMessage
 from app.config import settings
-from typing import Optional, List, Dict, Any
+from app.services.nlp_fast_path import parse_fast_path
+from app.services.nlp_semantic_cache import SemanticParseCache
+from app.services.model_router import LLMTask, ModelProfile, ModelRouter
+from app.services.base.llm_provider import LLMProvider
+from app.services.llm_telemetry import CacheStatus, LLMCallRecord, llm_telemetry
+from app.services.prompt_builder import PromptBuilder
+from app.utils.singleflight import SingleFlight
+from app.utils.resilience import CircuitBreaker, CircuitOpenError, retry_with_backoff
+from app.utils.json_stream import IncrementalJSONParser, parse_json_response, require_keys
+from app.utils.request_context import current_user_id
+from app.utils.request_timing import record_phase
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
+import asyncio
 import json
+import hashlib
+import logging
+import time
 
+logger = logging.getLogger(__name__)
 
-class LLMService:
-    """Service for interacting with ChatGPT via LangChain"""
+# Provider errors worth retrying; these also count as failures for the circuit breaker
+RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Whether an LLM call error is transient (timeouts, connection issues, 429, 5xx)"""
+    return isinstance(error, RETRYABLE_ERRORS)
+
+# Static system prompts. Keeping these byte-identical across calls (and
+# putting per-request data last) lets provider-side prompt caching reuse
+# the prefix.
+ANALYSIS_SYSTEM_PROMPT = """You are a financial planning assistant specializing in startup burn rate analysis and runway calculations. 
+        Provide clear, actionable insights about financial scenarios."""
+
+COMPARISON_SYSTEM_PROMPT = """You are a financial planning assistant specializing in startup financial analysis and scenario comparison. 
+You provide clear, actionable insights comparing different financial scenarios, focusing on:
+- Burn rate and runway analysis
+- Cost structure differences
+- Revenue projections and growth potential
+- Risk assessment
+- Strategic recommendations
+
+Provide comprehensive, well-structured comparison reports that help founders make informed decisions.
+
+Cost structures are summarized per category with only the largest items listed; treat "... and N more items" as real items included in the category totals.
+
+Please provide a detailed comparison report covering:
+
+1. **Executive Summary**
+   - Key differences at a glance
+   - Which scenario appears more sustainable
+
+2. **Financial Metrics Comparison**
+   - Burn rate differences
+   - Runway comparison
+   - Growth potential analysis
+   - Funding adequacy
+
+3. **Cost Structure Analysis**
+   - Team composition differences
+   - Cost efficiency comparison
+   - Hiring timeline impact
+
+4. **Revenue Projections**
+   - Revenue generation differences
+   - Growth trajectory comparison
+   - Time to profitability
+
+5. **Risk Assessment**
+   - Risk factors for each scenario
+   - Sustainability concerns
+   - Cash flow risks
+
+6. **Strategic Recommendations**
+   - Which scenario to choose and why
+   - Hybrid approaches or modifications
+   - Key milestones to monitor
+
+Format your response in a clear, structured manner with sections and bullet points where appropriate."""
+
+# Top-level arrays of the scenario/template JSON; items are streamed as they complete
+TEMPLATE_ITEM_KEYS = ("costs", "revenues")
+# Keys callers index directly; a truncated response repaired without them is rejected
+TEMPLATE_REQUIRED_KEYS = ("scenario.name",)
+
+MULTI_COMPARISON_SYSTEM_PROMPT = """You are a financial planning assistant specializing in startup financial analysis and scenario comparison.
+You compare several financial plans side by side using precomputed first-year metrics, focusing on burn rate, runway, cost structure, revenue and risk.
+Provide concise, well-structured comparison reports that help founders pick a plan.
+
+Please provide:
+1. **Executive Summary** - key differences and the most sustainable plan
+2. **Ranking** - rank the scenarios from strongest to weakest with a one-line reason each
+3. **Burn & Runway** - how burn and runway differ and what drives it
+4. **Cost Structure** - notable differences in spend by category
+5. **Risks** - the main risk for each scenario
+6. **Recommendation** - which plan to choose, and any hybrid worth considering
+
+Format your response with clear sections and bullet points."""
+
+
+class LLMStream:
+    """
+    Text chunks of a streamed LLM call. `profile` is the model profile that
+    answered, set once the first chunk has arrived (None before that, or if
+    no profile answered).
+    """
     
     def __init__(self):
-        if not settings.OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY is not set in environment variables")
-        
-        self.llm = ChatOpenAI(
+        self.profile: Optional[ModelProfile] = None
+        self._chunks: Optional[AsyncIterator[str]] = None
+    
+    @property
+    def model(self) -> Optional[str]:
+        return self.profile.model if self.profile else None
+    
+    def __aiter__(self) -> "LLMStream":
+        return self
+    
+    async def __anext__(self) -> str:
+        return await self._chunks.__anext__()
+    
+    async def aclose(self) -> None:
+        await self._chunks.aclose()
+
+
+class LLMService:
+    """Service for interacting with ChatGPT (or another LLMProvider) via LangChain"""
+    
+    def __init__(self, provider: LLMProvider):
+        self.provider = provider
+        # Each task (chat, extraction, comparison, ...) gets its own model profiles
+        self.router = ModelRouter(
+            profiles=settings.LLM_MODEL_PROFILES,
+            routes=settings.LLM_TASK_ROUTES,
+            model_factory=provider.create_chat_model,
+            cooldown=settings.LLM_ROUTER_COOLDOWN_SECONDS,
+        )
+        self.prompt_builder = PromptBuilder(
             model=settings.OPENAI_MODEL,
-            api_key=settings.OPENAI_API_KEY,
-            temperature=settings.OPENAI_TEMPERATURE,
-            max_tokens=2048,
+            token_budget=settings.LLM_PROMPT_TOKEN_BUDGET,
+            top_k=settings.LLM_PROMPT_TOP_K,
+        )
+        # Near-duplicate NLP inputs reuse earlier parses
+        self.nlp_cache = SemanticParseCache(
+            threshold=settings.NLP_SEMANTIC_CACHE_THRESHOLD,
+            max_entries=settings.NLP_SEMANTIC_CACHE_SIZE,
+        )
+        # Identical in-flight prompts share one provider call
+        self.singleflight = SingleFlight()
+        # Bound concurrent provider calls so a slow provider can't pile up sockets
+        self.semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        self.circuit_breaker = CircuitBreaker(
+            "llm",
+            failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.LLM_CIRCUIT_RESET_SECONDS,
         )
     
-    async def chat(
+    def _to_langchain_messages(
         self,
         messages: List[Dict[str, str]],
         system_prompt: Optional[str] = None
-    ) -> str:
-        """
-        Send messages to the LLM and get a response.
-        
-        Args:
-            messages: List of message dicts with 'role' and 'content' keys
-            system_prompt: Optional system prompt to set context
-        
-        Returns:
-            LLM response as string
-        """
+    ) -> List[BaseMessage]:
+        """Convert role/content message dicts into LangChain message objects"""
         langchain_messages = []
         
         if system_prompt:
@@ -46,16 +181,302 @@ class LLMService:
             if role == "user":
                 langchain_messages.append(HumanMessage(content=content))
             elif role == "assistant":
-                from langchain_core.messages import AIMessage
                 langchain_messages.append(AIMessage(content=content))
         
-        response = await self.llm.ainvoke(langchain_messages)
-        return response.content
+        return langchain_messages
+    
+    def _prompt_key(self, task: LLMTask, langchain_messages: List[BaseMessage]) -> str:
+        """Hash of the task (which determines the models) and messages, used to coalesce identical calls"""
+        payload = json.dumps(
+            {
+                "task": task.value,
+                "messages": [(m.type, m.content) for m in langchain_messages],
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def _deadline(self, profiles: List[ModelProfile], index: int) -> float:
+        """A profile with a fallback after it is cut off at its latency SLO"""
+        profile = profiles[index]
+        if index < len(profiles) - 1:
+            return min(profile.latency_slo, profile.timeout)
+        return profile.timeout
+    
+    def _fall_back(self, profiles: List[ModelProfile], index: int) -> None:
+        profile = profiles[index]
+        self.router.record_slo_miss(profile)
+        logger.warning(
+            f"⏱ LLM profile '{profile.name}' ({profile.model}) missed its "
+            f"{self._deadline(profiles, index):.1f}s latency SLO, falling back to '{profiles[index + 1].name}'"
+        )
+    
+    async def _invoke_routed(
+        self, task: LLMTask, langchain_messages: List[BaseMessage]
+    ) -> Tuple[ModelProfile, BaseMessage]:
+        """
+        Call the task's models through the stream path, so the latency SLO
+        applies to the time to first token: a model that has started
+        answering is allowed to finish a long answer instead of being cut
+        off (and its tokens wasted) at the SLO.
+        
+        Returns:
+            (profile that answered, response with the chunks merged)
+        """
+        profile, iterator, chunk = await self._open_stream(task, langchain_messages)
+        response = None
+        try:
+            while chunk is not None:
+                response = chunk if response is None else response + chunk
+                try:
+                    chunk = await asyncio.wait_for(iterator.__anext__(), timeout=profile.timeout)
+                except StopAsyncIteration:
+                    chunk = None
+        finally:
+            await iterator.aclose()
+        return profile, response if response is not None else AIMessageChunk(content="")
+    
+    def _record_call(
+        self,
+        task: LLMTask,
+        model: str,
+        cache_status: str,
+        started: float,
+        usage: Optional[Dict[str, Any]] = None,
+        ttft_ms: Optional[float] = None,
+        streamed: bool = False,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Report a call to telemetry; usage is LangChain usage_metadata"""
+        usage = usage or {}
+        latency_ms = (time.monotonic() - started) * 1000
+        record_phase("llm", latency_ms)
+        llm_telemetry.record(LLMCallRecord(
+            task=task.value,
+            model=model,
+            cache_status=cache_status,
+            latency_ms=latency_ms,
+            ttft_ms=ttft_ms,
+            prompt_tokens=usage.get("input_tokens", 0),
+            cached_prompt_tokens=(usage.get("input_token_details") or {}).get("cache_read", 0),
+            completion_tokens=usage.get("output_tokens", 0),
+            streamed=streamed,
+            error=type(error).__name__ if error is not None else None,
+            user_id=current_user_id.get(),
+        ))
+    
+    def _primary_model(self, task: LLMTask) -> str:
+        """Model a failed call is attributed to"""
+        return self.router.route(task)[0].model
+    
+    async def _invoke(self, task: LLMTask, langchain_messages: List[BaseMessage]) -> BaseMessage:
+        """
+        Call the provider with a concurrency limit, per-chunk deadline,
+        model fallback on time to first token, jittered retries and circuit breaking.
+        """
+        started = time.monotonic()
+        try:
+            self.circuit_breaker.before_call()
+        except CircuitOpenError as e:
+            self._record_call(task, self._primary_model(task), CacheStatus.MISS, started, error=e)
+            raise
+        
+        async def attempt() -> Tuple[ModelProfile, BaseMessage]:
+            async with self.semaphore:
+                return await self._invoke_routed(task, langchain_messages)
+        
+        try:
+            profile, response = await retry_with_backoff(
+                attempt,
+                retries=settings.LLM_MAX_RETRIES,
+                base_delay=settings.LLM_RETRY_BASE_DELAY_SECONDS,
+                max_delay=settings.LLM_RETRY_MAX_DELAY_SECONDS,
+                is_retryable=is_retryable_error,
+            )
+        except asyncio.CancelledError as e:
+            # Caller went away: says nothing about the provider's health
+            self.circuit_breaker.record_cancelled()
+            self._record_call(task, self._primary_model(task), CacheStatus.MISS, started, error=e)
+            raise
+        except Exception as e:
+            # Non-transient errors (e.g. 400) still mean the provider is reachable
+            if is_retryable_error(e):
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+            self._record_call(task, self._primary_model(task), CacheStatus.MISS, started, error=e)
+            raise
+        self.circuit_breaker.record_success()
+        self._record_call(
+            task, profile.model, CacheStatus.MISS, started,
+            usage=getattr(response, "usage_metadata", None),
+        )
+        return response
+    
+    async def _open_stream(self, task: LLMTask, langchain_messages: List[BaseMessage]):
+        """
+        Start streaming from the task's primary model. If its first chunk
+        misses the latency SLO, the stream is dropped and the fallback used.
+        
+        Returns:
+            (profile, chunk iterator, first chunk or None if the stream was empty)
+        """
+        profiles = self.router.route(task)
+        for index, profile in enumerate(profiles):
+            started = time.monotonic()
+            iterator = self.router.get_model(profile).astream(langchain_messages).__aiter__()
+            try:
+                first_chunk = await asyncio.wait_for(
+                    iterator.__anext__(),
+                    timeout=self._deadline(profiles, index),
+                )
+            except StopAsyncIteration:
+                first_chunk = None
+            except asyncio.TimeoutError:
+                await iterator.aclose()
+                if index == len(profiles) - 1:
+                    raise
+                self._fall_back(profiles, index)
+                continue
+            except BaseException:
+                await iterator.aclose()
+                raise
+            self.router.record_call(profile, time.monotonic() - started)
+            return profile, iterator, first_chunk
+    
+    def _stream_call(self, task: LLMTask, langchain_messages: List[BaseMessage]) -> LLMStream:
+        stream = LLMStream()
+        stream._chunks = self._stream(task, langchain_messages, stream)
+        return stream
+    
+    async def _stream(
+        self, task: LLMTask, langchain_messages: List[BaseMessage], stream: LLMStream
+    ) -> AsyncIterator[str]:
+        """
+        Stream from the provider under the same concurrency limit and circuit
+        breaker as _invoke. The first chunk is subject to the latency SLO
+        fallback; after that the deadline applies per chunk. Streams are not
+        retried since tokens may already have been sent to the client.
+        The profile that answers is stored on `stream`.
+        """
+        started = time.monotonic()
+        try:
+            self.circuit_breaker.before_call()
+        except CircuitOpenError as e:
+            self._record_call(task, self._primary_model(task), CacheStatus.MISS, started, streamed=True, error=e)
+            raise
+        
+        async with self.semaphore:
+            iterator = None
+            profile = None
+            ttft_ms = None
+            usage = None  # Sent with the last chunk
+            error = None
+            failed = False
+            cancelled = False
+            try:
+                profile, iterator, chunk = await self._open_stream(task, langchain_messages)
+                stream.profile = profile
+                ttft_ms = (time.monotonic() - started) * 1000
+                while chunk is not None:
+                    usage = chunk.usage_metadata or usage
+                    if chunk.content:
+                        yield chunk.content
+                    try:
+                        chunk = await asyncio.wait_for(iterator.__anext__(), timeout=profile.timeout)
+                    except StopAsyncIteration:
+                        chunk = None
+            except (GeneratorExit, asyncio.CancelledError) as e:
+                error = e  # Client went away mid-stream
+                cancelled = True
+                raise
+            except Exception as e:
+                error = e
+                failed = is_retryable_error(e)
+                raise
+            finally:
+                if iterator is not None:
+                    await iterator.aclose()
+                if cancelled:
+                    self.circuit_breaker.record_cancelled()
+                elif failed:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+                self._record_call(
+                    task,
+                    profile.model if profile else self._primary_model(task),
+                    CacheStatus.MISS,
+                    started,
+                    usage=usage,
+                    ttft_ms=ttft_ms,
+                    streamed=True,
+                    error=error,
+                )
+    
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str] = None,
+        task: LLMTask = LLMTask.CHAT
+    ) -> str:
+        """
+        Send messages to the LLM and get a response.
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content' keys
+            system_prompt: Optional system prompt to set context
+            task: Kind of work, which selects the model profiles
+        
+        Returns:
+            LLM response as string
+        """
+        langchain_messages = self._to_langchain_messages(messages, system_prompt)
+        
+        async def invoke() -> str:
+            response = await self._invoke(task, langchain_messages)
+            return response.content
+        
+        key = self._prompt_key(task, langchain_messages)
+        if not self.singleflight.in_flight(key):
+            return await self.singleflight.do(key, invoke)
+        
+        # Joining an identical in-flight call: no provider call of our own
+        started = time.monotonic()
+        try:
+            response = await self.singleflight.do(key, invoke)
+        except Exception as e:
+            self._record_call(task, self._primary_model(task), CacheStatus.COALESCED, started, error=e)
+            raise
+        self._record_call(task, self._primary_model(task), CacheStatus.COALESCED, started)
+        return response
+    
+    def stream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str] = None,
+        task: LLMTask = LLMTask.CHAT
+    ) -> LLMStream:
+        """
+        Stream the LLM response token by token.
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content' keys
+            system_prompt: Optional system prompt to set context
+            task: Kind of work, which selects the model profiles
+        
+        Returns:
+            Async iterator of text chunks as they arrive from the provider;
+            its `model` is the model that answered
+        """
+        langchain_messages = self._to_langchain_messages(messages, system_prompt)
+        return self._stream_call(task, langchain_messages)
     
     async def generate_text(
         self,
         prompt: str,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        task: LLMTask = LLMTask.CHAT
     ) -> str:
         """
         Simple text generation from a single prompt.
@@ -63,31 +484,30 @@ class LLMService:
         Args:
             prompt: User prompt
             system_prompt: Optional system prompt for context
+            task: Kind of work, which selects the model profiles
         
         Returns:
             Generated text response
         """
         messages = [{"role": "user", "content": prompt}]
-        return await self.chat(messages, system_prompt)
+        return await self.chat(messages, system_prompt, task)
     
-    async def analyze_scenario(
+    def stream_text(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        task: LLMTask = LLMTask.CHAT
+    ) -> LLMStream:
+        """Streaming variant of generate_text"""
+        messages = [{"role": "user", "content": prompt}]
+        return self.stream_chat(messages, system_prompt, task)
+    
+    def _build_analysis_prompt(
         self,
         scenario_data: Dict[str, Any],
         question: Optional[str] = None
-    ) -> str:
-        """
-        Analyze scenario data and provide insights.
-        
-        Args:
-            scenario_data: Dictionary containing scenario information
-            question: Optional specific question about the scenario
-        
-        Returns:
-            Analysis response
-        """
-        system_prompt = """You are a financial planning assistant specializing in startup burn rate analysis and runway calculations. 
-        Provide clear, actionable insights about financial scenarios."""
-        
+    ) -> Tuple[str, str]:
+        """Build the (system_prompt, prompt) pair for scenario analysis"""
         prompt = f"""Analyze the following scenario data:
         
         Scenario Name: {scenario_data.get('name', 'N/A')}
@@ -100,7 +520,34 @@ class LLMService:
         {f'Question: {question}' if question else 'Provide a comprehensive analysis of this scenario, including burn rate insights, runway sustainability, and recommendations.'}
         """
         
-        return await self.generate_text(prompt, system_prompt)
+        return ANALYSIS_SYSTEM_PROMPT, prompt
+    
+    async def analyze_scenario(
+        self,
+        scenario_data: Dict[str, Any],
+        question: Optional[str] = None
+    ) -> str:
+        """
+        Analyze scenario data and provide insights.
+        
+        Args:
+            scenario_data: Dictionary containing scenario information
+            question: Optional specific question about the scenario
+        
+        Returns:
+            Analysis response
+        """
+        system_prompt, prompt = self._build_analysis_prompt(scenario_data, question)
+        return await self.generate_text(prompt, system_prompt, LLMTask.ANALYSIS)
+    
+    def stream_analyze_scenario(
+        self,
+        scenario_data: Dict[str, Any],
+        question: Optional[str] = None
+    ) -> LLMStream:
+        """Streaming variant of analyze_scenario"""
+        system_prompt, prompt = self._build_analysis_prompt(scenario_data, question)
+        return self.stream_text(prompt, system_prompt, LLMTask.ANALYSIS)
     
     async def parse_nlp_to_scenario(self, nlp_input: str) -> Dict[str, Any]:
         """
@@ -166,21 +613,14 @@ Return ONLY valid JSON in this exact format:
 
 Return ONLY the JSON object, no other text."""
 
-        response = await self.generate_text(prompt, system_prompt)
-        
-        # Try to extract JSON from response (handle markdown code blocks)
-        response = response.strip()
-        if response.startswith("on"):
-            response = response[7:]
-        if response.startswith("```"):
-            response = response[3:]
-        if response.endswith("```"):
-            response = response[:-3]
-        response = response.strip()
-        
+        response = await self.generate_text(prompt, system_prompt, LLMTask.EXTRACTION)
+        return self._parse_structured_response(response)
+    
+    def _parse_structured_response(self, response: str) -> Dict[str, Any]:
+        """Parse scenario/template JSON from the model, tolerating fences, prose and a truncated tail"""
         try:
-            return json.loads(response)
-        except json.JSONDecodeError as e:
+            return require_keys(parse_json_response(response, TEMPLATE_ITEM_KEYS), TEMPLATE_REQUIRED_KEYS)
+        except ValueError as e:
             raise ValueError(f"Failed to parse LLM response as JSON: {str(e)}\nResponse: {response}")
 
 
@@ -195,6 +635,118 @@ Return ONLY the JSON object, no other text."""
         Returns:
             Dictionary with scenario, costs, and revenues in template format
         """
+        local = self.parse_nlp_to_template_local(nlp_input)
+        if local is not None:
+            return local[1]
+        return await self.parse_nlp_to_template_llm(nlp_input)
+    
+    def parse_nlp_to_template_local(self, nlp_input: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Try to parse without calling the LLM.
+        
+        Returns:
+            (source, template data) where source is "fast_path" or "cache",
+            or None if the input needs the LLM
+        """
+        # Common descriptions ("3 engineers from month 2", "10K MRR from month 3", "1M funding")
+        # are handled locally; only fall back to the LLM when they can't be fully parsed
+        started = time.monotonic()
+        if settings.NLP_FAST_PATH_ENABLED:
+            fast_result = parse_fast_path(nlp_input)
+            if fast_result and fast_result.confidence >= settings.NLP_FAST_PATH_MIN_CONFIDENCE:
+                logger.info(f"⚡ NLP fast path hit (confidence={fast_result.confidence})")
+                self._record_call(LLMTask.EXTRACTION, "local", CacheStatus.FAST_PATH, started)
+                return "fast_path", fast_result.data
+        
+        if settings.NLP_SEMANTIC_CACHE_ENABLED:
+            cached = self.nlp_cache.lookup(nlp_input)
+            if cached is not None:
+                logger.info("⚡ NLP semantic cache hit")
+                self._record_call(LLMTask.EXTRACTION, "local", CacheStatus.SEMANTIC_CACHE, started)
+                return "cache", cached
+        
+        return None
+    
+    async def parse_nlp_to_template_llm(self, nlp_input: str) -> Dict[str, Any]:
+        """LLM part of parse_nlp_to_template (skips the fast path and cache)"""
+        system_prompt, prompt = self._build_template_prompt(nlp_input)
+        response = await self.generate_text(prompt, system_prompt, LLMTask.EXTRACTION)
+        parsed_data = self._normalize_template(self._parse_structured_response(response))
+        
+        if settings.NLP_SEMANTIC_CACHE_ENABLED:
+            self.nlp_cache.store(nlp_input, parsed_data)
+        return parsed_data
+    
+    async def stream_parse_nlp_to_template(self, nlp_input: str) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of parse_nlp_to_template.
+        
+        Yields:
+            ("scenario", scenario), ("cost", item) and ("revenue", item) as each
+            object completes in the model output, then ("done", full template)
+        """
+        local = self.parse_nlp_to_template_local(nlp_input)
+        if local is not None:
+            parsed_data = local[1]
+            yield "scenario", parsed_data.get("scenario", {})
+            for cost in parsed_data.get("costs", []):
+                yield "cost", cost
+            for revenue in parsed_data.get("revenues", []):
+                yield "revenue", revenue
+            yield "done", parsed_data
+            return
+        
+        system_prompt, prompt = self._build_template_prompt(nlp_input)
+        parser = IncrementalJSONParser(item_keys=TEMPLATE_ITEM_KEYS, object_keys=("scenario",))
+        item_events = {"costs": "cost", "revenues": "revenue"}
+        async for chunk in self.stream_text(prompt, system_prompt, LLMTask.EXTRACTION):
+            for key, value in parser.feed(chunk):
+                if key in item_events and isinstance(value, dict):
+                    yield item_events[key], self._normalize_template_item(value)
+                elif key == "scenario":
+                    yield "scenario", value
+        
+        try:
+            parsed_data = self._normalize_template(require_keys(parser.finish(), TEMPLATE_REQUIRED_KEYS))
+        except ValueError as e:
+            raise ValueError(f"Failed to parse LLM response as JSON: {str(e)}\nResponse: {parser.text}")
+        
+        if settings.NLP_SEMANTIC_CACHE_ENABLED:
+            self.nlp_cache.store(nlp_input, parsed_data)
+        yield "done", parsed_data
+    
+    def _normalize_template_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Enforce the template format on a cost/revenue item: string numbers and annual frequency"""
+        # Convert to strings if needed
+        if isinstance(item.get("value"), (int, float)):
+            item["value"] = str(int(item["value"]))
+        if isinstance(item.get("starts_at"), (int, float)):
+            item["starts_at"] = str(int(item["starts_at"]))
+        if item.get("end_at") is None:
+            item["end_at"] = ""
+        elif isinstance(item.get("end_at"), (int, float)):
+            item["end_at"] = str(int(item["end_at"]))
+        # Force annual for all items (all values are annual)
+        if item.get("freq") not in ["annual", "yearly"]:
+            item["freq"] = "annual"
+        return item
+    
+    def _normalize_template(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate and enforce correct format on a parsed template"""
+        for cost in parsed_data.get("costs", []):
+            self._normalize_template_item(cost)
+        for revenue in parsed_data.get("revenues", []):
+            self._normalize_template_item(revenue)
+        
+        # Ensure scenario description exists
+        scenario = parsed_data.setdefault("scenario", {})
+        if not scenario.get("description"):
+            scenario["description"] = scenario.get("name", "Generated scenario")
+        
+        return parsed_data
+    
+    def _build_template_prompt(self, nlp_input: str) -> Tuple[str, str]:
+        """Build the (system_prompt, prompt) pair for NLP to template parsing"""
         system_prompt = """
 You are a financial planning assistant that converts natural language descriptions into structured scenario data in template format for a headcount and revenue planning tool.
 
@@ -332,67 +884,20 @@ Requirements:
 Return ONLY the JSON object, no other text.
 """
 
-        response = await self.generate_text(prompt, system_prompt)
-        
-        # Try to extract JSON from response (handle markdown code blocks)
-        response = response.strip()
-        if response.startswith("on"):
-            response = response[7:]
-        if response.startswith("```"):
-            response = response[3:]
-        if response.endswith("```"):
-            response = response[:-3]
-        response = response.strip()
-        
-        try:
-            parsed_data = json.loads(response)
-            
-            # Validate and enforce correct format
-            # Ensure all values are strings and frequencies are correct
-            for cost in parsed_data.get("costs", []):
-                # Convert to strings if needed
-                if isinstance(cost.get("value"), (int, float)):
-                    cost["value"] = str(int(cost["value"]))
-                if isinstance(cost.get("starts_at"), (int, float)):
-                    cost["starts_at"] = str(int(cost["starts_at"]))
-                if cost.get("end_at") is None:
-                    cost["end_at"] = ""
-                elif isinstance(cost.get("end_at"), (int, float)):
-                    cost["end_at"] = str(int(cost["end_at"]))
-                # Force annual for all cost items
-                if cost.get("freq") not in ["annual", "yearly"]:
-                    cost["freq"] = "annual"
-            
-            for revenue in parsed_data.get("revenues", []):
-                # Convert to strings if needed
-                if isinstance(revenue.get("value"), (int, float)):
-                    revenue["value"] = str(int(revenue["value"]))
-                if isinstance(revenue.get("starts_at"), (int, float)):
-                    revenue["starts_at"] = str(int(revenue["starts_at"]))
-                if revenue.get("end_at") is None:
-                    revenue["end_at"] = ""
-                elif isinstance(revenue.get("end_at"), (int, float)):
-                    revenue["end_at"] = str(int(revenue["end_at"]))
-                # Force annual for all revenue items (all values are annual)
-                if revenue.get("freq") not in ["annual", "yearly"]:
-                    revenue["freq"] = "annual"
-            
-            # Ensure scenario description exists
-            if not parsed_data.get("scenario", {}).get("description"):
-                parsed_data["scenario"]["description"] = parsed_data.get("scenario", {}).get("name", "Generated scenario")
-            
-            return parsed_data
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse LLM response as JSON: {str(e)}\nResponse: {response}")
+        return system_prompt, prompt
 
 
-    async def compare_scenarios(
+    def _build_comparison_prompt(
         self,
         scenario1_data: Dict[str, Any],
         scenario2_data: Dict[str, Any]
-    ) -> str:
+    ) -> Tuple[str, str]:
         """
-        Compare two scenarios and generate a comprehensive comparison report.
+        Build the (system_prompt, prompt) pair for a two-scenario comparison.
+        
+        The report instructions live in the static system prompt so the
+        prefix is identical across calls (provider-side prompt caching);
+        the scenario data is compressed to LLM_PROMPT_TOKEN_BUDGET.
         
         Args:
             scenario1_data: Dictionary containing first scenario data with:
@@ -401,131 +906,134 @@ Return ONLY the JSON object, no other text.
                 - revenues: List of revenue items
                 - metrics: {total_costs, total_revenue, net_burn, growth_rate, runway} (optional)
             scenario2_data: Dictionary containing second scenario data (same structure)
+        """
+        scenario_blocks, data_tokens = self.prompt_builder.build_scenario_blocks([
+            ("SCENARIO 1", scenario1_data),
+            ("SCENARIO 2", scenario2_data),
+        ])
+        logger.info(f"Comparison prompt: {data_tokens} scenario data tokens (budget {self.prompt_builder.token_budget})")
+
+        prompt = f"""Compare the following two financial scenarios.
+
+{scenario_blocks}"""
+
+        return COMPARISON_SYSTEM_PROMPT, prompt
+
+    async def compare_scenarios(
+        self,
+        scenario1_data: Dict[str, Any],
+        scenario2_data: Dict[str, Any]
+    ) -> str:
+        """
+        Compare two scenarios and generate a comprehensive comparison report.
+        
+        Args:
+            scenario1_data: First scenario data (see _build_comparison_prompt)
+            scenario2_data: Second scenario data (same structure)
         
         Returns:
             Comparison report as a string
         """
-        system_prompt = """You are a financial planning assistant specializing in startup financial analysis and scenario comparison. 
-You provide clear, actionable insights comparing different financial scenarios, focusing on:
-- Burn rate and runway analysis
-- Cost structure differences
-- Revenue projections and growth potential
-- Risk assessment
-- Strategic recommendations
-
-Provide comprehensive, well-structured comparison reports that help founders make informed decisions."""
+        system_prompt, prompt = self._build_comparison_prompt(scenario1_data, scenario2_data)
+        return await self.generate_text(prompt, system_prompt, LLMTask.COMPARISON)
 
-        # Format scenario data for comparison
-        def format_scenario_data(scenario_data: Dict[str, Any], scenario_label: str) -> str:
-            scenario = scenario_data.get("scenario", {})
-            costs = scenario_data.get("costs", [])
-            revenues = scenario_data.get("revenues", [])
-            metrics = scenario_data.get("metrics", {})
-            
-            formatted = f"""
-{scenario_label}:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Name: {scenario.get('name', 'N/A')}
-Description: {scenario.get('description', 'N/A')}
-Funding: ${scenario.get('funding', 0):,.2f} if scenario.get('funding') else 'Not specified'
-
-Financial Metrics:
-  • Total Costs (First Year): ${metrics.get('total_costs', 0):,.2f}
-  • Total Revenue (First Year): ${metrics.get('total_revenue', 0):,.2f}
-  • Net Burn Rate: ${metrics.get('net_burn', 0):,.2f}
-  • Growth Rate: {metrics.get('growth_rate', 0):.2f}%
-  • Runway: {metrics.get('runway', 'N/A')} months if isinstance(metrics.get('runway'), (int, float)) else metrics.get('runway', 'N/A')
-
-Cost Structure ({len(costs)} items):
-"""
-            if costs:
-                # Group costs by category
-                costs_by_category = {}
-                for cost in costs:
-                    category = cost.get('category', 'Other')
-                    if category not in costs_by_category:
-                        costs_by_category[category] = []
-                    costs_by_category[category].append(cost)
-                
-                for category, category_costs in costs_by_category.items():
-                    total_category_cost = sum(float(c.get('value', 0)) for c in category_costs)
-                    formatted += f"  {category}: ${total_category_cost:,.2f} ({len(category_costs)} items)\n"
-                    for cost in category_costs[:3]:  # Show first 3 items per category
-                        formatted += f"    - {cost.get('title', 'N/A')}: ${float(cost.get('value', 0)):,.2f} (starts month {cost.get('starts_at', 'N/A')})\n"
-                    if len(category_costs) > 3:
-                        formatted += f"    ... and {len(category_costs) - 3} more items\n"
-            else:
-                formatted += "  No costs defined\n"
-            
-            formatted += f"""
-Revenue Structure ({len(revenues)} items):
-"""
-            if revenues:
-                total_revenue = sum(float(r.get('value', 0)) for r in revenues)
-                formatted += f"  Total Revenue: ${total_revenue:,.2f}\n"
-                for revenue in revenues:
-                    formatted += f"  - {revenue.get('title', 'N/A')}: ${float(revenue.get('value', 0)):,.2f} (starts month {revenue.get('starts_at', 'N/A')}, category: {revenue.get('category', 'N/A')})\n"
-            else:
-                formatted += "  No revenues defined\n"
-            
-            return formatted
+    def stream_compare_scenarios(
+        self,
+        scenario1_data: Dict[str, Any],
+        scenario2_data: Dict[str, Any]
+    ) -> LLMStream:
+        """Streaming variant of compare_scenarios"""
+        system_prompt, prompt = self._build_comparison_prompt(scenario1_data, scenario2_data)
+        return self.stream_text(prompt, system_prompt, LLMTask.COMPARISON)
 
-        scenario1_formatted = format_scenario_data(scenario1_data, "SCENARIO 1")
-        scenario2_formatted = format_scenario_data(scenario2_data, "SCENARIO 2")
 
-        prompt = f"""Compare the following two financial scenarios and provide a comprehensive analysis.
+    def _build_multi_comparison_prompt(self, scenario_rows: List[Dict[str, Any]]) -> Tuple[str, str]:
+        """
+        Build the (system_prompt, prompt) pair for an N-way comparison.
+        
+        Args:
+            scenario_rows: One row per scenario with name, funding and the
+                precomputed metrics from compute_scenario_metrics
+        """
+        def money(value: float) -> str:
+            return f"${value:,.0f}"
 
-{scenario1_formatted}
+        def runway(value) -> str:
+            if value is None:
+                return "n/a"
+            if value == float('inf'):
+                return "not burning"
+            return f"{value:.1f} mo"
 
-{scenario2_formatted}
+        categories = sorted({category for row in scenario_rows for category in row["costs_by_category"]})
+        table_rows = [
+            ("Funding", [money(row["funding"]) for row in scenario_rows]),
+            ("First-year costs", [money(row["total_costs"]) for row in scenario_rows]),
+            ("First-year revenue", [money(row["total_revenue"]) for row in scenario_rows]),
+            ("Net burn", [money(row["net_burn"]) for row in scenario_rows]),
+            ("Growth rate", [f"{row['growth_rate']:.1f}%" for row in scenario_rows]),
+            ("Runway", [runway(row["runway"]) for row in scenario_rows]),
+            ("Cost items", [str(row["cost_items"]) for row in scenario_rows]),
+            ("Revenue items", [str(row["revenue_items"]) for row in scenario_rows]),
+        ] + [
+            (f"Costs: {category}", [money(row["costs_by_category"].get(category, 0)) for row in scenario_rows])
+            for category in categories
+        ]
 
-Please provide a detailed comparison report covering:
+        header = "| Metric | " + " | ".join(row["name"] for row in scenario_rows) + " |"
+        separator = "|---" * (len(scenario_rows) + 1) + "|"
+        lines = [header, separator] + [
+            f"| {label} | " + " | ".join(values) + " |" for label, values in table_rows
+        ]
+        table = "\n".join(lines)
 
-1. **Executive Summary**
-   - Key differences at a glance
-   - Which scenario appears more sustainable
+        prompt = f"""Compare the following {len(scenario_rows)} financial scenarios. All values are first-year figures.
 
-2. **Financial Metrics Comparison**
-   - Burn rate differences
-   - Runway comparison
-   - Growth potential analysis
-   - Funding adequacy
+{table}"""
+        logger.info(f"Multi-comparison prompt: {self.prompt_builder.count_tokens(prompt)} tokens")
 
-3. **Cost Structure Analysis**
-   - Team composition differences
-   - Cost efficiency comparison
-   - Hiring timeline impact
+        return MULTI_COMPARISON_SYSTEM_PROMPT, prompt
 
-4. **Revenue Projections**
-   - Revenue generation differences
-   - Growth trajectory comparison
-   - Time to profitability
+    async def compare_many_scenarios(self, scenario_rows: List[Dict[str, Any]]) -> str:
+        """
+        Compare K scenarios with a single LLM call.
+        
+        Args:
+            scenario_rows: Precomputed per-scenario rows (see _build_multi_comparison_prompt)
+        
+        Returns:
+            Comparison report as a string
+        """
+        system_prompt, prompt = self._build_multi_comparison_prompt(scenario_rows)
+        return await self.generate_text(prompt, system_prompt, LLMTask.COMPARISON)
 
-5. **Risk Assessment**
-   - Risk factors for each scenario
-   - Sustainability concerns
-   - Cash flow risks
 
-6. **Strategic Recommendations**
-   - Which scenario to choose and why
-   - Hybrid approaches or modifications
-   - Key milestones to monitor
+# Singleton instance
+_llm_service: Optional[LLMService] = None
 
-Format your response in a clear, structured manner with sections and bullet points where appropriate."""
 
-        response = await self.generate_text(prompt, system_prompt)
-        return response
+def create_llm_provider() -> LLMProvider:
+    """Build the provider selected by LLM_PROVIDER"""
+    if settings.LLM_PROVIDER == "fake":
+        from app.services.default.fake_llm_provider import FakeLLMProvider
+        logger.warning("⚠️ Using the fake LLM provider - responses are simulated")
+        return FakeLLMProvider.from_settings()
+    if settings.LLM_PROVIDER == "openai":
+        from app.services.default.openai_provider import OpenAIProvider
+        return OpenAIProvider(record_path=settings.LLM_RECORD_RESPONSES_PATH)
+    raise ValueError(f"Unknown LLM_PROVIDER '{settings.LLM_PROVIDER}'")
 
 
-# Singleton instance
-_llm_service: Optional[LLMService] = None
+def peek_llm_service() -> Optional[LLMService]:
+    """The LLM service if it has been created, without creating it"""
+    return _llm_service
 
 
 def get_llm_service() -> LLMService:
     """Get or create the LLM service instance"""
     global _llm_service
     if _llm_service is None:
-        _llm_service = LLMService()
+        _llm_service = LLMService(create_llm_provider())
     return _llm_service
 
 
@@ -0,0 +1,169 @@
+"""
+Per-call LLM instrumentation.
+
+Every LLMService call produces an LLMCallRecord. Records are aggregated in
+memory into histograms per task (latency, time to first token, tokens) for
+the metrics endpoint, and into per-user daily counters that are flushed to
+the llm_usage table periodically.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+from app.config import settings
+from app.repositories.llm_usage_repo import LLMUsageRepository
+from app.utils.metrics import Histogram, LATENCY_BUCKETS_MS, TOKEN_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+
+class CacheStatus:
+    """How a call was served"""
+    MISS = "miss"  # Provider call
+    COALESCED = "coalesced"  # Shared an identical in-flight provider call
+    FAST_PATH = "fast_path"  # Local rule-based NLP parser
+    SEMANTIC_CACHE = "semantic_cache"  # Near-duplicate NLP parse
+
+    HITS = (COALESCED, FAST_PATH, SEMANTIC_CACHE)
+
+
+@dataclass
+class LLMCallRecord:
+    task: str
+    model: str
+    cache_status: str
+    latency_ms: float
+    ttft_ms: Optional[float] = None  # Streaming calls only
+    prompt_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    completion_tokens: int = 0
+    streamed: bool = False
+    error: Optional[str] = None  # Exception class name
+    user_id: Optional[UUID] = None
+
+
+def estimate_cost_usd(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated provider cost from LLM_MODEL_PRICES (USD per 1M tokens)"""
+    prices = settings.LLM_MODEL_PRICES.get(model)
+    if not prices:
+        return 0.0
+    return (prompt_tokens * prices["input"] + completion_tokens * prices["output"]) / 1_000_000
+
+
+class _TaskStats:
+    def __init__(self):
+        self.calls = 0
+        self.streamed = 0
+        self.cost_usd = 0.0
+        self.errors: Dict[str, int] = {}
+        self.cache: Dict[str, int] = {}
+        self.models: Dict[str, int] = {}
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.ttft_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.prompt_tokens = Histogram(TOKEN_BUCKETS)
+        self.completion_tokens = Histogram(TOKEN_BUCKETS)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "streamed": self.streamed,
+            "errors": self.errors,
+            "cache": self.cache,
+            "models": self.models,
+            "estimated_cost_usd": round(self.cost_usd, 6),
+            "latency_ms": self.latency_ms.snapshot(),
+            "ttft_ms": self.ttft_ms.snapshot(),
+            "prompt_tokens": self.prompt_tokens.snapshot(),
+            "completion_tokens": self.completion_tokens.snapshot(),
+        }
+
+
+class LLMTelemetry:
+    """Aggregates LLMCallRecords and persists per-user usage"""
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._tasks: Dict[str, _TaskStats] = {}
+        self._pending_usage: Dict[Tuple[UUID, date, str, str], Dict[str, Any]] = {}
+        self._flusher: Optional[asyncio.Task] = None
+
+    def record(self, call: LLMCallRecord) -> None:
+        stats = self._tasks.setdefault(call.task, _TaskStats())
+        stats.calls += 1
+        stats.cache[call.cache_status] = stats.cache.get(call.cache_status, 0) + 1
+        stats.models[call.model] = stats.models.get(call.model, 0) + 1
+        stats.latency_ms.observe(call.latency_ms)
+        if call.streamed:
+            stats.streamed += 1
+        if call.ttft_ms is not None:
+            stats.ttft_ms.observe(call.ttft_ms)
+        if call.error:
+            stats.errors[call.error] = stats.errors.get(call.error, 0) + 1
+
+        cost = 0.0
+        if call.cache_status == CacheStatus.MISS:
+            stats.prompt_tokens.observe(call.prompt_tokens)
+            stats.completion_tokens.observe(call.completion_tokens)
+            cost = estimate_cost_usd(call.model, call.prompt_tokens, call.completion_tokens)
+            stats.cost_usd += cost
+
+        ttft = "-" if call.ttft_ms is None else f"{call.ttft_ms:.0f}"
+        logger.info(
+            f"LLM call task={call.task} model={call.model} cache={call.cache_status} "
+            f"latency_ms={call.latency_ms:.0f} ttft_ms={ttft} "
+            f"prompt_tokens={call.prompt_tokens} (cached={call.cached_prompt_tokens}) "
+            f"completion_tokens={call.completion_tokens} error={call.error}"
+        )
+
+        if call.user_id is None:
+            return
+        key = (call.user_id, datetime.now(timezone.utc).date(), call.task, call.model)
+        usage = self._pending_usage.setdefault(key, {
+            "calls": 0, "errors": 0, "cache_hits": 0, "prompt_tokens": 0,
+            "completion_tokens": 0, "cost_usd": 0.0, "total_latency_ms": 0.0,
+        })
+        usage["calls"] += 1
+        usage["errors"] += 1 if call.error else 0
+        usage["cache_hits"] += 1 if call.cache_status in CacheStatus.HITS else 0
+        usage["prompt_tokens"] += call.prompt_tokens
+        usage["completion_tokens"] += call.completion_tokens
+        usage["cost_usd"] += cost
+        usage["total_latency_ms"] += call.latency_ms
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-task histograms and counters for the metrics endpoint"""
+        return {task: stats.snapshot() for task, stats in sorted(self._tasks.items())}
+
+    def task_stats(self) -> Dict[str, _TaskStats]:
+        """Live per-task aggregates (histograms are shared, do not modify)"""
+        return dict(self._tasks)
+
+    async def flush(self) -> None:
+        """Write pending per-user usage to the database"""
+        pending, self._pending_usage = self._pending_usage, {}
+        for (user_id, day, task, model), counters in pending.items():
+            try:
+                await LLMUsageRepository.add_usage(user_id, day, task, model, counters)
+            except Exception as e:
+                logger.error(f"❌ Failed to store LLM usage for user {user_id}: {str(e)}")
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self) -> None:
+        self._flusher = asyncio.create_task(self._flush_periodically(), name="llm-usage-flusher")
+
+    async def stop(self) -> None:
+        if self._flusher:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+
+
+# Singleton instance
+llm_telemetry = LLMTelemetry(flush_interval=settings.LLM_USAGE_FLUSH_SECONDS)
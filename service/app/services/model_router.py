@@ -0,0 +1,107 @@
+import time
+import logging
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class LLMTask(str, Enum):
+    """Kinds of LLM work, each routed to its own model profiles"""
+    CHAT = "chat"
+    ANALYSIS = "analysis"
+    EXTRACTION = "extraction"
+    COMPARISON = "comparison"
+    SUMMARIZATION = "summarization"
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    """Model settings for one routing profile"""
+    name: str
+    model: str
+    temperature: float
+    max_tokens: int
+    timeout: float  # Hard deadline for a call on this profile (seconds)
+    latency_slo: float  # When a fallback exists, calls with no first token by then are cut off (seconds)
+
+
+class ModelRouter:
+    """
+    Picks model profiles per task and tracks their latency.
+
+    Each task maps to an ordered list of profiles. Callers try them in order,
+    moving on when a profile misses its latency SLO. A profile that missed
+    its SLO is demoted to the end of the list for `cooldown` seconds so
+    subsequent calls don't pay the SLO wait again.
+    """
+
+    def __init__(
+        self,
+        profiles: Dict[str, Dict[str, Any]],
+        routes: Dict[str, List[str]],
+        model_factory: Callable[[ModelProfile], Any],
+        cooldown: float = 60.0,
+    ):
+        self.profiles = {name: ModelProfile(name=name, **config) for name, config in profiles.items()}
+        for task, profile_names in routes.items():
+            if not profile_names:
+                raise ValueError(f"No model profiles configured for LLM task '{task}'")
+            for profile_name in profile_names:
+                if profile_name not in self.profiles:
+                    raise ValueError(f"Unknown model profile '{profile_name}' for LLM task '{task}'")
+        self.routes = routes
+        self.cooldown = cooldown
+        self._model_factory = model_factory
+        self._models: Dict[str, Any] = {}
+        self._degraded_until: Dict[str, float] = {}
+        self._stats: Dict[str, Dict[str, float]] = {
+            name: {"calls": 0, "slo_misses": 0, "total_latency": 0.0} for name in self.profiles
+        }
+
+    def get_model(self, profile: ModelProfile) -> Any:
+        """Chat model for a profile, created once and reused"""
+        model = self._models.get(profile.name)
+        if model is None:
+            model = self._model_factory(profile)
+            self._models[profile.name] = model
+        return model
+
+    def _is_degraded(self, profile: ModelProfile) -> bool:
+        return self._degraded_until.get(profile.name, 0.0) > time.monotonic()
+
+    def route(self, task: LLMTask) -> List[ModelProfile]:
+        """Profiles to try for a task, in order (degraded profiles last)"""
+        profiles = [self.profiles[name] for name in self.routes.get(task.value, self.routes[LLMTask.CHAT.value])]
+        healthy = [profile for profile in profiles if not self._is_degraded(profile)]
+        degraded = [profile for profile in profiles if self._is_degraded(profile)]
+        return healthy + degraded
+
+    def record_call(self, profile: ModelProfile, latency: float) -> None:
+        stats = self._stats[profile.name]
+        stats["calls"] += 1
+        stats["total_latency"] += latency
+
+    def record_slo_miss(self, profile: ModelProfile) -> None:
+        self._stats[profile.name]["slo_misses"] += 1
+        self._degraded_until[profile.name] = time.monotonic() + self.cooldown
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-profile counters for the metrics endpoint"""
+        return {
+            "routes": self.routes,
+            "profiles": {
+                name: {
+                    "model": profile.model,
+                    "calls": self._stats[name]["calls"],
+                    "slo_misses": self._stats[name]["slo_misses"],
+                    "avg_latency_seconds": (
+                        round(self._stats[name]["total_latency"] / self._stats[name]["calls"], 3)
+                        if self._stats[name]["calls"] else None
+                    ),
+                    "degraded": self._is_degraded(profile),
+                }
+                for name, profile in self.profiles.items()
+            },
+        }
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List
+from app.services.llm_service import LLMService
+
+logger = logging.getLogger(__name__)
+
+
+def _ok(index: int, source: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    return {"index": index, "status": "ok", "source": source, "result": data}
+
+
+def _error(index: int, error: Exception) -> Dict[str, Any]:
+    return {"index": index, "status": "error", "error": str(error) or type(error).__name__}
+
+
+async def parse_nlp_batch(
+    llm_service: LLMService,
+    nlp_inputs: List[str],
+    concurrency: int
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Parse many NLP inputs to template format, yielding results as they complete.
+
+    Inputs the fast path or near-duplicate cache can answer are yielded
+    first; the rest go to the LLM with at most `concurrency` calls in flight.
+    Each queued input re-checks the cache before calling the LLM, so
+    near-duplicates later in the batch reuse earlier results.
+
+    Yields:
+        One dict per input ({index, status: ok, source, result} or
+        {index, status: error, error}), then a final {summary: {...}}
+    """
+    summary = {"total": len(nlp_inputs), "ok": 0, "error": 0, "sources": {"fast_path": 0, "cache": 0, "llm": 0}}
+
+    def tally(item: Dict[str, Any]) -> Dict[str, Any]:
+        summary[item["status"]] += 1
+        if item["status"] == "ok":
+            summary["sources"][item["source"]] += 1
+        return item
+
+    pending = []
+    for index, nlp_input in enumerate(nlp_inputs):
+        local = llm_service.parse_nlp_to_template_local(nlp_input)
+        if local is not None:
+            yield tally(_ok(index, *local))
+        else:
+            pending.append((index, nlp_input))
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def parse(index: int, nlp_input: str) -> Dict[str, Any]:
+        async with semaphore:
+            local = llm_service.parse_nlp_to_template_local(nlp_input)
+            if local is not None:
+                return _ok(index, *local)
+            try:
+                return _ok(index, "llm", await llm_service.parse_nlp_to_template_llm(nlp_input))
+            except Exception as e:
+                logger.warning(f"Batch NLP parse failed for input {index}: {str(e)}")
+                return _error(index, e)
+
+    tasks = [asyncio.create_task(parse(index, nlp_input)) for index, nlp_input in pending]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield tally(await next_done)
+    finally:
+        # Client went away mid-stream: don't keep spending provider calls
+        for task in tasks:
+            task.cancel()
+
+    yield {"summary": summary}
@@ -0,0 +1,255 @@
+"""
+Deterministic fast path for common quick-create descriptions.
+
+Handles inputs such as "3 engineers from month 2", "10K MRR from month 3"
+and "1M funding" locally with the same rules the LLM prompt in
+`LLMService.parse_nlp_to_template` encodes, so the LLM is only called when
+the input can't be fully parsed.
+"""
+import re
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple
+
+# Default annual salaries per role (mirrors the parse_nlp_to_template prompt)
+ROLE_DEFINITIONS: Dict[str, Dict[str, Any]] = {
+    "engineer": {"title": "Software Engineer", "category": "Engineering", "salary": 150000},
+    "designer": {"title": "Designer", "category": "Design", "salary": 100000},
+    "pm": {"title": "Product Manager", "category": "Product", "salary": 120000},
+    "ops": {"title": "Operations", "category": "Operations", "salary": 90000},
+}
+
+ROLE_ALIASES: Dict[str, str] = {
+    "engineer": "engineer",
+    "engineers": "engineer",
+    "developer": "engineer",
+    "developers": "engineer",
+    "dev": "engineer",
+    "devs": "engineer",
+    "designer": "designer",
+    "designers": "designer",
+    "pm": "pm",
+    "pms": "pm",
+    "product manager": "pm",
+    "product managers": "pm",
+    "ops": "ops",
+    "operations": "ops",
+}
+
+NUMBER_WORDS: Dict[str, int] = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+}
+
+# Words that carry no information on their own and may be left unmatched
+FILLER_WORDS = {
+    "and", "with", "plus", "we", "will", "want", "to", "hire", "hiring", "add", "adding",
+    "have", "has", "get", "getting", "of", "in", "the", "a", "an", "at", "on", "for",
+    "then", "also", "start", "starting", "from", "raise", "raised", "raising", "our",
+    "team", "new", "i", "us", "by", "about", "around", "approximately",
+}
+
+_AMOUNT = r"\$?\s*(?P<{name}>\d[\d,]*(?:\.\d+)?)\s*(?P<{name}_unit>k|m|mm|million|thousand)?\b"
+_MONTH = (
+    r"(?:\s*,?\s*(?:starting|from|beginning|in)?\s*(?:in\s+|from\s+)?(?:the\s+)?"
+    r"(?:month\s+(?P<{name}>\d{{1,2}})|(?P<{name}_ord>\d{{1,2}})(?:st|nd|rd|th)\s+month))?"
+)
+
+_ROLE_NAMES = "|".join(sorted((re.escape(a) for a in ROLE_ALIASES), key=len, reverse=True))
+_COUNT_WORDS = "|".join(NUMBER_WORDS)
+
+HEADCOUNT_PATTERN = re.compile(
+    r"\b(?P<count>\d{1,3}|" + _COUNT_WORDS + r")\s+(?:(?:senior|junior|full[- ]time)\s+)?"
+    r"(?P<role>" + _ROLE_NAMES + r")\b" + _MONTH.format(name="month"),
+    re.IGNORECASE,
+)
+RECURRING_REVENUE_PATTERN = re.compile(
+    _AMOUNT.format(name="amount") + r"\s*(?P<kind>mrr|arr)\b" + _MONTH.format(name="month"),
+    re.IGNORECASE,
+)
+FUNDING_PATTERN = re.compile(
+    r"(?:" + _AMOUNT.format(name="amount") + r"\s*(?:in\s+)?(?:funding|seed|raise|runway cash)\b"
+    r"|(?:funding|raised?|raising)\s*(?:of\s+)?" + _AMOUNT.format(name="amount2") + r")",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class FastPathResult:
+    """Result of the local parser"""
+    data: Dict[str, Any]
+    confidence: float
+
+
+def parse_amount(number: str, unit: Optional[str]) -> float:
+    """Convert "1.5" + "m" style amounts to dollars"""
+    value = float(number.replace(",", ""))
+    unit = (unit or "").lower()
+    if unit in ("k", "thousand"):
+        value *= 1_000
+    elif unit in ("m", "mm", "million"):
+        value *= 1_000_000
+    return value
+
+
+def _parse_count(raw: str) -> int:
+    raw = raw.lower()
+    return NUMBER_WORDS[raw] if raw in NUMBER_WORDS else int(raw)
+
+
+def _parse_month(match: re.Match) -> Optional[int]:
+    raw = match.group("month") or match.group("month_ord")
+    if raw is None:
+        return None
+    month = int(raw)
+    return month if 1 <= month <= 12 else None
+
+
+def _has_invalid_month(match: re.Match) -> bool:
+    """A month was given but is out of range (e.g. "month 13")"""
+    return (match.group("month") or match.group("month_ord")) is not None and _parse_month(match) is None
+
+
+def _format_amount(value: float) -> str:
+    """Format amounts the way people type them (1M, 10K, 2500)"""
+    if value >= 1_000_000 and value % 100_000 == 0:
+        return f"{value / 1_000_000:g}M"
+    if value >= 1_000 and value % 100 == 0:
+        return f"{value / 1_000:g}K"
+    return f"{value:g}"
+
+
+def _confidence(text: str, spans: List[Tuple[int, int]]) -> float:
+    """
+    Share of meaningful words covered by matched spans.
+
+    Any unmatched number is something we didn't understand, so it caps the
+    score well below any sensible threshold.
+    """
+    covered = [False] * len(text)
+    for start, end in spans:
+        for i in range(start, end):
+            covered[i] = True
+
+    total = 0
+    matched = 0
+    unmatched_number = False
+    for token in re.finditer(r"[\w$.,]+", text):
+        raw = token.group()
+        word = raw.strip("$.,").lower()
+        if not word or word in FILLER_WORDS:
+            continue
+        total += 1
+        start = token.start() + len(raw) - len(raw.lstrip("$.,"))
+        end = token.end() - (len(raw) - len(raw.rstrip(".,")))
+        if all(covered[start:end]):
+            matched += 1
+        elif any(ch.isdigit() for ch in word):
+            unmatched_number = True
+
+    score = matched / total if total else 0.0
+    return min(score, 0.5) if unmatched_number else score
+
+
+def _title_case(phrase: str) -> str:
+    """Capitalize words but keep amounts and acronyms (10K, MRR) as typed"""
+    return " ".join(
+        word if word.isupper() or word[0].isdigit() else word.capitalize()
+        for word in phrase.split()
+    )
+
+
+def parse_fast_path(nlp_input: str) -> Optional[FastPathResult]:
+    """
+    Parse a scenario description without the LLM.
+
+    Returns:
+        FastPathResult in the parse_nlp_to_template format, or None when no
+        known pattern was found at all
+    """
+    text = nlp_input.strip()
+    spans: List[Tuple[int, int]] = []
+    costs: List[Dict[str, str]] = []
+    revenues: List[Dict[str, str]] = []
+    funding = 0.0
+    headcount: Dict[str, int] = {}
+    summary: List[str] = []
+
+    for match in HEADCOUNT_PATTERN.finditer(text):
+        if _has_invalid_month(match):
+            continue  # Left uncovered, so confidence drops and the LLM takes over
+        spans.append(match.span())
+        role_key = ROLE_ALIASES[match.group("role").lower()]
+        role = ROLE_DEFINITIONS[role_key]
+        count = _parse_count(match.group("count"))
+        start_month = _parse_month(match) or 1
+
+        # Salaries starting mid-year use (annual_salary / 12) * (12 - start_month)
+        if start_month > 1:
+            value = role["salary"] / 12 * (12 - start_month)
+        else:
+            value = role["salary"]
+
+        for _ in range(count):
+            headcount[role_key] = headcount.get(role_key, 0) + 1
+            costs.append({
+                "title": f"{role['title']} #{headcount[role_key]}",
+                "value": str(int(value)),
+                "category": role["category"],
+                "starts_at": str(start_month),
+                "end_at": "",
+                "freq": "annual",
+            })
+        summary.append(f"{count} {match.group('role')}")
+
+    for match in RECURRING_REVENUE_PATTERN.finditer(text):
+        if _has_invalid_month(match):
+            continue  # Left uncovered, so confidence drops and the LLM takes over
+        spans.append(match.span())
+        amount = parse_amount(match.group("amount"), match.group("amount_unit"))
+        kind = match.group("kind").upper()
+        start_month = _parse_month(match) or 1
+
+        if kind == "MRR":
+            # First-year revenue: MRR * (12 - start_month)
+            value = amount * (12 - start_month)
+            title = "Monthly Recurring Revenue"
+        else:
+            value = amount
+            title = "Annual Recurring Revenue"
+
+        revenues.append({
+            "title": title,
+            "value": str(int(value)),
+            "category": "Revenue",
+            "starts_at": str(start_month),
+            "end_at": "",
+            "freq": "annual",
+        })
+        summary.append(f"{_format_amount(amount)} {kind}")
+
+    for match in FUNDING_PATTERN.finditer(text):
+        spans.append(match.span())
+        if match.group("amount") is not None:
+            funding += parse_amount(match.group("amount"), match.group("amount_unit"))
+        else:
+            funding += parse_amount(match.group("amount2"), match.group("amount2_unit"))
+
+    if not spans:
+        return None
+
+    if funding:
+        summary.append(f"{_format_amount(funding)} funding")
+
+    name = ", ".join(_title_case(part) for part in summary)
+    description = f"Plan with {', '.join(summary)}."
+
+    data = {
+        "scenario": {
+            "name": name[:255],
+            "description": description,
+            "funding": funding,
+        },
+        "costs": costs,
+        "revenues": revenues,
+    }
+    return FastPathResult(data=data, confidence=round(_confidence(text, spans), 3))
@@ -0,0 +1,323 @@
+"""
+Near-duplicate cache for `LLMService.parse_nlp_to_template`.
+
+Inputs are embedded locally with a hashing vectorizer (word and character
+trigram features, numbers masked out) and matched by cosine similarity, so
+"hire 3 engineers, 1M funding" finds "1M funding and 3 engineers". The
+numbers of both inputs are then lined up by what they refer to (a role,
+funding, MRR/ARR, a month): the cached result is reused when they agree,
+adjusted when only funding, headcount or recurring revenue amounts differ,
+and rejected otherwise. A hit also requires both inputs to have the same
+content words: similar vectors are not enough to tell "AWS hosting" from
+"GCP hosting", "per year" from "per month" or "do not hire" from "hire".
+"""
+import copy
+import math
+import re
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from app.services.nlp_fast_path import (
+    FILLER_WORDS,
+    NUMBER_WORDS,
+    ROLE_ALIASES,
+    ROLE_DEFINITIONS,
+    parse_amount,
+)
+
+TOKEN_PATTERN = re.compile(
+    r"\$?(?P<number>\d[\d,]*(?:\.\d+)?)\s*(?P<unit>k|mm|m|million|thousand)?(?:st|nd|rd|th)?\b"
+    r"|(?P<word>[a-z]+)",
+    re.IGNORECASE,
+)
+
+NUMBER_TOKEN = "<num>"
+
+# Words numbers can refer to, normalized to an anchor name
+ANCHOR_WORDS: Dict[str, str] = {
+    **ROLE_ALIASES,
+    "funding": "funding", "funded": "funding", "seed": "funding",
+    "raise": "funding", "raised": "funding", "raising": "funding",
+    "mrr": "mrr", "arr": "arr",
+    "month": "month", "months": "month",
+}
+
+# Words that may sit between a number and its anchor ("3 senior engineers", "1M in funding")
+SKIP_WORDS = {"senior", "junior", "full", "time", "in", "of", "new", "more", "additional"}
+
+# Number words, minus articles which are too ambiguous to treat as counts
+COUNT_WORDS = {word: value for word, value in NUMBER_WORDS.items() if word not in ("a", "an")}
+
+_SEAT_NUMBER = re.compile(r"#\d+\s*$")
+
+
+@dataclass
+class _Token:
+    word: Optional[str] = None
+    value: Optional[float] = None
+
+
+@dataclass
+class _Entry:
+    vector: Dict[int, float]
+    numbers: Dict[str, List[float]]
+    words: FrozenSet[str]
+    result: Dict[str, Any]
+
+
+def _tokenize(text: str) -> List[_Token]:
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text):
+        if match.group("number"):
+            tokens.append(_Token(value=parse_amount(match.group("number"), match.group("unit"))))
+            continue
+        word = match.group("word").lower()
+        if word in COUNT_WORDS:
+            tokens.append(_Token(value=float(COUNT_WORDS[word])))
+        else:
+            tokens.append(_Token(word=word))
+    return tokens
+
+
+def _anchor_at(tokens: List[_Token], index: int) -> Optional[str]:
+    """Anchor for the words starting at index (handles two-word role names)"""
+    words = [t.word for t in tokens[index:index + 2]]
+    if len(words) == 2 and None not in words and " ".join(words) in ANCHOR_WORDS:
+        return ANCHOR_WORDS[" ".join(words)]
+    return ANCHOR_WORDS.get(words[0]) if words and words[0] else None
+
+
+def extract_numbers(tokens: List[_Token]) -> Dict[str, List[float]]:
+    """
+    Map each number to what it refers to: "month" if preceded by "month",
+    else the first anchor word within the next few words, else the anchor
+    word just before it ("raise 1M"). Numbers without an anchor are keyed
+    by the following word so they still have to match exactly.
+    """
+    numbers: Dict[str, List[float]] = {}
+    for i, token in enumerate(tokens):
+        if token.value is None:
+            continue
+        anchor = None
+        if i > 0 and tokens[i - 1].word in ("month", "months"):
+            anchor = "month"
+        j = i + 1
+        while anchor is None and j < len(tokens) and j <= i + 3:
+            if tokens[j].value is not None:
+                break
+            anchor = _anchor_at(tokens, j)
+            if tokens[j].word not in SKIP_WORDS:
+                break
+            j += 1
+        if anchor is None and i > 0 and tokens[i - 1].word:
+            anchor = ANCHOR_WORDS.get(tokens[i - 1].word)
+        if anchor is None:
+            following = tokens[i + 1].word if i + 1 < len(tokens) else None
+            anchor = f"other:{following or ''}"
+        numbers.setdefault(anchor, []).append(token.value)
+    return numbers
+
+
+def content_words(tokens: List[_Token]) -> FrozenSet[str]:
+    """
+    Non-filler words, with anchor synonyms normalized ("engineers" and
+    "engineer" agree). Negations, units and frequencies ("not", "per",
+    "year") are never filler, so inputs that differ in them don't match.
+    """
+    return frozenset(
+        ANCHOR_WORDS.get(token.word, token.word)
+        for token in tokens
+        if token.word is not None and token.word not in FILLER_WORDS
+    )
+
+
+def _add_feature(vector: Dict[int, float], feature: str, weight: float, dimensions: int) -> None:
+    hashed = zlib.crc32(feature.encode())
+    sign = 1.0 if hashed & 0x80000000 else -1.0
+    index = hashed % dimensions
+    vector[index] = vector.get(index, 0.0) + sign * weight
+
+
+def vectorize(tokens: List[_Token], dimensions: int) -> Dict[int, float]:
+    """L2-normalized sparse hashing vector of word and character trigram features"""
+    vector: Dict[int, float] = {}
+    for token in tokens:
+        if token.value is not None:
+            _add_feature(vector, NUMBER_TOKEN, 1.0, dimensions)
+            continue
+        if token.word in FILLER_WORDS:
+            continue
+        word = ANCHOR_WORDS.get(token.word, token.word)
+        _add_feature(vector, f"w:{word}", 1.0, dimensions)
+        padded = f" {token.word} "
+        for k in range(len(padded) - 2):
+            _add_feature(vector, f"c:{padded[k:k + 3]}", 0.3, dimensions)
+
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if norm:
+        for index in vector:
+            vector[index] /= norm
+    return vector
+
+
+def cosine(a: Dict[int, float], b: Dict[int, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(index, 0.0) for index, weight in a.items())
+
+
+def _scale(value: Any, ratio: float) -> str:
+    return str(int(round(float(value or 0) * ratio)))
+
+
+def _adjust_headcount(result: Dict[str, Any], role: str, old_count: float, new_count: float) -> bool:
+    category = ROLE_DEFINITIONS[role]["category"]
+    costs = result.get("costs", [])
+    items = [cost for cost in costs if cost.get("category") == category]
+    if not items or old_count <= 0 or new_count <= 0 or new_count != int(new_count):
+        return False
+
+    if len(items) == old_count:
+        # One item per hire: clone or drop seats
+        new_count = int(new_count)
+        dropped = {id(item) for item in items[new_count:]}
+        costs[:] = [cost for cost in costs if id(cost) not in dropped]
+        for _ in range(new_count - len(items)):
+            clone = copy.deepcopy(items[-1])
+            position = next(i for i, cost in enumerate(costs) if cost is items[-1])
+            costs.insert(position + 1, clone)
+            items.append(clone)
+        for seat, item in enumerate(items[:new_count], start=1):
+            if _SEAT_NUMBER.search(item.get("title", "")):
+                item["title"] = _SEAT_NUMBER.sub(f"#{seat}", item["title"])
+        return True
+
+    if len(items) == 1:
+        # One aggregated item for the whole role
+        items[0]["value"] = _scale(items[0].get("value"), new_count / old_count)
+        return True
+
+    return False
+
+
+def _adjust_recurring_revenue(result: Dict[str, Any], old_amount: float, new_amount: float) -> bool:
+    revenues = result.get("revenues", [])
+    if len(revenues) != 1 or old_amount <= 0:
+        return False
+    revenues[0]["value"] = _scale(revenues[0].get("value"), new_amount / old_amount)
+    return True
+
+
+def adapt_result(
+    result: Dict[str, Any],
+    cached_numbers: Dict[str, List[float]],
+    numbers: Dict[str, List[float]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Return a copy of a cached result adjusted to the new input's numbers,
+    or None if the numbers differ in a way we can't adjust for.
+    """
+    if cached_numbers.keys() != numbers.keys():
+        return None
+
+    adapted = copy.deepcopy(result)
+    for anchor, values in numbers.items():
+        cached_values = cached_numbers[anchor]
+        if values == cached_values:
+            continue
+        if len(values) != 1 or len(cached_values) != 1:
+            return None
+
+        old, new = cached_values[0], values[0]
+        if anchor == "funding":
+            adapted.setdefault("scenario", {})["funding"] = new
+        elif anchor in ROLE_DEFINITIONS:
+            if not _adjust_headcount(adapted, anchor, old, new):
+                return None
+        elif anchor in ("mrr", "arr"):
+            if not _adjust_recurring_revenue(adapted, old, new):
+                return None
+        else:
+            # Months and unanchored numbers change the plan's shape
+            return None
+    return adapted
+
+
+class SemanticParseCache:
+    """
+    Bounded LRU of parsed inputs with cosine nearest-neighbour lookup.
+
+    A linear scan is plenty at the configured size (a few hundred entries
+    of ~50 non-zero features each).
+    """
+
+    def __init__(self, threshold: float, max_entries: int, dimensions: int = 4096):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.dimensions = dimensions
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.lookups = 0
+        self.hits = 0
+        self.adjusted_hits = 0
+        self.rejected = 0  # Similar enough, but words or numbers differ
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def _analyze(self, text: str) -> Tuple[Dict[int, float], Dict[str, List[float]], FrozenSet[str]]:
+        tokens = _tokenize(text)
+        return vectorize(tokens, self.dimensions), extract_numbers(tokens), content_words(tokens)
+
+    def lookup(self, text: str) -> Optional[Dict[str, Any]]:
+        """Cached result for a near-duplicate input, adjusted to its numbers"""
+        self.lookups += 1
+        vector, numbers, words = self._analyze(text)
+
+        candidates = sorted(
+            (
+                (cosine(vector, entry.vector), key, entry)
+                for key, entry in self._entries.items()
+            ),
+            key=lambda candidate: candidate[0],
+            reverse=True,
+        )
+        for similarity, key, entry in candidates:
+            if similarity < self.threshold:
+                break
+            if entry.words != words:
+                self.rejected += 1
+                continue
+            adapted = adapt_result(entry.result, entry.numbers, numbers)
+            if adapted is None:
+                self.rejected += 1
+                continue
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if entry.numbers != numbers:
+                self.adjusted_hits += 1
+            return adapted
+        return None
+
+    def store(self, text: str, result: Dict[str, Any]) -> None:
+        vector, numbers, words = self._analyze(text)
+        key = self._key(text)
+        self._entries[key] = _Entry(vector=vector, numbers=numbers, words=words, result=copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the metrics endpoint"""
+        return {
+            "threshold": self.threshold,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "adjusted_hits": self.adjusted_hits,
+            "rejected": self.rejected,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+        }
@@ -0,0 +1,173 @@
+"""
+Token-budgeted prompt construction for scenario prompts.
+
+Scenario blocks are rendered with per-category rollups and the top-K items
+by value; K is reduced until the blocks fit the token budget, so prompts stay
+bounded no matter how many line items a scenario has.
+"""
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken ships with langchain-openai
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    """
+    Load the tokenizer for a model, or None if unavailable.
+    tiktoken fetches encoding files on first use, which can fail offline.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"Tokenizer unavailable for {model}, estimating token counts: {str(e)}")
+        return None
+
+
+async def load_tokenizer(model: str) -> None:
+    """
+    Load a model's tokenizer in a thread (at startup), so the first prompt
+    doesn't block the event loop while the encoding is downloaded and parsed.
+    """
+    await asyncio.to_thread(_get_encoding, model)
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Count tokens for a model (falls back to ~4 characters per token)"""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
+
+def _money(value: Any) -> str:
+    return f"${float(value or 0):,.2f}"
+
+
+def _runway(value: Any) -> str:
+    if value is None:
+        return "N/A"
+    if value == float('inf'):
+        return "not burning (revenue covers costs)"
+    return f"{value:.1f} months"
+
+
+def format_scenario_block(scenario_data: Dict[str, Any], label: str, top_k: int) -> str:
+    """
+    Render one scenario for the comparison prompt.
+
+    Costs are rolled up per category with only the top_k most expensive items
+    listed; revenues list the top_k largest items. top_k=0 keeps rollups only.
+    """
+    scenario = scenario_data.get("scenario", {})
+    costs = scenario_data.get("costs", [])
+    revenues = scenario_data.get("revenues", [])
+    metrics = scenario_data.get("metrics", {})
+
+    funding = scenario.get("funding")
+    lines = [
+        f"{label}: {scenario.get('name', 'N/A')}",
+        f"Description: {scenario.get('description') or 'N/A'}",
+        f"Funding: {_money(funding) if funding else 'Not specified'}",
+        "Financial Metrics (first year):",
+        f"  • Total Costs: {_money(metrics.get('total_costs'))}",
+        f"  • Total Revenue: {_money(metrics.get('total_revenue'))}",
+        f"  • Net Burn: {_money(metrics.get('net_burn'))}",
+        f"  • Growth Rate: {metrics.get('growth_rate', 0):.2f}%",
+        f"  • Runway: {_runway(metrics.get('runway'))}",
+        f"Cost Structure ({len(costs)} items):",
+    ]
+
+    if costs:
+        costs_by_category: Dict[str, List[Dict[str, Any]]] = {}
+        for cost in costs:
+            costs_by_category.setdefault(cost.get("category") or "Other", []).append(cost)
+
+        # Largest categories first
+        rollups = sorted(
+            (
+                (category, sum(float(c.get("value", 0)) for c in items), items)
+                for category, items in costs_by_category.items()
+            ),
+            key=lambda rollup: rollup[1],
+            reverse=True,
+        )
+        for category, total, items in rollups:
+            lines.append(f"  {category}: {_money(total)} ({len(items)} items)")
+            top_items = sorted(items, key=lambda c: float(c.get("value", 0)), reverse=True)[:top_k]
+            for cost in top_items:
+                lines.append(
+                    f"    - {cost.get('title', 'N/A')}: {_money(cost.get('value'))} "
+                    f"(starts month {cost.get('starts_at', 'N/A')})"
+                )
+            if len(items) > len(top_items):
+                lines.append(f"    ... and {len(items) - len(top_items)} more items")
+    else:
+        lines.append("  No costs defined")
+
+    lines.append(f"Revenue Structure ({len(revenues)} items):")
+    if revenues:
+        total_revenue = sum(float(r.get("value", 0)) for r in revenues)
+        lines.append(f"  Total Revenue: {_money(total_revenue)}")
+        top_revenues = sorted(revenues, key=lambda r: float(r.get("value", 0)), reverse=True)[:top_k]
+        for revenue in top_revenues:
+            lines.append(
+                f"  - {revenue.get('title', 'N/A')}: {_money(revenue.get('value'))} "
+                f"(starts month {revenue.get('starts_at', 'N/A')}, category: {revenue.get('category') or 'N/A'})"
+            )
+        if len(revenues) > len(top_revenues):
+            lines.append(f"  ... and {len(revenues) - len(top_revenues)} more items")
+    else:
+        lines.append("  No revenues defined")
+
+    return "\n".join(lines)
+
+
+class PromptBuilder:
+    """Builds scenario prompt sections that fit a token budget"""
+
+    def __init__(self, model: str, token_budget: int, top_k: int):
+        self.model = model
+        self.token_budget = token_budget
+        self.top_k = top_k
+
+    def count_tokens(self, text: str) -> int:
+        return count_tokens(text, self.model)
+
+    def _top_k_steps(self) -> Iterator[int]:
+        """top_k, top_k/2, ..., 1, then 0 (rollups only)"""
+        k = self.top_k
+        while k > 0:
+            yield k
+            k //= 2
+        yield 0
+
+    def build_scenario_blocks(self, scenarios: List[Tuple[str, Dict[str, Any]]]) -> Tuple[str, int]:
+        """
+        Render labelled scenarios, compressing until they fit the budget.
+
+        Args:
+            scenarios: (label, scenario_data) pairs
+
+        Returns:
+            (rendered text, token count). If even the rollup-only form is over
+            budget it is returned as is.
+        """
+        for top_k in self._top_k_steps():
+            text = "\n\n".join(format_scenario_block(data, label, top_k) for label, data in scenarios)
+            tokens = self.count_tokens(text)
+            if tokens <= self.token_budget:
+                break
+        return text, tokens
@@ -0,0 +1,102 @@
+"""
+Storage for on-demand request profiles.
+
+Each profile is kept in PROFILE_DIR as <id>.json (summary: timings, await
+sites, pstats report) and <id>.prof (raw cProfile data), so any worker can
+serve a profile recorded by another. Only the newest PROFILE_KEEP are kept.
+"""
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from app.config import settings
+from app.utils.profiling import CoroutineProfile
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileStore:
+    def __init__(self, directory: str, keep: int):
+        self.directory = directory
+        self.keep = keep
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    def _path(self, profile_id: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.{extension}")
+
+    def save(self, profile_id: str, profile: CoroutineProfile, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Write a finished profile and return its summary"""
+        summary = {
+            "id": profile_id,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            **request,
+            "wall_ms": round(profile.wall_ms, 3),
+            "running_ms": round(profile.running_ms, 3),  # On the event loop (CPU)
+            "await_ms": round(profile.await_ms, 3),  # Suspended waiting on I/O, locks, tasks...
+            "suspensions": profile.suspensions,
+            "awaits": profile.top_awaits(),
+            "stats": profile.stats_text(),
+        }
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)  # Profiles include SQL and stacks
+        profile.dump(self._path(profile_id, "prof"))
+        with open(self._path(profile_id, "json"), "w") as f:
+            json.dump(summary, f)
+        self._prune()
+        return summary
+
+    def _prune(self) -> None:
+        summaries = sorted(
+            (name for name in os.listdir(self.directory) if name.endswith(".json")),
+            key=lambda name: os.path.getmtime(os.path.join(self.directory, name)),
+            reverse=True,
+        )
+        for name in summaries[self.keep:]:
+            profile_id = name[:-len(".json")]
+            for extension in ("json", "prof"):
+                try:
+                    os.remove(self._path(profile_id, extension))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _valid_id(profile_id: str) -> bool:
+        return len(profile_id) == 32 and all(c in "0123456789abcdef" for c in profile_id)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        if not self._valid_id(profile_id):
+            return None
+        try:
+            with open(self._path(profile_id, "json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def raw_path(self, profile_id: str) -> Optional[str]:
+        """Path of the .prof file, if it exists"""
+        if not self._valid_id(profile_id):
+            return None
+        path = self._path(profile_id, "prof")
+        return path if os.path.exists(path) else None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Summaries without the pstats report, newest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                summary = self.get(name[:-len(".json")])
+                if summary:
+                    summary.pop("stats", None)
+                    summary.pop("awaits", None)
+                    profiles.append(summary)
+        return sorted(profiles, key=lambda p: p["created_at"], reverse=True)
+
+
+# Singleton instance
+profile_store = ProfileStore(directory=settings.PROFILE_DIR, keep=settings.PROFILE_KEEP)
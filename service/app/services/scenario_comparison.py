@@ -0,0 +1,212 @@
+from uuid import UUID
+from typing import Any, Dict, List, Tuple
+from app.repositories.scenario_repo import ScenarioRepository
+from app.repositories.cost_repo import CostRepository
+from app.repositories.revenue_repo import RevenueRepository
+
+
+class ScenarioNotFoundError(LookupError):
+    """Raised when a scenario requested for comparison doesn't exist"""
+
+
+def calculate_first_year_value(value, starts_at: int, end_at, year_start_month=1, year_end_month=12) -> float:
+    """Calculate first-year value based on starts_at and end_at"""
+    # Calculate active months in first year
+    first_active = max(year_start_month, starts_at)
+    last_active = min(year_end_month, end_at) if end_at else year_end_month
+
+    # If not active in first year
+    if first_active > year_end_month or last_active < year_start_month:
+        return 0
+
+    # Convert annual value to monthly, then multiply by active months
+    monthly = float(value) / 12
+    active_months = last_active - first_active + 1
+    return monthly * active_months
+
+
+def compute_scenario_metrics(scenarios, costs, revenues) -> Dict[UUID, Dict[str, Any]]:
+    """
+    Compute first-year metrics for many scenarios in a single pass over
+    all of their cost and revenue rows.
+
+    Args:
+        scenarios: Scenario models
+        costs: Cost rows for any of those scenarios
+        revenues: Revenue rows for any of those scenarios
+
+    Returns:
+        Dict of scenario ID -> {total_costs, total_revenue, net_burn,
+        growth_rate, runway, costs_by_category, cost_items, revenue_items}
+    """
+    totals = {
+        scenario.id: {
+            "total_costs": 0.0,
+            "total_revenue": 0.0,
+            "costs_by_category": {},
+            "cost_items": 0,
+            "revenue_items": 0,
+        }
+        for scenario in scenarios
+    }
+
+    for cost in costs:
+        if not cost.is_active:
+            continue
+        entry = totals[cost.scenario_id]
+        first_year = calculate_first_year_value(cost.value, cost.starts_at, cost.end_at)
+        entry["total_costs"] += first_year
+        entry["costs_by_category"][cost.category] = entry["costs_by_category"].get(cost.category, 0.0) + first_year
+        entry["cost_items"] += 1
+
+    for revenue in revenues:
+        if not revenue.is_active:
+            continue
+        entry = totals[revenue.scenario_id]
+        entry["total_revenue"] += calculate_first_year_value(revenue.value, revenue.starts_at, revenue.end_at)
+        entry["revenue_items"] += 1
+
+    for scenario in scenarios:
+        entry = totals[scenario.id]
+        total_costs = entry["total_costs"]
+        net_burn = total_costs - entry["total_revenue"]
+        entry["net_burn"] = net_burn
+        entry["growth_rate"] = ((entry["total_revenue"] - total_costs) / total_costs * 100) if total_costs > 0 else 0
+
+        # Runway in months; infinite when revenue covers costs
+        funding = float(scenario.funding) if scenario.funding else 0
+        monthly_net_burn = net_burn / 12
+        entry["runway"] = None
+        if funding and monthly_net_burn > 0:
+            entry["runway"] = funding / monthly_net_burn
+        elif funding and monthly_net_burn <= 0:
+            entry["runway"] = float('inf')
+
+    return totals
+
+
+def format_scenario_data(scenario, costs, revenues, metrics) -> Dict[str, Any]:
+    """Format scenario data for LLM comparison"""
+    return {
+        "scenario": {
+            "name": scenario.name,
+            "description": scenario.description or "",
+            "funding": float(scenario.funding) if scenario.funding else None,
+        },
+        "costs": [
+            {
+                "title": cost.title,
+                "value": str(float(cost.value)),
+                "category": cost.category,
+                "starts_at": str(cost.starts_at),
+                "end_at": str(cost.end_at) if cost.end_at else "",
+                "freq": cost.freq,
+            }
+            for cost in costs if cost.is_active
+        ],
+        "revenues": [
+            {
+                "title": revenue.title,
+                "value": str(float(revenue.value)),
+                "category": revenue.category or "",
+                "starts_at": str(revenue.starts_at),
+                "end_at": str(revenue.end_at) if revenue.end_at else "",
+                "freq": revenue.freq,
+            }
+            for revenue in revenues if revenue.is_active
+        ],
+        "metrics": {
+            "total_costs": metrics["total_costs"],
+            "total_revenue": metrics["total_revenue"],
+            "net_burn": metrics["net_burn"],
+            "growth_rate": metrics["growth_rate"],
+            "runway": metrics["runway"],
+        }
+    }
+
+
+def _parse_scenario_ids(scenario_ids: List[str]) -> List[UUID]:
+    """Parse IDs, dropping duplicates but keeping request order"""
+    try:
+        uuids = [UUID(scenario_id) for scenario_id in scenario_ids]
+    except ValueError:
+        raise ValueError("Invalid scenario ID format")
+    return list(dict.fromkeys(uuids))
+
+
+async def _fetch_scenarios(scenario_uuids: List[UUID]):
+    """
+    Fetch scenarios and all of their cost/revenue rows with one query per table.
+
+    Returns:
+        (scenarios in request order, costs, revenues)
+    """
+    found = {
+        scenario.id: scenario
+        for scenario in await ScenarioRepository.get_scenarios_by_ids(scenario_uuids)
+    }
+    for scenario_uuid in scenario_uuids:
+        if scenario_uuid not in found:
+            raise ScenarioNotFoundError(f"Scenario with ID {scenario_uuid} not found")
+
+    costs = await CostRepository.get_costs_by_scenarios(scenario_uuids)
+    revenues = await RevenueRepository.get_revenues_by_scenarios(scenario_uuids)
+    return [found[scenario_uuid] for scenario_uuid in scenario_uuids], costs, revenues
+
+
+async def load_comparison_data(scenario1_id: str, scenario2_id: str):
+    """
+    Fetch both scenarios with their costs and revenues, compute first-year
+    metrics and format them for the LLM.
+
+    Returns:
+        (scenario1, scenario2, scenario1_data, scenario2_data)
+
+    Raises:
+        ValueError: If an ID is not a valid UUID
+        ScenarioNotFoundError: If either scenario doesn't exist
+    """
+    scenario_uuids = _parse_scenario_ids([scenario1_id, scenario2_id])
+    scenarios, costs, revenues = await _fetch_scenarios(scenario_uuids)
+    metrics = compute_scenario_metrics(scenarios, costs, revenues)
+
+    scenario1 = scenarios[0]
+    scenario2 = scenarios[-1]  # Same scenario compared with itself collapses to one
+
+    def scenario_data(scenario):
+        return format_scenario_data(
+            scenario,
+            [cost for cost in costs if cost.scenario_id == scenario.id],
+            [revenue for revenue in revenues if revenue.scenario_id == scenario.id],
+            metrics[scenario.id],
+        )
+
+    return scenario1, scenario2, scenario_data(scenario1), scenario_data(scenario2)
+
+
+async def load_multi_comparison(scenario_ids: List[str]) -> Tuple[List[Any], List[Dict[str, Any]]]:
+    """
+    Load K scenarios and compute their metrics for an N-way comparison.
+
+    Returns:
+        (scenarios in request order, one compact row per scenario with name,
+        funding and metrics)
+
+    Raises:
+        ValueError: If an ID is not a valid UUID
+        ScenarioNotFoundError: If any scenario doesn't exist
+    """
+    scenario_uuids = _parse_scenario_ids(scenario_ids)
+    scenarios, costs, revenues = await _fetch_scenarios(scenario_uuids)
+    metrics = compute_scenario_metrics(scenarios, costs, revenues)
+
+    rows = [
+        {
+            "id": str(scenario.id),
+            "name": scenario.name,
+            "funding": float(scenario.funding) if scenario.funding else 0.0,
+            **metrics[scenario.id],
+        }
+        for scenario in scenarios
+    ]
+    return scenarios, rows
@@ -0,0 +1,168 @@
+"""
+Live updates for scenarios.
+
+Routers publish the rows each committed write changed. When a scenario has
+subscribers, changes arriving within a short debounce window are merged
+into one delta, the scenario's headline metrics are recomputed once, and
+the delta is fanned out to every subscriber's queue.
+
+Subscriptions are per process: with several workers, a subscriber only sees
+writes handled by its own worker.
+"""
+import asyncio
+import logging
+import math
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from uuid import UUID
+from fastapi.encoders import jsonable_encoder
+from app.config import settings
+from app.repositories.cost_repo import CostRepository
+from app.repositories.revenue_repo import RevenueRepository
+from app.repositories.scenario_repo import ScenarioRepository
+from app.services.scenario_comparison import compute_scenario_metrics
+
+logger = logging.getLogger(__name__)
+
+ENTITIES = ("costs", "revenues")
+
+# Subscriber queue items are (event name, data)
+Event = Tuple[str, Dict[str, Any]]
+
+
+async def load_headline_metrics(scenario_id: UUID) -> Optional[Dict[str, Any]]:
+    """Scenario totals, burn and runway (None if the scenario no longer exists)"""
+    scenario = await ScenarioRepository.get_scenario_by_id(scenario_id)
+    if not scenario:
+        return None
+    costs = await CostRepository.get_costs_by_scenario(scenario_id)
+    revenues = await RevenueRepository.get_revenues_by_scenario(scenario_id)
+    metrics = compute_scenario_metrics([scenario], costs, revenues)[scenario_id]
+    runway = metrics["runway"]
+    return {
+        "total_costs": round(metrics["total_costs"], 2),
+        "total_revenue": round(metrics["total_revenue"], 2),
+        "net_burn": round(metrics["net_burn"], 2),
+        "growth_rate": round(metrics["growth_rate"], 2),
+        "runway_months": None if runway is None or math.isinf(runway) else round(runway, 1),
+        "runway_infinite": runway is not None and math.isinf(runway),
+        "costs_by_category": {category: round(value, 2) for category, value in metrics["costs_by_category"].items()},
+        "cost_items": metrics["cost_items"],
+        "revenue_items": metrics["revenue_items"],
+    }
+
+
+class _PendingDelta:
+    def __init__(self):
+        self.upserted: Dict[str, Dict[Any, Dict[str, Any]]] = {entity: {} for entity in ENTITIES}
+        self.deleted: Dict[str, Set[Any]] = {entity: set() for entity in ENTITIES}
+        self.scenario: Optional[Dict[str, Any]] = None
+        self.scenario_deleted = False
+
+
+class ScenarioEventHub:
+    """Per-scenario subscriptions to committed changes"""
+
+    def __init__(self, debounce_seconds: float, queue_size: int):
+        self.debounce_seconds = debounce_seconds
+        self.queue_size = queue_size
+        self._subscribers: Dict[UUID, Set[asyncio.Queue]] = {}
+        self._pending: Dict[UUID, _PendingDelta] = {}
+        self._flushes: Set[asyncio.Task] = set()
+        self._seq = 0
+
+    def subscribe(self, scenario_id: UUID) -> asyncio.Queue:
+        """Receive (event, data) tuples for the scenario's changes"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(scenario_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, scenario_id: UUID, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(scenario_id)
+        if subscribers:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[scenario_id]
+
+    def publish(
+        self,
+        scenario_id: UUID,
+        entity: str,
+        rows: Iterable[Dict[str, Any]] = (),
+        deleted_ids: Iterable[Any] = (),
+    ) -> None:
+        """
+        Record committed changes to a scenario's costs or revenues, or to the
+        scenario itself (entity "scenario"). A no-op without subscribers.
+        """
+        if scenario_id not in self._subscribers:
+            return
+        deleted_ids = [str(row_id) for row_id in deleted_ids]
+        pending = self._pending.get(scenario_id)
+        if pending is None:
+            pending = self._pending[scenario_id] = _PendingDelta()
+            task = asyncio.create_task(self._flush_after_debounce(scenario_id))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+        if entity == "scenario":
+            for row in rows:
+                pending.scenario = jsonable_encoder(row)
+            pending.scenario_deleted = pending.scenario_deleted or bool(deleted_ids)
+            return
+        for row in rows:
+            row = jsonable_encoder(row)
+            pending.deleted[entity].discard(row["id"])
+            pending.upserted[entity][row["id"]] = row
+        for row_id in deleted_ids:
+            pending.upserted[entity].pop(row_id, None)
+            pending.deleted[entity].add(row_id)
+
+    def publish_rows(self, entity: str, rows: Iterable[Dict[str, Any]]) -> None:
+        """Publish upserted cost/revenue rows to their scenarios"""
+        by_scenario: Dict[UUID, list] = {}
+        for row in rows:
+            by_scenario.setdefault(row["scenario_id"], []).append(row)
+        for scenario_id, scenario_rows in by_scenario.items():
+            self.publish(scenario_id, entity, rows=scenario_rows)
+
+    async def _flush_after_debounce(self, scenario_id: UUID) -> None:
+        await asyncio.sleep(self.debounce_seconds)
+        pending = self._pending.pop(scenario_id)
+        try:
+            metrics = None if pending.scenario_deleted else await load_headline_metrics(scenario_id)
+        except Exception as e:
+            logger.error(f"❌ Failed to compute metrics for scenario {scenario_id}: {str(e)}")
+            self._broadcast(scenario_id, ("resync", {"scenario_id": str(scenario_id)}))
+            return
+
+        self._seq += 1
+        if metrics is None:
+            self._broadcast(scenario_id, ("deleted", {"scenario_id": str(scenario_id), "seq": self._seq}))
+            return
+        delta = {"scenario_id": str(scenario_id), "seq": self._seq, "metrics": metrics}
+        if pending.scenario is not None:
+            delta["scenario"] = pending.scenario
+        for entity in ENTITIES:
+            if pending.upserted[entity] or pending.deleted[entity]:
+                delta[entity] = {
+                    "upserted": list(pending.upserted[entity].values()),
+                    "deleted": sorted(pending.deleted[entity]),
+                }
+        self._broadcast(scenario_id, ("delta", delta))
+
+    def _broadcast(self, scenario_id: UUID, event: Event) -> None:
+        for queue in self._subscribers.get(scenario_id, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too far behind to apply deltas in order; have the client refetch
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("resync", {"scenario_id": str(scenario_id)}))
+
+
+# Singleton instance
+scenario_events = ScenarioEventHub(
+    debounce_seconds=settings.SCENARIO_EVENTS_DEBOUNCE_MS / 1000,
+    queue_size=settings.SCENARIO_EVENTS_QUEUE_SIZE,
+)
@@ -0,0 +1,166 @@
+"""
+Slow-query log.
+
+Registered as a query listener (app.utils.db_hooks). Statements slower than
+the threshold are logged with their normalized SQL, redacted parameters and
+the application code that issued them, and kept in a ring buffer for
+GET /admin/slow-queries. Their EXPLAIN plan is fetched in the background
+(once per query shape) and attached to the sample when it arrives.
+"""
+import asyncio
+import contextvars
+import logging
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional, Set
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+from app.config import settings
+from app.utils.db_hooks import QueryEvent, normalize_sql
+
+logger = logging.getLogger(__name__)
+
+MAX_SQL_LENGTH = 2000
+PLAN_CACHE_SIZE = 200
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE")
+EXPLAIN_PREFIXES = {"sqlite": "EXPLAIN QUERY PLAN", "postgres": "EXPLAIN", "mysql": "EXPLAIN"}
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Frames skipped when looking for the code that issued a statement
+_SKIPPED_FILES = (os.path.join(_APP_DIR, "utils", "db_hooks.py"), os.path.abspath(__file__))
+
+# Set while our own EXPLAIN runs so it isn't reported as a slow query
+_explaining: ContextVar[bool] = ContextVar("explaining", default=False)
+
+
+def redact_params(params: Any) -> Any:
+    """Keep numbers, booleans and NULLs; replace everything else with its type (and length)"""
+    if params is None:
+        return None
+    if isinstance(params, (list, tuple)):
+        return [redact_params(param) for param in params]
+    if isinstance(params, (bool, int, float)):
+        return params
+    if isinstance(params, (str, bytes)):
+        return f"<{type(params).__name__}:{len(params)}>"
+    return f"<{type(params).__name__}>"
+
+
+def base_client(connection_name: str) -> BaseDBAsyncClient:
+    """
+    The connection's base client. Inside a transaction connections.get()
+    returns the transaction's wrapper, whose connection must not be used
+    outside it (it goes back to the pool when the transaction ends).
+    """
+    client = connections.get(connection_name)
+    while getattr(client, "_parent", None) is not None:
+        client = client._parent
+    return client
+
+
+def caller_location() -> Optional[str]:
+    """Innermost application frame (outside the DB hooks) on the current stack"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and filename not in _SKIPPED_FILES:
+            return f"{os.path.relpath(filename, os.path.dirname(_APP_DIR))}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float, sample_size: int, explain: bool):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.samples: Deque[Dict[str, Any]] = deque(maxlen=sample_size)
+        self.total = 0
+        self._plans: "OrderedDict[str, str]" = OrderedDict()  # Query shape -> plan
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}  # Query shape -> samples awaiting its plan
+        self._tasks: Set[asyncio.Task] = set()
+
+    def record(self, event: QueryEvent) -> None:
+        """Query listener"""
+        if event.duration_ms < self.threshold_ms or _explaining.get():
+            return
+        shape = normalize_sql(event.sql)
+        sample = {
+            "at": time.time(),
+            "duration_ms": round(event.duration_ms, 1),
+            "sql": shape[:MAX_SQL_LENGTH],
+            "params": redact_params(event.params),
+            "method": event.method,
+            "connection": event.connection,
+            "caller": caller_location(),
+            "error": event.error,
+            "plan": self._plans.get(shape),
+        }
+        self.total += 1
+        self.samples.append(sample)
+        logger.warning(
+            f"⚠️ Slow query ({sample['duration_ms']} ms) from {sample['caller']}: "
+            f"{sample['sql']} params={sample['params']}"
+        )
+        if self.explain and sample["plan"] is None and event.error is None:
+            self._schedule_explain(shape, event, sample)
+
+    def _schedule_explain(self, shape: str, event: QueryEvent, sample: Dict[str, Any]) -> None:
+        if not event.sql.lstrip().upper().startswith(EXPLAINABLE):
+            return
+        if shape in self._pending:
+            self._pending[shape].append(sample)  # EXPLAIN already running for this shape
+            return
+        try:
+            loop = asyncio.get_running_loop()
+            client = base_client(event.connection)
+        except Exception:
+            return
+        self._pending[shape] = [sample]
+        # A fresh context: nothing of the request (its transaction, query capture or timings) carries over
+        task = contextvars.Context().run(loop.create_task, self._explain(shape, event, client))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _explain(self, shape: str, event: QueryEvent, client: BaseDBAsyncClient) -> None:
+        token = _explaining.set(True)
+        try:
+            prefix = EXPLAIN_PREFIXES.get(client.capabilities.dialect, "EXPLAIN")
+            rows = await client.execute_query_dict(f"{prefix} {event.sql}", event.params)
+            plan = "\n".join(
+                str(row.get("QUERY PLAN") or row.get("detail") or " | ".join(map(str, row.values())))
+                for row in rows
+            )
+        except Exception as e:
+            plan = f"EXPLAIN failed: {type(e).__name__}: {str(e)}"
+        finally:
+            _explaining.reset(token)
+
+        self._plans[shape] = plan
+        while len(self._plans) > PLAN_CACHE_SIZE:
+            self._plans.popitem(last=False)
+        for sample in self._pending.pop(shape, []):
+            sample["plan"] = plan
+        logger.info(f"EXPLAIN {shape[:200]}\n{plan}")
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Newest samples first"""
+        return list(reversed(self.samples))[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "threshold_ms": self.threshold_ms,
+            "total": self.total,
+            "sampled": len(self.samples),
+            "explain": self.explain,
+        }
+
+
+# Singleton instance
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    sample_size=settings.SLOW_QUERY_SAMPLE_SIZE,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+)
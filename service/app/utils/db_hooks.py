@@ -0,0 +1,159 @@
+"""
+Hooks around every SQL statement Tortoise executes.
+
+install_query_hooks() wraps the execute_* methods of the loaded Tortoise
+DB client classes (connections and transaction wrappers). Each statement is
+timed and reported to the registered listeners as a QueryEvent; listeners
+must be cheap and must not raise. Waiting for a connection (pool checkout,
+or the lock around a single connection) is reported to acquire listeners.
+"""
+import logging
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, List, Optional, Set
+from tortoise.backends.base.client import BaseDBAsyncClient, ConnectionWrapper, PoolConnectionWrapper
+
+logger = logging.getLogger(__name__)
+
+EXECUTE_METHODS = ("execute_query", "execute_query_dict", "execute_insert", "execute_many", "execute_script")
+
+
+@dataclass
+class QueryEvent:
+    sql: str
+    params: Any
+    duration_ms: float
+    method: str  # Client method, e.g. execute_query
+    connection: str  # Connection name from the Tortoise config
+    error: Optional[str] = None  # Exception class name
+
+
+QueryListener = Callable[[QueryEvent], None]
+# (connection name, milliseconds spent waiting for a connection)
+AcquireListener = Callable[[str, float], None]
+
+_listeners: List[QueryListener] = []
+_acquire_listeners: List[AcquireListener] = []
+_instrumented: Set[type] = set()
+# Set while a wrapped method runs so methods calling each other count once
+_in_query: ContextVar[bool] = ContextVar("in_query", default=False)
+
+
+_SQL_STRING = re.compile(r"'(?:[^']|'')*'")
+_SQL_PARAM = re.compile(r"\$\d+|\?|%s")
+_SQL_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SQL_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SQL_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Query shape: literals and placeholders become ?, IN lists (?, ?, ...)
+    become (...), whitespace is collapsed. Statements that differ only in
+    their values have the same shape.
+    """
+    shape = _SQL_STRING.sub("?", sql)
+    shape = _SQL_PARAM.sub("?", shape)
+    shape = _SQL_NUMBER.sub("?", shape)
+    shape = _SQL_LIST.sub("(...)", shape)
+    return _SQL_SPACE.sub(" ", shape).strip()
+
+
+def add_query_listener(listener: QueryListener) -> None:
+    _listeners.append(listener)
+
+
+def remove_query_listener(listener: QueryListener) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def add_acquire_listener(listener: AcquireListener) -> None:
+    _acquire_listeners.append(listener)
+
+
+def _notify(event: QueryEvent) -> None:
+    for listener in list(_listeners):
+        try:
+            listener(event)
+        except Exception as e:
+            logger.error(f"❌ Query listener {listener!r} failed: {str(e)}")
+
+
+def _wrap(method_name: str, method: Callable) -> Callable:
+    @wraps(method)
+    async def wrapper(self, query: str, *args, **kwargs):
+        if _in_query.get() or not _listeners:
+            return await method(self, query, *args, **kwargs)
+        token = _in_query.set(True)
+        started = time.perf_counter()
+        error = None
+        try:
+            return await method(self, query, *args, **kwargs)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            _in_query.reset(token)
+            _notify(QueryEvent(
+                sql=query,
+                params=args[0] if args else kwargs.get("values"),
+                duration_ms=(time.perf_counter() - started) * 1000,
+                method=method_name,
+                connection=getattr(self, "connection_name", "default"),
+                error=error,
+            ))
+
+    wrapper.__query_hook__ = True
+    return wrapper
+
+
+def _wrap_acquire(method: Callable) -> Callable:
+    @wraps(method)
+    async def wrapper(self):
+        if not _acquire_listeners:
+            return await method(self)
+        started = time.perf_counter()
+        connection = await method(self)
+        wait_ms = (time.perf_counter() - started) * 1000
+        name = getattr(self.client, "connection_name", "default")
+        for listener in list(_acquire_listeners):
+            try:
+                listener(name, wait_ms)
+            except Exception as e:
+                logger.error(f"❌ Acquire listener {listener!r} failed: {str(e)}")
+        return connection
+
+    wrapper.__query_hook__ = True
+    return wrapper
+
+
+def _subclasses(cls: type) -> List[type]:
+    classes = [cls]
+    for subclass in cls.__subclasses__():
+        classes.extend(_subclasses(subclass))
+    return classes
+
+
+def install_query_hooks() -> None:
+    """
+    Instrument the DB client classes loaded so far. Call after Tortoise is
+    initialized (so the configured backends are imported); safe to repeat.
+    """
+    for cls in _subclasses(BaseDBAsyncClient):
+        if cls in _instrumented:
+            continue
+        for name in EXECUTE_METHODS:
+            method = cls.__dict__.get(name)
+            if method is not None and not getattr(method, "__query_hook__", False):
+                setattr(cls, name, _wrap(name, method))
+        _instrumented.add(cls)
+
+    for cls in _subclasses(ConnectionWrapper) + _subclasses(PoolConnectionWrapper):
+        method = cls.__dict__.get("__aenter__")
+        if cls not in _instrumented and method is not None:
+            cls.__aenter__ = _wrap_acquire(method)
+        _instrumented.add(cls)
@@ -0,0 +1,69 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Tuple, Type
+from uuid import UUID
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from tortoise.models import Model
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; falls back to the stdlib encoder
+    orjson = None
+
+# JSON type each DB value type is encoded as by dumps()
+ENCODED_TYPES = {Decimal: float, datetime: str, date: str}
+
+
+def to_primitive(value: Any) -> Any:
+    """Types neither encoder handles natively (orjson already covers UUID and datetime)"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode to JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(content, default=to_primitive)
+    return json.dumps(content, default=to_primitive, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for raw DB rows (`.values()` dicts): Decimal, UUID and
+    datetime are encoded directly, skipping per-row model construction and
+    FastAPI's response_model validation.
+    """
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def response_fields(model: Type[BaseModel], db_model: Type[Model]) -> Tuple[str, ...]:
+    """
+    Fields to select with `.values()` for a list endpoint.
+
+    Rows skip per-row validation, so the response model is checked against
+    the DB model once, at import time: every field must be a column (or a
+    foreign key id) that encodes to the type the model declares.
+    """
+    fields_map = db_model._meta.fields_map
+    for name, field in model.model_fields.items():
+        db_field = fields_map.get(name)
+        if db_field is None:
+            if name.endswith("_id") and name[:-3] in db_model._meta.fk_fields:
+                continue
+            raise TypeError(f"{model.__name__}.{name} has no matching {db_model.__name__} column")
+        encoded = ENCODED_TYPES.get(db_field.field_type, db_field.field_type)
+        declared = [arg for arg in getattr(field.annotation, "__args__", (field.annotation,)) if arg is not type(None)]
+        if encoded not in declared:
+            raise TypeError(
+                f"{model.__name__}.{name} is declared {field.annotation} "
+                f"but {db_model.__name__}.{name} encodes as {encoded.__name__}"
+            )
+    return tuple(model.model_fields)
@@ -0,0 +1,56 @@
+import logging
+from typing import Dict
+import httpx
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HTTPClients:
+    """
+    One httpx.AsyncClient per upstream (see HTTP_UPSTREAMS), shared for the
+    application's lifetime so connections (and TLS sessions) are reused
+    instead of being set up per request.
+    """
+
+    def __init__(self, upstreams: Dict[str, Dict]):
+        self.upstreams = upstreams
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def get(self, upstream: str) -> httpx.AsyncClient:
+        """Shared client for an upstream, created on first use"""
+        client = self._clients.get(upstream)
+        if client is None or client.is_closed:
+            client = self._create(upstream)
+            self._clients[upstream] = client
+        return client
+
+    def _create(self, upstream: str) -> httpx.AsyncClient:
+        config = self.upstreams[upstream]
+        http2 = settings.HTTP2_ENABLED and HTTP2_AVAILABLE
+        logger.info(f"🔌 HTTP client for {upstream} (http2={http2}, max_connections={config['max_connections']})")
+        return httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(config["timeout"], connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=config["max_connections"],
+                max_keepalive_connections=config["max_keepalive_connections"],
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+
+    async def aclose(self) -> None:
+        """Close every client (application shutdown)"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+# Singleton instance
+http_clients = HTTPClients(settings.HTTP_UPSTREAMS)
@@ -0,0 +1,219 @@
+"""
+Incremental parsing of JSON produced by an LLM.
+
+The model's output may be wrapped in markdown fences or prose, may arrive
+in arbitrary chunks, and may be cut off mid-object. `IncrementalJSONParser`
+scans chunks as they arrive, emits each item of selected top-level arrays
+(and selected top-level objects) as soon as it closes, and at the end
+returns the whole document, repairing a truncated tail if needed. A repair
+can drop keys the caller relies on, so check them with `require_keys`.
+"""
+import json
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Tuple
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+@dataclass
+class _Container:
+    kind: str  # "{" or "["
+    key: Optional[str]  # Key of this container in its parent object
+    start: int  # Offset of the opening bracket in the buffer
+
+
+@dataclass
+class _CutPoint:
+    """A value boundary the document can be truncated at, plus the closers needed there"""
+    offset: int
+    closers: str
+
+
+class IncrementalJSONParser:
+    """
+    Feed text chunks; get back (key, value) events for completed items.
+
+    Args:
+        item_keys: Top-level keys holding arrays whose items are emitted
+            one by one as each closes, as (key, item)
+        object_keys: Top-level keys holding objects emitted when they close,
+            as (key, object)
+    """
+
+    def __init__(self, item_keys: Iterable[str] = (), object_keys: Iterable[str] = ()):
+        self.item_keys = set(item_keys)
+        self.object_keys = set(object_keys)
+        self._chunks: List[str] = []
+        self._chunk_starts: List[int] = []  # Offset of each chunk in the document
+        self._length = 0
+        self._root_start: Optional[int] = None
+        self._root_end: Optional[int] = None
+        self._stack: List[_Container] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self._cut_points: List[_CutPoint] = []
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far"""
+        if len(self._chunks) > 1:
+            self._chunks[:] = ["".join(self._chunks)]
+            self._chunk_starts[:] = [0]
+        return self._chunks[0] if self._chunks else ""
+
+    def _slice(self, start: int, end: int) -> str:
+        """text[start:end] without joining every chunk (feeding stays linear in the output size)"""
+        first = bisect_right(self._chunk_starts, start) - 1
+        last = bisect_left(self._chunk_starts, end)
+        joined = "".join(self._chunks[first:last])
+        base = self._chunk_starts[first]
+        return joined[start - base:end - base]
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Scan a chunk and return events for values completed within it"""
+        offset = self._length
+        if chunk:
+            self._chunks.append(chunk)
+            self._chunk_starts.append(offset)
+            self._length += len(chunk)
+        events: List[Tuple[str, Any]] = []
+
+        for position, char in enumerate(chunk, start=offset):
+            if self._root_end is not None:
+                continue  # Trailing fence or prose after the document
+            if self._root_start is None:
+                if char == "{":
+                    self._root_start = position
+                    self._stack.append(_Container("{", None, position))
+                    self._cut_points.append(_CutPoint(position + 1, "}"))
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    try:
+                        self._last_string = json.loads(self._slice(self._string_start, position + 1))
+                    except ValueError:
+                        self._last_string = None
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = position
+            elif char == ":":
+                self._pending_key = self._last_string
+            elif char == ",":
+                self._add_cut_point(position)
+            elif char in "{[":
+                parent = self._stack[-1]
+                key = self._pending_key if parent.kind == "{" else None
+                self._stack.append(_Container(char, key, position))
+                self._pending_key = None
+                self._add_cut_point(position + 1)
+            elif char in "}]":
+                container = self._stack.pop()
+                self._pending_key = None
+                if not self._stack:
+                    self._root_end = position + 1
+                    continue
+                event = self._event_for(container, self._slice(container.start, position + 1))
+                if event:
+                    events.append(event)
+                self._add_cut_point(position + 1)
+
+        return events
+
+    def _add_cut_point(self, offset: int) -> None:
+        # Never cut inside an item: a half-written item is dropped, not kept partially
+        inside_item = (
+            len(self._stack) >= 3
+            and self._stack[1].kind == "["
+            and self._stack[1].key in self.item_keys
+        )
+        if not inside_item:
+            self._cut_points.append(_CutPoint(offset, self._closers()))
+
+    def _closers(self) -> str:
+        return "".join(_CLOSERS[container.kind] for container in reversed(self._stack))
+
+    def _event_for(self, container: _Container, raw: str) -> Optional[Tuple[str, Any]]:
+        depth = len(self._stack)
+        parent = self._stack[-1]
+        is_item = (
+            container.kind == "{" and depth == 2
+            and parent.kind == "[" and parent.key in self.item_keys
+        )
+        is_object = container.kind == "{" and depth == 1 and container.key in self.object_keys
+        if not (is_item or is_object):
+            return None
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return None
+        return (parent.key if is_item else container.key), value
+
+    def finish(self) -> Any:
+        """
+        Return the complete document. A truncated one is repaired by cutting
+        it back to the last complete value (whole items, for item arrays)
+        and closing open brackets; a cut-off string or number is dropped
+        rather than kept partially.
+
+        Raises:
+            ValueError: If no JSON object was found or it can't be repaired
+        """
+        text = self.text
+        if self._root_start is None:
+            raise ValueError("No JSON object found in response")
+        if self._root_end is not None:
+            return json.loads(text[self._root_start:self._root_end])
+
+        for cut in reversed(self._cut_points):
+            candidate = text[self._root_start:cut.offset].rstrip().rstrip(",") + cut.closers
+            try:
+                return json.loads(candidate)
+            except ValueError:
+                continue
+        raise ValueError("Could not repair truncated JSON response")
+
+
+def parse_json_response(response: str, item_keys: Iterable[str] = ()) -> Any:
+    """
+    Parse a JSON object from an LLM response, ignoring markdown fences or
+    surrounding prose and repairing a truncated tail.
+
+    Args:
+        response: Raw model output
+        item_keys: Top-level array keys whose unfinished items are dropped on repair
+
+    Raises:
+        ValueError: If no usable JSON object is found
+    """
+    parser = IncrementalJSONParser(item_keys=item_keys)
+    parser.feed(response)
+    return parser.finish()
+
+
+def require_keys(document: Any, paths: Iterable[str]) -> Any:
+    """
+    Check that a parsed document has every dotted key path ("scenario.name").
+    Returns the document.
+
+    Raises:
+        ValueError: If a key is missing (e.g. cut off by a truncation repair)
+    """
+    for path in paths:
+        value = document
+        for key in path.split("."):
+            if not isinstance(value, dict) or key not in value:
+                raise ValueError(f"Missing required key '{path}' in JSON response")
+            value = value[key]
+    return document
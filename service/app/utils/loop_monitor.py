@@ -0,0 +1,126 @@
+"""
+Event-loop lag monitor and blocking-call detector.
+
+A background task sleeps for `interval` seconds at a time; how much later
+than requested it wakes up is the time the loop spent running other
+callbacks without yielding. Sustained lag means something is blocking the
+loop (CPU-heavy work or a synchronous call in a handler).
+
+A watchdog thread watches the task's heartbeat. When the loop has not
+ticked for `block_threshold_ms` past its schedule, the watchdog captures
+the loop thread's current stack - the code that is blocking it - while it
+is still blocking, logs it and keeps it in `recent_blocks`.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+from app.utils.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+STACK_LIMIT = 20  # Innermost frames kept per captured stack
+
+
+class BlockingCallError(AssertionError):
+    """A handler held the event loop longer than allowed (test mode)"""
+
+
+def format_stack(frame, limit: int = STACK_LIMIT) -> List[str]:
+    """Innermost `limit` frames, outermost first"""
+    return [line.rstrip() for line in traceback.format_stack(frame)[-limit:]]
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float, block_threshold_ms: float = 0, keep_blocks: int = 20):
+        self.interval = interval
+        self.block_threshold_ms = block_threshold_ms  # 0 disables the watchdog
+        self.lag_ms = Histogram(LAG_BUCKETS_MS)
+        self.block_ms = Histogram(LAG_BUCKETS_MS)
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.blocks = 0
+        self.recent_blocks: Deque[Dict[str, Any]] = deque(maxlen=keep_blocks)
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._next_tick = 0.0  # perf_counter() time the loop task is due to wake up
+        self._current_block: Optional[Dict[str, Any]] = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(max(0.0, self._next_tick - time.perf_counter()))
+            lag = max(0.0, (time.perf_counter() - self._next_tick) * 1000)
+            self.last_lag_ms = lag
+            self.max_lag_ms = max(self.max_lag_ms, lag)
+            self.lag_ms.observe(lag)
+            self._end_block(lag)
+            self._next_tick = time.perf_counter() + self.interval
+
+    def _end_block(self, lag_ms: float) -> None:
+        block, self._current_block = self._current_block, None
+        if block is None:
+            return
+        block["duration_ms"] = round(lag_ms, 1)
+        self.block_ms.observe(lag_ms)
+        logger.warning(f"⚠️ Event loop was blocked for {lag_ms:.0f} ms (stack captured at {block['captured_after_ms']} ms)")
+
+    def _watch(self) -> None:
+        check_every = max(self.block_threshold_ms / 2000, 0.005)
+        while not self._stopped.wait(check_every):
+            overdue_ms = (time.perf_counter() - self._next_tick) * 1000
+            if overdue_ms < self.block_threshold_ms or self._current_block is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            block = {
+                "captured_at": time.time(),
+                "captured_after_ms": round(overdue_ms, 1),
+                "duration_ms": None,  # Filled in once the loop runs again
+                "stack": format_stack(frame),
+            }
+            self._current_block = block
+            self.blocks += 1
+            self.recent_blocks.append(block)
+            logger.warning(
+                f"⚠️ Event loop blocked for {overdue_ms:.0f} ms so far, in:\n" + "\n".join(block["stack"])
+            )
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._next_tick = time.perf_counter() + self.interval
+        self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+        if self.block_threshold_ms > 0:
+            self._loop_thread_id = threading.get_ident()
+            self._stopped.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="loop-block-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog:
+            self._stopped.set()
+            self._watchdog.join()
+            self._watchdog = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "last_lag_ms": round(self.last_lag_ms, 3),
+            "max_lag_ms": round(self.max_lag_ms, 3),
+            "lag_ms": self.lag_ms.snapshot(),
+            "block_threshold_ms": self.block_threshold_ms,
+            "blocks": self.blocks,
+            "block_ms": self.block_ms.snapshot(),
+            "recent_blocks": list(self.recent_blocks),
+        }
@@ -0,0 +1,70 @@
+from typing import Any, Dict, Iterable, List
+
+# Bucket upper bounds
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 20000, 30000, 60000)
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (Prometheus style: each bucket counts
+    observations <= its upper bound, plus an implicit +Inf bucket).
+    """
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets: List[float] = sorted(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)  # Non-cumulative; last is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def cumulative_counts(self) -> List[int]:
+        """Cumulative counts per bucket, ending with the +Inf bucket (== count)"""
+        total = 0
+        cumulative = []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        lower = 0.0
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1] if self.buckets else 0.0  # Beyond the last bound
+                upper = self.buckets[i]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            if i < len(self.buckets):
+                lower = self.buckets[i]
+        return self.buckets[-1] if self.buckets else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-friendly summary with estimated percentiles and cumulative buckets"""
+        cumulative = self.cumulative_counts()
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "avg": round(self.sum / self.count, 3) if self.count else 0.0,
+            "p50": round(self.quantile(0.50), 3),
+            "p95": round(self.quantile(0.95), 3),
+            "p99": round(self.quantile(0.99), 3),
+            "buckets": {
+                **{f"{bound:g}": cumulative[i] for i, bound in enumerate(self.buckets)},
+                "+Inf": cumulative[-1],
+            },
+        }
@@ -0,0 +1,132 @@
+"""
+Profile one coroutine (a single request) with cProfile.
+
+The coroutine is driven step by step: the profiler is enabled only while
+the coroutine itself runs, so concurrent requests on the same event loop
+don't end up in its profile. Time spent suspended is attributed to the
+innermost application await site (app/...:line function) at the moment of
+suspension, which shows where the request was waiting (DB, LLM provider,
+locks, ...) rather than which library primitive it ended up in.
+With cpu=False only the step timings are kept (no cProfile), which is cheap
+enough to check every request for event-loop blocking in tests.
+"""
+import cProfile
+import io
+import os
+import pstats
+import time
+from typing import Any, Coroutine, Dict, List, Optional
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _await_site(coro: Any) -> str:
+    """
+    Innermost application frame (under app/) of a suspended coroutine chain,
+    or the innermost frame when the chain never enters application code
+    """
+    frame = app_frame = None
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None) or frame
+        if frame is not None and frame.f_code.co_filename.startswith(_APP_DIR):
+            app_frame = frame
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+    frame = app_frame or frame
+    if frame is None:
+        return "<unknown>"
+    filename = frame.f_code.co_filename
+    if app_frame is not None:
+        filename = os.path.relpath(filename, os.path.dirname(_APP_DIR))
+    return f"{filename}:{frame.f_lineno} {frame.f_code.co_name}"
+
+
+class CoroutineProfile:
+    def __init__(self, cpu: bool = True):
+        self.profiler = cProfile.Profile() if cpu else None
+        self.wall_ms = 0.0
+        self.running_ms = 0.0
+        self.suspensions = 0
+        self.max_step_ms = 0.0  # Longest stretch without yielding to the loop
+        self.max_step_site = "<start>"  # Await site that stretch resumed from
+        self.awaits: Dict[str, Dict[str, float]] = {}  # Await site -> {"count", "total_ms", "max_ms"}
+
+    @property
+    def await_ms(self) -> float:
+        return max(0.0, self.wall_ms - self.running_ms)
+
+    async def run(self, coro: Coroutine) -> Any:
+        """Await coro under the profiler and return its result"""
+        return await _Driver(self, coro)
+
+    def _record_await(self, site: str, duration_ms: float) -> None:
+        entry = self.awaits.setdefault(site, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += duration_ms
+        entry["max_ms"] = max(entry["max_ms"], duration_ms)
+
+    def top_awaits(self, limit: int = 20) -> List[Dict[str, Any]]:
+        ranked = sorted(self.awaits.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        return [
+            {"site": site, "count": int(entry["count"]), "total_ms": round(entry["total_ms"], 3), "max_ms": round(entry["max_ms"], 3)}
+            for site, entry in ranked[:limit]
+        ]
+
+    def stats_text(self, sort: str = "cumulative", limit: int = 40) -> str:
+        """pstats report of the on-loop (CPU) time"""
+        if self.profiler is None:
+            return ""
+        out = io.StringIO()
+        try:
+            pstats.Stats(self.profiler, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+        except TypeError:
+            return ""  # Nothing was recorded
+        return out.getvalue()
+
+    def dump(self, path: str) -> None:
+        """Write a .prof file (pstats, snakeviz, ...)"""
+        self.profiler.dump_stats(path)
+
+
+class _Driver:
+    """Awaitable that steps a coroutine, timing each run and each suspension"""
+
+    def __init__(self, profile: CoroutineProfile, coro: Coroutine):
+        self.profile = profile
+        self.coro = coro
+
+    def __await__(self):
+        profile, coro, profiler = self.profile, self.coro, self.profile.profiler
+        started = time.perf_counter()
+        value: Any = None
+        error: Optional[BaseException] = None
+        site = "<start>"
+        try:
+            while True:
+                step_started = time.perf_counter()
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    if error is not None:
+                        yielded = coro.throw(error)
+                    else:
+                        yielded = coro.send(value)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+                    step_ms = (time.perf_counter() - step_started) * 1000
+                    profile.running_ms += step_ms
+                    if step_ms > profile.max_step_ms:
+                        profile.max_step_ms, profile.max_step_site = step_ms, site
+
+                site = _await_site(coro)
+                suspended = time.perf_counter()
+                try:
+                    value, error = (yield yielded), None
+                except BaseException as e:  # Cancellation is passed on to the coroutine
+                    value, error = None, e
+                profile.suspensions += 1
+                profile._record_await(site, (time.perf_counter() - suspended) * 1000)
+        finally:
+            profile.wall_ms = (time.perf_counter() - started) * 1000
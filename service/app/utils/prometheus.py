@@ -0,0 +1,180 @@
+"""
+Prometheus text exposition and cross-worker aggregation.
+
+Collectors describe metrics as plain dict "families" so they can be written
+to disk as JSON and merged:
+
+    {"name": "http_requests_total", "type": "counter", "help": "...",
+     "aggregate": "sum", "samples": [{"labels": {...}, "value": 3}]}
+
+Histogram samples carry "buckets" (upper bounds), cumulative "counts"
+(ending with +Inf), "sum" and "count" instead of "value". When several
+workers serve the app, each one writes its families to a shared directory
+(SnapshotStore) and a scrape of any worker merges them: counters and
+histograms are summed, gauges are summed or maxed per family.
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.utils.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Family = Dict[str, Any]
+
+
+def family(name: str, kind: str, help_text: str, aggregate: str = "sum") -> Family:
+    return {"name": name, "type": kind, "help": help_text, "aggregate": aggregate, "samples": []}
+
+
+def add_sample(fam: Family, value: float, **labels: str) -> None:
+    fam["samples"].append({"labels": labels, "value": value})
+
+
+def add_histogram(fam: Family, histogram: Histogram, scale: float = 1.0, **labels: str) -> None:
+    """Add a Histogram; scale converts units (0.001 turns milliseconds into seconds)"""
+    fam["samples"].append({
+        "labels": labels,
+        "buckets": [bound * scale for bound in histogram.buckets],
+        "counts": histogram.cumulative_counts(),
+        "sum": histogram.sum * scale,
+        "count": histogram.count,
+    })
+
+
+def _key(sample: Dict[str, Any]) -> Tuple:
+    return tuple(sorted(sample["labels"].items()))
+
+
+def merge(snapshots: Iterable[List[Family]]) -> List[Family]:
+    """Merge the families of several workers into one list"""
+    merged: Dict[str, Family] = {}
+    samples: Dict[str, Dict[Tuple, Dict[str, Any]]] = {}
+    for families in snapshots:
+        for fam in families:
+            target = merged.setdefault(fam["name"], {**fam, "samples": []})
+            by_labels = samples.setdefault(fam["name"], {})
+            for sample in fam["samples"]:
+                existing = by_labels.get(_key(sample))
+                if existing is None:
+                    copy = {**sample, "counts": list(sample["counts"])} if "counts" in sample else dict(sample)
+                    by_labels[_key(sample)] = copy
+                    target["samples"].append(copy)
+                elif "counts" in sample:
+                    if existing["buckets"] != sample["buckets"]:
+                        continue  # Bucket layout changed between deploys; keep the first
+                    existing["counts"] = [a + b for a, b in zip(existing["counts"], sample["counts"])]
+                    existing["sum"] += sample["sum"]
+                    existing["count"] += sample["count"]
+                elif fam["type"] == "gauge" and fam.get("aggregate") == "max":
+                    existing["value"] = max(existing["value"], sample["value"])
+                else:
+                    existing["value"] += sample["value"]
+    return list(merged.values())
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, str], extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels.items()) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in items) + "}"
+
+
+def _number(value: float) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if math.isnan(value):
+            return "NaN"
+        return repr(value)
+    return str(value)
+
+
+def render(families: List[Family]) -> str:
+    """Prometheus text exposition format (0.0.4)"""
+    lines: List[str] = []
+    for fam in sorted(families, key=lambda f: f["name"]):
+        name = fam["name"]
+        lines.append(f"# HELP {name} {fam['help']}")
+        lines.append(f"# TYPE {name} {fam['type']}")
+        for sample in fam["samples"]:
+            labels = sample["labels"]
+            if fam["type"] != "histogram":
+                lines.append(f"{name}{_labels(labels)} {_number(sample['value'])}")
+                continue
+            bounds = [f"{bound:g}" for bound in sample["buckets"]] + ["+Inf"]
+            for bound, count in zip(bounds, sample["counts"]):
+                lines.append(f"{name}_bucket{_labels(labels, ('le', bound))} {count}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(float(sample['sum']))}")
+            lines.append(f"{name}_count{_labels(labels)} {sample['count']}")
+    return "\n".join(lines) + "\n"
+
+
+class SnapshotStore:
+    """
+    Shares metric families between workers through a directory: each worker
+    rewrites <dir>/<pid>.json every `interval` seconds and readers ignore
+    files older than three intervals (workers that exited). write() and
+    read_peers() do blocking file I/O; async callers run them in a thread.
+    """
+
+    def __init__(self, directory: str, interval: float):
+        self.directory = directory
+        self.interval = interval
+        self.path = os.path.join(directory, f"{os.getpid()}.json")
+        self._writer: Optional[asyncio.Task] = None
+
+    def write(self, families: List[Family]) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(families, f)
+        os.replace(tmp, self.path)  # Atomic, readers never see half a file
+
+    def read_peers(self) -> List[List[Family]]:
+        """Fresh snapshots of the other workers"""
+        snapshots = []
+        cutoff = time.time() - 3 * self.interval
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not name.endswith(".json") or path == self.path:
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    continue
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # Removed or replaced while reading
+        return snapshots
+
+    async def _write_periodically(self, collect) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.write, collect())
+            except Exception as e:
+                logger.error(f"❌ Failed to write metrics snapshot {self.path}: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self, collect) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._writer = asyncio.create_task(self._write_periodically(collect), name="metrics-snapshot-writer")
+
+    async def stop(self) -> None:
+        if self._writer:
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
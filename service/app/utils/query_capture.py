@@ -0,0 +1,102 @@
+"""
+Record the SQL statements executed in a block of code.
+
+    with capture_queries() as queries:
+        await compare_scenarios(...)
+    queries.assert_max_queries(5)
+    queries.assert_no_repeated_queries()
+
+By default every statement executed while the block is active is recorded,
+whichever task runs it (tests drive the app through TestClient, whose
+requests run in another thread). With current_context_only=True only
+statements issued from the current context (request or task) are kept,
+which is what per-request auditing needs. Requires install_query_hooks().
+"""
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+from app.utils.db_hooks import QueryEvent, add_query_listener, normalize_sql, remove_query_listener
+
+# Captures active in the current context (current_context_only=True)
+_context_captures: ContextVar[tuple] = ContextVar("query_captures", default=())
+_context_listener_added = False
+
+
+class QueryBudgetExceeded(AssertionError):
+    """More statements (or more repeats of one statement shape) than allowed"""
+
+
+class QueryCapture:
+    def __init__(self):
+        self.events: List[QueryEvent] = []
+
+    def record(self, event: QueryEvent) -> None:
+        self.events.append(event)
+
+    @property
+    def count(self) -> int:
+        return len(self.events)
+
+    @property
+    def statements(self) -> List[str]:
+        return [event.sql for event in self.events]
+
+    def shapes(self) -> Counter:
+        """Statement count per normalized query shape"""
+        return Counter(normalize_sql(event.sql) for event in self.events)
+
+    def repeated_queries(self, min_count: int = 2) -> Dict[str, int]:
+        """
+        Query shapes executed at least min_count times: candidates for N+1
+        patterns (one query per item of a list instead of one for the list)
+        """
+        return {shape: count for shape, count in self.shapes().most_common() if count >= min_count}
+
+    def report(self, limit: int = 10) -> str:
+        lines = [f"{self.count} queries"]
+        for shape, count in self.shapes().most_common(limit):
+            lines.append(f"  {count}x {shape}")
+        return "\n".join(lines)
+
+    def assert_max_queries(self, n: int) -> None:
+        if self.count > n:
+            raise QueryBudgetExceeded(f"Expected at most {n} queries, got {self.report()}")
+
+    def assert_no_repeated_queries(self, max_repeats: int = 1, ignore: Optional[List[str]] = None) -> None:
+        """Fail if any shape (not containing one of `ignore`) ran more than max_repeats times"""
+        repeated = {
+            shape: count
+            for shape, count in self.repeated_queries(max_repeats + 1).items()
+            if not any(pattern in shape for pattern in ignore or [])
+        }
+        if repeated:
+            details = "\n".join(f"  {count}x {shape}" for shape, count in repeated.items())
+            raise QueryBudgetExceeded(f"Possible N+1 queries (allowed {max_repeats} per shape):\n{details}")
+
+
+def _record_in_context(event: QueryEvent) -> None:
+    for capture in _context_captures.get():
+        capture.record(event)
+
+
+@contextmanager
+def capture_queries(current_context_only: bool = False) -> Iterator[QueryCapture]:
+    global _context_listener_added
+    capture = QueryCapture()
+    if not current_context_only:
+        add_query_listener(capture.record)
+        try:
+            yield capture
+        finally:
+            remove_query_listener(capture.record)
+        return
+
+    if not _context_listener_added:
+        add_query_listener(_record_in_context)
+        _context_listener_added = True
+    token = _context_captures.set(_context_captures.get() + (capture,))
+    try:
+        yield capture
+    finally:
+        _context_captures.reset(token)
@@ -0,0 +1,7 @@
+from contextvars import ContextVar
+from typing import Optional
+from uuid import UUID
+
+# Authenticated user for the current request (or background job), used to
+# attribute work such as LLM usage without threading the user through every call
+current_user_id: ContextVar[Optional[UUID]] = ContextVar("current_user_id", default=None)
@@ -0,0 +1,83 @@
+"""
+Per-request phase timings (DB, auth, handler, serialization, LLM).
+
+ServerTimingMiddleware puts a RequestTimings in a context variable for each
+request; code anywhere below it records phases with record_phase() or the
+phase() context manager. Outside a request (background workers) recording
+is a no-op. Phases may overlap: the handler phase includes the DB and LLM
+time spent inside it.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+# Server-Timing descriptions, also the order phases are reported in
+PHASES = {
+    "auth": "Authentication",
+    "db": "DB queries",
+    "handler": "Route handler",
+    "serialize": "Response serialization",
+    "llm": "LLM calls",
+}
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations_ms: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, phase: str, duration_ms: float) -> None:
+        self.durations_ms[phase] = self.durations_ms.get(phase, 0.0) + duration_ms
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing_header(self) -> str:
+        """Server-Timing header value, e.g. `db;desc="DB queries (3)";dur=4.2, total;dur=12.0`"""
+        order = list(PHASES)
+        entries: List[str] = []
+        for phase in sorted(self.durations_ms, key=lambda p: order.index(p) if p in order else len(order)):
+            desc = PHASES.get(phase, phase)
+            if self.counts[phase] > 1:
+                desc += f" ({self.counts[phase]})"
+            entries.append(f'{phase};desc="{desc}";dur={self.durations_ms[phase]:.1f}')
+        entries.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(entries)
+
+    def log_fields(self) -> Dict[str, float]:
+        """Flat fields for structured logs, e.g. {"db_ms": 4.2, "db_count": 3}"""
+        fields: Dict[str, float] = {}
+        for phase, duration in self.durations_ms.items():
+            fields[f"{phase}_ms"] = round(duration, 1)
+            fields[f"{phase}_count"] = self.counts[phase]
+        return fields
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("current_timings", default=None)
+
+
+def record_phase(phase: str, duration_ms: float) -> None:
+    timings = current_timings.get()
+    if timings is not None:
+        timings.add(phase, duration_ms)
+
+
+def record_query(event) -> None:
+    """Query listener (see app.utils.db_hooks) adding statements to the db phase"""
+    record_phase("db", event.duration_ms)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the enclosed block as a phase of the current request"""
+    if current_timings.get() is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, (time.perf_counter() - started) * 1000)
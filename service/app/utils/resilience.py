@@ -0,0 +1,112 @@
+import asyncio
+import random
+import time
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(f"{name} is unavailable, retry in {retry_after:.0f}s")
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed    -> calls pass through; `failure_threshold` failures in a row open it
+    open      -> calls fail fast with CircuitOpenError for `reset_timeout` seconds
+    half_open -> one trial call is let through; success closes, failure re-opens
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if the call should not be attempted"""
+        if self.state == self.OPEN:
+            elapsed = time.monotonic() - self.opened_at
+            if elapsed < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.reset_timeout - elapsed)
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.reset_timeout)
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info(f"✅ Circuit '{self.name}' closed")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_cancelled(self) -> None:
+        """The call was abandoned (client went away): no verdict, but free the trial slot"""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(
+                    f"❌ Circuit '{self.name}' opened after {self.consecutive_failures} consecutive failures"
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected": self.rejected,
+        }
+
+
+async def retry_with_backoff(
+    fn: Callable[[], Awaitable[Any]],
+    *,
+    retries: int,
+    base_delay: float,
+    max_delay: float,
+    is_retryable: Callable[[BaseException], bool],
+) -> Any:
+    """
+    Call fn(), retrying retryable errors with exponential backoff and full jitter.
+
+    The delay before retry n is uniform(0, min(max_delay, base_delay * 2**n)).
+    """
+    attempt = 0
+    while True:
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt >= retries or not is_retryable(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            attempt += 1
+            logger.warning(
+                f"Retrying after {type(e).__name__} (attempt {attempt}/{retries}, sleeping {delay:.2f}s)"
+            )
+            await asyncio.sleep(delay)
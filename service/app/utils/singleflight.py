@@ -0,0 +1,50 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key starts the work in its own task; callers that
+    arrive while it is in flight await the same task. The work is shielded so
+    one caller disconnecting doesn't cancel it for everyone else.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() once per key at a time and share its result"""
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.executed += 1
+            task = asyncio.create_task(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t))
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: str) -> bool:
+        """Whether a call for key is running (so do() would join it)"""
+        return key in self._in_flight
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved in case every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the metrics endpoint"""
+        total = self.executed + self.coalesced
+        return {
+            "in_flight": len(self._in_flight),
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / total, 4) if total else 0.0,
+        }
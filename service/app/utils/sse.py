@@ -0,0 +1,89 @@
+import json
+import time
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+}
+
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """
+    Format a single server-sent event.
+
+    Data is JSON-encoded so multi-line tokens survive the SSE framing.
+    """
+    message = ""
+    if event:
+        message += f"event: {event}\n"
+    message += f"data: {json.dumps(data)}\n\n"
+    return message
+
+
+async def stream_llm_events(
+    chunks: AsyncIterator[str],
+    metadata: Optional[Dict[str, Any]] = None,
+    on_complete: Optional[Callable[[str], Awaitable[None]]] = None
+) -> AsyncIterator[str]:
+    """
+    Wrap an LLM token stream as SSE events.
+
+    Emits one `token` event per chunk, then a final `done` event carrying
+    the metadata plus timing information, and the model that answered when
+    the chunks come from an LLMStream. Errors are reported as an `error`
+    event since the HTTP status has already been sent.
+
+    on_complete, if given, is awaited with the full text once the stream
+    has completed, before the `done` event (not if it failed or the client
+    went away); if it raises, an `error` event is sent instead of `done`.
+    """
+    started = time.perf_counter()
+    first_token_at = None
+    chunk_count = 0
+    char_count = 0
+    parts = []
+
+    try:
+        async for chunk in chunks:
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            chunk_count += 1
+            char_count += len(chunk)
+            if on_complete is not None:
+                parts.append(chunk)
+            yield format_sse({"token": chunk}, event="token")
+    except Exception as e:
+        logger.error(f"❌ Error while streaming LLM response: {str(e)}")
+        yield format_sse({"detail": f"LLM error: {str(e)}"}, event="error")
+        return
+
+    if on_complete is not None:
+        try:
+            await on_complete("".join(parts))
+        except Exception as e:
+            logger.error(f"❌ Error after streaming LLM response: {str(e)}")
+            yield format_sse({"detail": f"Failed to store response: {str(e)}"}, event="error")
+            return
+
+    done = dict(metadata or {})
+    model = getattr(chunks, "model", None)
+    if model is not None:
+        done["model"] = model
+    done.update({
+        "chunks": chunk_count,
+        "characters": char_count,
+        "time_to_first_token_ms": round((first_token_at - started) * 1000, 1) if first_token_at else None,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    })
+    yield format_sse(done, event="done")
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """Build a StreamingResponse for an SSE event iterator"""
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
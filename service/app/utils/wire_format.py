@@ -0,0 +1,52 @@
+from enum import Enum
+from typing import Any, Dict, List, Sequence
+from fastapi import Request
+from fastapi.responses import Response
+from app.utils.fast_json import FastJSONResponse, to_primitive
+
+try:
+    import msgpack
+except ImportError:  # Optional; JSON only
+    msgpack = None
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+class ListLayout(str, Enum):
+    """Body layout for list endpoints"""
+    ROWS = "rows"  # [{field: value, ...}, ...]
+    COLUMNS = "columns"  # {"count": n, "columns": {field: [value, ...], ...}}
+
+
+class MessagePackResponse(Response):
+    media_type = "application/msgpack"
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, default=to_primitive, use_bin_type=True)
+
+
+def to_columns(rows: List[Dict[str, Any]], fields: Sequence[str]) -> Dict[str, Any]:
+    """Struct-of-arrays form of rows: each field's values in one array, keys sent once"""
+    return {
+        "count": len(rows),
+        "columns": {field: [row[field] for row in rows] for field in fields},
+    }
+
+
+def accepts_msgpack(request: Request) -> bool:
+    accept = request.headers.get("accept", "")
+    return msgpack is not None and any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+
+def list_response(request: Request, rows: List[Dict[str, Any]], fields: Sequence[str], layout: ListLayout) -> Response:
+    """
+    Response for a list endpoint in the requested layout, as MessagePack when
+    the client accepts it (and msgpack is installed), JSON otherwise.
+    """
+    content = to_columns(rows, fields) if layout == ListLayout.COLUMNS else rows
+    if accepts_msgpack(request):
+        response = MessagePackResponse(content)
+    else:
+        response = FastJSONResponse(content)
+    response.headers["Vary"] = "Accept"
+    return response
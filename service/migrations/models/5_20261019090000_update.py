@@ -0,0 +1,57 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "llm_jobs" (
+    "id" UUID NOT NULL PRIMARY KEY,
+    "task" VARCHAR(20) NOT NULL,
+    "status" VARCHAR(20) NOT NULL DEFAULT 'pending',
+    "payload" JSONB NOT NULL,
+    "result" JSONB,
+    "error" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "started_at" TIMESTAMPTZ,
+    "finished_at" TIMESTAMPTZ,
+    "user_id" UUID NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "llm_jobs";"""
+
+
+MODELS_STATE = (
+    "eJztnP1P2zgYx/+VKj8xiUOjAzadTie1pdy69WWCcjdtmio3cVMfiZ05DlAh/vez3bzH6U"
+    "hpIe35F6CP/TT257FjP9/EPBgusaDjH137kBq/Nx4MDFzI/8jYDxsG8LzEKgwMTB1ZMeA1"
+    "pAVMfUaBybhxBhwfcpMFfZMijyGCuRUHjiOMxOQVEbYTU4DRzwBOGLEhm8uGfP/BzQhb8B"
+    "760UfvZjJD0LEy7USWuLa0T9jCk7br6975hawpLjedmMQJXJzU9hZsTnBcPQiQdSR8RJkN"
+    "MaSAQSvVDdHKsLuRadlibmA0gHFTrcRgwRkIHAHD+GMWYFMwaMgriR8nfxoV8JgEC7QIM8"
+    "Hi4XHZq6TP0mqIS3U+ti4P3p29kb0kPrOpLJREjEfpCBhYukquCUiPkhly4MRDJgsoLFId"
+    "w3umpqpwzSHmzX8C3BBdzDaqksBNBlZEN6K2cZTj7texaLPr+z8dYRj+3bqUfAetrxKwuw"
+    "hL+qPhX1F1wqfAcmIMO/1RW0JPINuE2ByUatB25oCq8Wac1gK7xqh9HlfDBfcTB2KbzfnH"
+    "5unpCtARVl7rTY5gWNRclmVRyt8VKEb1NwNw+0Mzi/D47dsnIOS1ShHKsixC6ALkVGEYO+"
+    "hRGCI0KRQdngBW5HjOSxhyoZpl1jMH1Apdj6I/ajpGeR+sEXYWYexW3U57g+7VuDX4krmn"
+    "nrfGXVHSzNxPI+vBWS4U8Zc0/umNPzbEx8a30bCbX+7ieuNvhmgTCBiZYHI3AVZqmEXWCE"
+    "wmsIFnrRnYrKcO7KsGVjZebB5nN6ldjzBMgXlzB6g1yZQkA8Bx3Mm/ZOoXw98OPS8+X0IH"
+    "SLTFQIf7535/8IlM6xnkx2jkRtY0L9IkZcCKRW7TzVsABrZstbi2uFII5MqEGFBEDEWyEZ"
+    "cdrko4/LCWTjp2P+n4f23itrIDSbesQLI8Z8u56XxNma/xSWSJ9hS3ANBELnDUbFNe+eV/"
+    "6XYUuu8a4/Nupzdo9Q+OTw+bEikHihhMj96TQpZB4S3EgWKar2SY8tIMdZqxH7tRnWbsaW"
+    "DXTzNMftln5hgd/hX1jG9phqFYH54J4TJZL3aIwzYzLTksFFlWNFzKM6x4TOrsaqezK4aY"
+    "Uym9ih10fhVDvAVO5c1r7PPsrevr3aw2t3flvbMJXVQZiGmf3RyLW3lg4zNAma/cLPZwSa"
+    "Kf8cmxFCtRPVna4jq/NY9P3p98eHd28oFXkW2JLe9X0O0Nx/knXVi9xS6lljishezlM85N"
+    "E5tR+LPKjI3q7+ZsbT5lsjbL52qzMFURn3J8h3CrWDrahDgQ4JLtTNovB3PKHbdFM97jbH"
+    "rNaI9G/UzO1u7lhbfrQbvL74W5FaU4JrUKshfJslZB9jSwhdQ+elSnfOGpPKXLuW0yt3vV"
+    "7fMvUrmCflQEWaR4QShENv4MF5Jlj7cFYFO1eigestaWXkEp4WYK7mKxID9EeDd55+By4e"
+    "i0rjqt867xWK6/bVN3iZQohfSSEqnK1Ze0HqYFGC3AGDu0jdYCjBZgXi0D1vpLbdUErb9o"
+    "/UXrL1p/0Wl6DdJ0rb/saWC1/qL1F62/hEcuFPJLchijXH1JH/vQ6stuqy/Av6kkvoT19R"
+    "Y6znZZoHgtr5xg4vFyDA0Pxm/b1xSkBxYOAYpp/elqNFSTTLnkUF5j3rvvFjLZYcNBPvtR"
+    "z8G5gqHodWb/VDipkT+UkZv74gvyJzV4kWh2BcSJxwYI1+qIwVYAQ0oJLfItP2EUO+yIfv"
+    "jSZ4t0Nr0XSVcxm5aK71qBzXpuILD1mkU1imPU7ZWBnCGM/Plakcy56lC+cijFf6mqqIKk"
+    "XLQCImlsQP2I/p9Yban9UvlIDYs6qR4tSJE5NxSqR1hyuEr1AEmd2mgepc8GlXNS8VwwjN"
+    "7ztI46PBUslzhuIfWVB//Lc/SUy44KHdt4yURMjQoQw+q7CXArr0bwKzKIKyXgKRetcZSl"
+    "4BUOFW9+eXn8D5/T/CA="
+)
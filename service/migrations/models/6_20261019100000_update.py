@@ -0,0 +1,70 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "llm_conversations" (
+    "id" UUID NOT NULL PRIMARY KEY,
+    "system_prompt" TEXT,
+    "summary" TEXT NOT NULL,
+    "summarized_through" INT NOT NULL DEFAULT 0,
+    "last_seq" INT NOT NULL DEFAULT 0,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "user_id" UUID NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "llm_conversation_messages" (
+    "id" BIGSERIAL NOT NULL PRIMARY KEY,
+    "seq" INT NOT NULL,
+    "role" VARCHAR(10) NOT NULL,
+    "content" TEXT NOT NULL,
+    "conversation_id" UUID NOT NULL REFERENCES "llm_conversations" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_llm_convers_convers_f9ac3e" UNIQUE ("conversation_id", "seq")
+);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "llm_conversation_messages";
+        DROP TABLE IF EXISTS "llm_conversations";"""
+
+
+MODELS_STATE = (
+    "eJztXGtv2zYU/SuGPrVAFiTKc8MwwHbc1l0cD4mzFS0KgZZoWYtEuhKV1ivy30fSeotSI1"
+    "t2JJdf2viSVyIPL8V7jkh9VxxsQNs7vPegq/zW+a4g4ED6R8p+0FHAYhFbmYGAqc0r+rQG"
+    "t4CpR1ygE2qcAduD1GRAT3etBbEwolbk2zYzYp1WtJAZm3xkffGhRrAJyZw35NNnaraQAb"
+    "9BL/y5eNBmFrSNVDstg92b2zWyXHDb/f3w6g2vyW431XRs+w6Kay+WZI5RVN33LeOQ+bAy"
+    "EyLoAgKNRDdYK4PuhqZVi6mBuD6MmmrEBgPOgG8zMJTfZz7SGQYdfif2z+kfSgV4dIwYtB"
+    "YiDIvvT6texX3mVoXdqv+ue/vq5Pw17yX2iOnyQo6I8sQdAQErV45rDOTCxTPLhtrC0onv"
+    "wjyqE/iNiFEVuGYgps1/BrgBdBG2YZUY3DiwQnRD1GqHcjL4MGFtdjzvi80MN393bzm+o+"
+    "4HDrCzDEquxzdvw+qYToHVxLjpX497HPQYZBNjkwIlCtr+HLhieFNOawG7RtRuhqvigG+a"
+    "DZFJ5vSnenZWAnQIK631OoNgUKSuytJQ8v8roBjWrwfA7YdmGsLjo6NnQEhrFULIy9IQQg"
+    "dYdhUMIwcZhQGEugtZhzVA8jhe0RJiOVCMZdozA6gRuB6GfzQ0RmkfjDGyl8HYlT1Oh6PB"
+    "3aQ7+iv1TL3qTgasRE09T0Prq/PMUEQX6fwznLzrsJ+dj+ObQXa5i+pNPiqsTcAnWEP4qw"
+    "aMRJiF1hCY1MD6C2PNgU17yoF90YHljWfJ4+whkfUwwxToD1+Ba2ipkjgAbNvR/sVTLz/8"
+    "vcDzzZ+30AYc2vxAB/nz9fXoPZ42c5CfwsgNrfFgp2GgNR5pks+7ujke/cTVWgYMixus4q"
+    "JIyhc5qpO1AARM3mp2b3anAJk7HSLgWlgRsLCo7KCMiXlBLcnG2s/Gfq7sdiupWbJlOSSL"
+    "yWzGTRJZIZGlk8hg7cnnRlC3HGCLsU14ZfOildth4N42jK8G/eGoe/3q+OxA5ZBSQC0Ck9"
+    "F7mqNfLnyEyBdM81IME14SQ8m/9iNNl/xrTwd2ff6l09tuSDb69BLNHN9nUa/gSb8hCLfx"
+    "etEiHLbJtHhYCFhWGC7FDCuKScmuWs2uiEXsSvQqcpD8KgLxEdiVk9fIZ+PU9eUeVvXlrr"
+    "R3JnaXVQIx6dPOWNzKmyyPAJd4wmRxiAqIfsongyVbiZqJpcnu84t6fHpxenlyfnpJq/C2"
+    "RJaLEnSHN5PsK0AkTrELUYsd1oJs94yzbsRmLvxSZcaG9ds5W9XnTFa1eK6qualq0SlHM4"
+    "RHwdLRw9iGABWkM0m/DJhT6rgtNKMcp+41ozceX6c4W2+YFd7uR70BfRZmVpR8TEoVZC/I"
+    "slRB9nRgc9Q+fFUn3AlWTOkybnVyuxdNn39A5XL6UR7IPIpvsAstE/0JlxzLIW0LQLpo9R"
+    "C8ZG0sejmlhJpd8DUSC7IhQrtJOwdXC0e/e9fvXg2Up2L9bZu6S6hECaSXhEhVrL4k9TAp"
+    "wEgBRmlRGi0FGCnAvBgDlvpLY9UEqb9I/UXqL1J/kTS9ATRd6i97OrBSf5H6i9RfgrMoAv"
+    "klPqVSrL4kz8NI9aXd6gvwHiqJL0F9mUJHbJf4gm15xQjGHrvDUFnAaLd9Q4FcgKWNgWBa"
+    "v78b34iRTLhkoLxHtHefDEsnBx3b8sjnZgZnCYas16n8KXdSI3soIzP32QWyJzVoEWt2BY"
+    "hjjxoQbtQRg60ADF0Xu3l8i08YRQ4t0Q93fbZIsum9IF15Ns0V37UGNu1Zw8A2axY1aBzD"
+    "bpcO5MxCljdfayQzrnIoX3go2ee7KqogCRepgHA0alA/wg+tNRa1HyofibBomOqR+uKEWP"
+    "7IfpSiXAfJfRBDCiKtFkS8pUegoy1c7CwEK1pxKp9zlCm9MKX3fMcBoo0WJdDGLjvUTLYT"
+    "mlvE1PqP5lJk7mLfnOfhLd58IXTe3S6Mo/VxrntDgQ08onmiTQWF6CVdfkrMJEXfU4ouX3"
+    "jvxcDmXnhLmidp3ovTvATxgp5H6Vq9HxMcrS7aLni3+qWLAoB+TIETUD6fCWvJUa2XEX9S"
+    "9AxBZ9nX502Ics8yC/M74VNPkNkF82MzjlzL9tpfVfXk5EI9Ojm/PDu9uDi7PIpSvHxRWa"
+    "7XG75l6V5qmQrzvxICXSl93nnm3KwdzC6udvYlrN/O7RfHzztuUHLaIHdsAyMCUSWdJuHS"
+    "FhR3/tY1+SSvlikKXGXGmFuxNswcW/3l5GwSKYiYJr0z6ELX0ueiPCkoKc2LQFynMa8F9i"
+    "jV2XAdLk5iWEQK52rx0pxwacu6soODqWxqVAAxqN5OALdynLIwwynetFec4ch9kdG2vdxq"
+    "vcvl5el/57gr/Q=="
+)
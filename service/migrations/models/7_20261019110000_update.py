@@ -0,0 +1,72 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "llm_usage" (
+    "id" BIGSERIAL NOT NULL PRIMARY KEY,
+    "day" DATE NOT NULL,
+    "task" VARCHAR(20) NOT NULL,
+    "model" VARCHAR(100) NOT NULL,
+    "calls" INT NOT NULL DEFAULT 0,
+    "errors" INT NOT NULL DEFAULT 0,
+    "cache_hits" INT NOT NULL DEFAULT 0,
+    "prompt_tokens" BIGINT NOT NULL DEFAULT 0,
+    "completion_tokens" BIGINT NOT NULL DEFAULT 0,
+    "cost_usd" DECIMAL(12,6) NOT NULL DEFAULT 0,
+    "total_latency_ms" DOUBLE PRECISION NOT NULL DEFAULT 0,
+    "user_id" UUID NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_llm_usage_user_id_8ba48a" UNIQUE ("user_id", "day", "task", "model")
+);
+        COMMENT ON TABLE "llm_usage" IS 'Daily LLM usage per user, task and model';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "llm_usage";"""
+
+
+MODELS_STATE = (
+    "eJztnf1vmzgYx/8VxE+blKva9PVOp5OSNN2yJc3UJnfTpgm54CRcATMw3XJT//ezHd4xNO"
+    "QVUv+ytrYfwB/b8Dxfv+yXbCINGu7R2IWO/If0S7aACckvifSGJAPbjlJpAgYPBivokRIs"
+    "BTy42AEqJokTYLiQJGnQVR3dxjqySKrlGQZNRCopqFvTKMmz9O8eVDCaQjxjD/L1G0nWLQ"
+    "3+hG7wp/2oTHRoaInn1DV6b5au4LnN0sbj3vUNK0lv96CoyPBMKyptz/EMWWFxz9O1I2pD"
+    "86bQgg7AUItVgz6lX90gafHEJAE7HgwfVYsSNDgBnkFhyH9OPEulDCR2J/rP2V9yCTwqsi"
+    "ha3cKUxa/nRa2iOrNUmd6q87519+b04i2rJXLx1GGZjIj8zAwBBgtTxjUCaTtoohtQsXUV"
+    "ew7MUh3Bn5hPlWOaQkwefwm4PrqQbVAkght1rIBuQG3jKEfdzyP6zKbrfjdowu3frTvGd9"
+    "D6zACbcz+nP7x9FxRHZAgsBsZtpz9sM+gR5ClCUwKK12k7M+Dw8SaMVgK7Qq9dj6tsgp+K"
+    "Aa0pnpE/m+fnBaADrKTU2xRBP6u5yEuiZD9LUAzKbwbg9rtmEuHJ8fESCEmpXIQsL4kQmk"
+    "A3yjAMDUQv9BGqDqQVVgDOcrwmOVg3IZ9l0jIFVPNNj4JfKtpHSR20oWXM/bYrep32Bt37"
+    "UWvwKfFOvW6NujSnmXifBqlvLlJNEV5E+qc3ei/RP6Uvw9tu+nMXlht9kekzAQ8jxUI/FK"
+    "DFulmQGoBJNKxnays2bNJSNOxeG5Y9PHUeJ48xr4cmPAD18QdwNCWRE3UAwzCVf9GDm23+"
+    "tm958/EOGoChzTa07z/3+4MP6KGajfwc9NwgNWrsJAZS4ok4+ayq6/PoxK5WczCeC6YcJ6"
+    "QkkHFwlRqRoCMINVHemMpmmU0znQIsUm/Nvze9k4/kXoUWcHQkc+LRMK9RFJO6fikRl9Y/"
+    "Ln1dfv5WnNT4k2VI5of1KTMR0nNDejKINPo8WS8RqroJDD7bmFXaQ1yYHfnmdWN83e30Bq"
+    "3+m5PzRpMhJUB1DOO99ywTiDrwCVoeZ5gXMoxZCYYiEj2MgEVEogfasKtHoiq57ZphV4dc"
+    "oprtu1Ss5b/p14RwF30vasRhm5EW6xacKCvoLvkRVtgnRXRV6+gK69goFV6FBiK+CiE+Aa"
+    "O08xrarO267u9ltTnfldRuipx5mY4Yt6lnX9zKnJ6LgYNdrrPYs3IC/YRNiiX9ElWT5ZTe"
+    "57fmydnl2dXpxdkVKcKeJUy5LKDbux2lJ0MtvoudSy0yWAnZ7iPOTRObOPB7mREblK/naG"
+    "0uM1ib+WO1mRmqOhlyxEN44s0gIGRAYOW4M3G7FMwHYrgtmqGPs+lvRns47CditnYvLbyN"
+    "B+0ueRemvijZPilUkIMIloUKcqANmwntg6k67pq4/JAuZbbJ2G6v7vMLoVxGP8qCzFK8QQ"
+    "7Up9ZHOGcse+RZgKXyvh6cSdbK0ssoJSTZAT9CsSDdRUg1SeXg4sPRad13Wtdd+Tlff9um"
+    "7hIoURzpJSZS5asvcT1MCDBCgJFr5EYLAUYIMHuLgIX+Ulk1QegvQn8R+ovQX0SYXoEwXe"
+    "gvB9qwQn8R+ovQX/xdORz5Jdqvk6++xHcGCfWl3uoLcB9LiS9+eeFCh9Eu9jjL8vIJRha7"
+    "YyjbMFxtX1GQNpgbCHCG9Yf74S2fZMwkhXJskdp91XQVNyRDd/G3anbOAoa01gn/KbNTI7"
+    "0pIzX26QXSOzVIFn3sEogjiw0QrtQWg60Aho6DnCzf/B1GoUFN9MNd7y0S0fRBBF3ZaJop"
+    "vis1bNJyAw1brVFUoXYMql3YkBPd0t3ZSi2ZMhVNueempAeZlVRBYiZCAWE0NqB+BEfOVZ"
+    "bai8pHrFtUTPVInL3Blz/Sx3MU6yCZo0GEIFJrQcSduxiaiu0g0+Z80fJd+YyhcOm5Lr3r"
+    "mSbgLbQoQBuZ7FAz2U7X3CJT/T/iS+GZg7zpLIs3f/EF13h3qzCOV+e86QUFBnCx4vIWFe"
+    "TSi5u8SmYiRD/QEF1MeB9Ew2YmvEWYJ8K8vYd5scALuvT4v80eqzhYXLReeLd60kUOoJdD"
+    "4BjK5SNhJd6qm42Iv8pqKkCn3te3dQLltj7N9e+4bz2OZ+ePj/Vi5I0sr/292Tw9vWwen1"
+    "5cnZ9dXp5fHYcuXjaryNdr995Rdy/xmQr8v4IAupT7vHPPuVormB1Ubu9LUL6eyy9Olttu"
+    "ULDbILNtA1kYWqV0mphJXSjufNY1/iYv5ylyTIXHmPlirek51voM6bQTyekxFZszGBd4Su"
+    "PlfKPwnOwXfSESWuvGXCKXlpiRZENHoo52Q6Jr7yRgaRK7iZxqhVKGXL8qiGs0MF9UYLHU"
+    "b2EkHKyqOFh+82QFGT5fv3iRClPpFwgPHFVRUt8ssZA140mVWn8ZvhqWBRga1JPgVva+qs"
+    "AwOEJG7rsvLP8qZw7Y4scyuCKDV8lLBeoMKjOddxZuQReLG71KbospeeLsPELu/95S4Jxk"
+    "TOsEcCd+SjzIMW3itFM3fhXUXHOBuwC3i0lcwfG2C0/9iJvt5+CPNUgvc+pHs3Gx9KkfGG"
+    "FgKAapoKXOFZPTY28MBHI6LM84RXRCrWvGcThu97vSpzvC877n75EIZy9ZZpLuXbfVT2EV"
+    "M4xihnHvM4zbFIVa0NHVmcyRhPycRpEgBKIylVkrekDyzJp+Y77wQmVKroCbHyTHTOoZJm"
+    "/ltDI6NEpA9IvXE+B2dIa8aa/8nZz5015is2y4lzPzSd7l5+X5f2CMQhk="
+)
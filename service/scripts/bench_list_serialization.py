@@ -0,0 +1,94 @@
+"""
+Benchmark GET /costs serialization: the previous path (model instances ->
+_cost_to_dict -> CostResponse -> response_model validation -> JSONResponse)
+against the direct path (`.values()` rows -> FastJSONResponse).
+
+Usage (from service/):
+    python -m scripts.bench_list_serialization [rows] [repeats]
+"""
+import asyncio
+import json
+import sys
+import time
+from typing import List
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from tortoise import Tortoise
+from app.config import TORTOISE_ORM
+from app.models.cost import Cost
+from app.models.scenario import Scenario
+from app.repositories.cost_repo import CostRepository
+from app.router.costs import COST_LIST_FIELDS, CostResponse, _cost_to_dict
+from app.utils.fast_json import FastJSONResponse, orjson
+
+RESPONSE_FIELD = create_model_field("Response_get_costs", List[CostResponse], mode="serialization")
+
+
+async def fetch_models(scenario_id) -> List[Cost]:
+    return await CostRepository.get_costs_by_scenario(scenario_id)
+
+
+async def fetch_rows(scenario_id) -> List[dict]:
+    return await CostRepository.get_cost_rows(COST_LIST_FIELDS, scenario_id)
+
+
+async def serialize_models(costs: List[Cost]) -> bytes:
+    content = [CostResponse(**_cost_to_dict(cost)) for cost in costs]
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=content)
+    return JSONResponse(content).body
+
+
+async def serialize_rows(rows: List[dict]) -> bytes:
+    return FastJSONResponse(rows).body
+
+
+async def best_of(fn, arg, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await fn(arg)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+async def main(rows_count: int, repeats: int) -> None:
+    config = {**TORTOISE_ORM, "connections": {"default": "sqlite://:memory:"}}
+    await Tortoise.init(config=config)
+    await Tortoise.generate_schemas()
+    try:
+        scenario = await Scenario.create(name="Benchmark")
+        await Cost.bulk_create([
+            Cost(
+                title=f"Engineer {i}", value=120000 + i, category="salary",
+                starts_at=1 + i % 24, end_at=None if i % 3 else 36,
+                freq="monthly", scenario_id=scenario.id,
+            )
+            for i in range(rows_count)
+        ], batch_size=1000)
+
+        costs, rows = await fetch_models(scenario.id), await fetch_rows(scenario.id)
+        previous, direct = await serialize_models(costs), await serialize_rows(rows)
+        assert json.loads(previous) == json.loads(direct), "Serializers disagree"
+
+        print(f"{rows_count} rows, best of {repeats} (encoder: {'orjson' if orjson else 'json'}, {len(direct)} bytes)")
+        print(f"{'':12}{'fetch':>10}{'serialize':>12}{'total':>10}")
+        totals = []
+        for name, fetch, serialize, data in (
+            ("previous", fetch_models, serialize_models, costs),
+            ("direct", fetch_rows, serialize_rows, rows),
+        ):
+            fetch_time = await best_of(fetch, scenario.id, repeats)
+            serialize_time = await best_of(serialize, data, repeats)
+            totals.append(fetch_time + serialize_time)
+            print(f"{name:12}{fetch_time * 1000:8.1f}ms{serialize_time * 1000:10.1f}ms{totals[-1] * 1000:8.1f}ms")
+        print(f"speedup: {totals[0] / totals[1]:.1f}x")
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        rows_count=int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        repeats=int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    ))
@@ -0,0 +1,59 @@
+import os
+import sys
+
+# Test settings; must be set before the app modules read them
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-with-at-least-32-bytes")
+os.environ.setdefault("DATABASE_URL", "sqlite://:memory:")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from app.utils.db_hooks import install_query_hooks  # noqa: E402
+from app.utils.query_capture import capture_queries  # noqa: E402
+
+
+# Query budgets:
+#
+#     def test_list_costs(client, query_capture):
+#         client.get("/costs")
+#         query_capture.assert_max_queries(2)
+#
+#     @pytest.mark.query_budget(6, max_repeats=1)
+#     def test_compare(seeded_client): ...
+#
+# A query_budget test fails if it runs more than max_queries statements, or
+# (with max_repeats) the same query shape more than max_repeats times. The
+# marker counts everything the test runs, fixtures included; request
+# query_capture after the fixtures that set data up to count only the test body.
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries, max_repeats=None): fail if the test runs more SQL statements "
+        "(or repeats one query shape more often) than allowed",
+    )
+
+
+@pytest.fixture
+def query_capture():
+    """Every SQL statement executed from here to the end of the test"""
+    install_query_hooks()
+    with capture_queries() as capture:
+        yield capture
+
+
+@pytest.fixture(autouse=True)
+def _enforce_query_budget(request):
+    marker = request.node.get_closest_marker("query_budget")
+    if marker is None:
+        yield
+        return
+    max_queries = marker.args[0] if marker.args else marker.kwargs["max_queries"]
+    max_repeats = marker.kwargs.get("max_repeats")
+    install_query_hooks()
+    with capture_queries() as capture:
+        yield
+    capture.assert_max_queries(max_queries)
+    if max_repeats is not None:
+        capture.assert_no_repeated_queries(max_repeats)
@@ -0,0 +1,44 @@
+import asyncio
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from app.middleware.auth import get_current_user
+from app.router.batch import router as batch_router
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(batch_router)
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    @app.get("/events")
+    async def events():
+        async def forever():
+            while True:
+                yield "data: tick\n\n"
+                await asyncio.sleep(0.01)
+        return StreamingResponse(forever(), media_type="text/event-stream")
+
+    @app.get("/lines")
+    async def lines():
+        async def slow():
+            await asyncio.sleep(60)
+            yield "{}\n"
+        return StreamingResponse(slow(), media_type="application/x-ndjson")
+
+    app.dependency_overrides[get_current_user] = lambda: object()
+    return TestClient(app)
+
+
+def test_streaming_sub_requests_are_rejected_without_holding_the_batch():
+    response = make_client().post("/batch", json={"requests": [
+        {"path": "/ping"}, {"path": "/events"}, {"path": "/lines"},
+    ]})
+    assert response.status_code == 200
+    ping, events, lines = response.json()["responses"]
+    assert ping == {"id": "0", "status": 200, "body": {"pong": True}}
+    assert events["status"] == 400
+    assert lines["status"] == 400
@@ -0,0 +1,56 @@
+import asyncio
+import base64
+import json
+import httpx
+from app.services.default import auth_serivce
+from app.services.default.auth_serivce import GoogleAuthService
+
+
+class StubClients:
+    def __init__(self, handler):
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def get(self, upstream: str) -> httpx.AsyncClient:
+        return self.client
+
+
+def token_with_kid(kid: str) -> str:
+    header = base64.urlsafe_b64encode(json.dumps({"alg": "RS256", "kid": kid}).encode()).decode().rstrip("=")
+    return f"{header}.e30.c2ln"
+
+
+def test_unknown_kid_refetches_certs_at_most_once_per_interval():
+    fetches = []
+
+    def handler(request):
+        fetches.append(request.url)
+        return httpx.Response(200, json={"known": "pem"}, headers={"cache-control": "max-age=3600"})
+
+    service = GoogleAuthService(clients=StubClients(handler))
+
+    async def run():
+        await service.warm_up()
+        for _ in range(5):
+            assert await service.verify_google_token(token_with_kid("made-up")) is None
+
+    asyncio.run(run())
+    # Warm-up fetch only: the refetch interval starts with it
+    assert len(fetches) == 1
+
+
+def test_unknown_kid_refetches_after_interval(monkeypatch):
+    fetches = []
+
+    def handler(request):
+        fetches.append(request.url)
+        return httpx.Response(200, json={"known": "pem"}, headers={"cache-control": "max-age=3600"})
+
+    monkeypatch.setattr(auth_serivce, "CERT_REFETCH_MIN_SECONDS", 0)
+    service = GoogleAuthService(clients=StubClients(handler))
+
+    async def run():
+        await service.warm_up()
+        await service.verify_google_token(token_with_kid("rotated"))
+
+    asyncio.run(run())
+    assert len(fetches) == 2
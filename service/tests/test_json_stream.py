@@ -0,0 +1,38 @@
+import pytest
+from app.services.default.fake_llm_provider import FakeLLMProvider
+from app.services.llm_service import LLMService
+from app.utils.json_stream import IncrementalJSONParser, parse_json_response, require_keys
+
+DOCUMENT = '```json\n{"scenario": {"name": "Seed"}, "costs": [{"title": "Engineer", "value": 1}, {"title": "Designer", "value": 2}]}\n```'
+
+
+def test_chunked_feed_emits_items_and_document():
+    parser = IncrementalJSONParser(item_keys=("costs",), object_keys=("scenario",))
+    events = []
+    for start in range(0, len(DOCUMENT), 3):
+        events.extend(parser.feed(DOCUMENT[start:start + 3]))
+    assert events == [
+        ("scenario", {"name": "Seed"}),
+        ("costs", {"title": "Engineer", "value": 1}),
+        ("costs", {"title": "Designer", "value": 2}),
+    ]
+    assert parser.finish() == parse_json_response(DOCUMENT)
+    assert parser.text == DOCUMENT
+
+
+def test_truncated_item_is_dropped():
+    document = parse_json_response(DOCUMENT[:DOCUMENT.index("Designer")], item_keys=("costs",))
+    assert document["costs"] == [{"title": "Engineer", "value": 1}]
+
+
+def test_repair_without_required_key_is_rejected():
+    document = parse_json_response('{"scenario": {"name": "hel', item_keys=("costs",))
+    assert document == {"scenario": {}}
+    with pytest.raises(ValueError, match="scenario.name"):
+        require_keys(document, ("scenario.name",))
+
+
+def test_truncated_template_without_name_is_a_parse_error():
+    service = LLMService(FakeLLMProvider(seed=1))
+    with pytest.raises(ValueError, match="scenario.name"):
+        service._parse_structured_response('{"scenario": {"name": "hel')
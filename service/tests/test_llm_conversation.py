@@ -0,0 +1,183 @@
+import asyncio
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from tortoise import Tortoise
+from tortoise.contrib.fastapi import register_tortoise
+from app.config import TORTOISE_ORM, settings
+from app.middleware.auth import get_current_user
+from app.models.llm_conversation import LLMConversation, LLMConversationMessage
+from app.models.user import User
+from app.repositories.llm_conversation_repo import LLMConversationRepository
+from app.router.llm import router as llm_router
+from app.services import llm_conversation
+from app.services.default.fake_llm_provider import FakeLLMProvider
+from app.services.llm_conversation import (
+    build_conversation_context,
+    chat_in_conversation,
+    summarize_conversation,
+)
+from app.services.llm_service import LLMService, get_llm_service
+
+
+@pytest.fixture(autouse=True)
+def window(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CHAT_MAX_RECENT_MESSAGES", 4)
+    monkeypatch.setattr(settings, "LLM_CHAT_KEEP_RECENT_MESSAGES", 2)
+
+
+def fake_service() -> LLMService:
+    return LLMService(FakeLLMProvider(latency_distribution="constant", ttft_ms=0, token_ms=0, response_words=10, seed=1))
+
+
+async def with_db(fn):
+    await Tortoise.init(config={**TORTOISE_ORM, "connections": {"default": "sqlite://:memory:"}})
+    await Tortoise.generate_schemas()
+    try:
+        return await fn()
+    finally:
+        await Tortoise.close_connections()
+
+
+async def new_conversation(message_count: int = 0) -> LLMConversation:
+    user = await User.create(email="a@example.com", name="A", google_id="1")
+    conversation = await LLMConversationRepository.create_conversation(user.id, "You are terse.")
+    if message_count:
+        await LLMConversationRepository.append_messages(conversation.id, [
+            {"role": "user" if n % 2 else "assistant", "content": f"message {n}"}
+            for n in range(1, message_count + 1)
+        ])
+    return await LLMConversation.get(id=conversation.id)
+
+
+async def get(model, **filters):
+    return await model.get(**filters)
+
+
+async def seqs(conversation_id):
+    return await LLMConversationMessage.filter(conversation_id=conversation_id).order_by("seq").values_list("seq", flat=True)
+
+
+def test_context_is_capped_to_the_recent_window():
+    async def run():
+        conversation = await new_conversation(10)
+        return await build_conversation_context(conversation)
+
+    system_prompt, messages = asyncio.run(with_db(run))
+    assert system_prompt == "You are terse."
+    assert [m["content"] for m in messages] == [f"message {n}" for n in range(7, 11)]
+
+
+def test_chat_in_conversation_stores_the_turn_and_flags_summarization():
+    async def run():
+        conversation = await new_conversation()
+        service = fake_service()
+        results = []
+        for n in range(3):
+            conversation = await LLMConversation.get(id=conversation.id)
+            results.append(await chat_in_conversation(service, conversation, [{"role": "user", "content": f"q{n}"}]))
+        return results, await seqs(conversation.id)
+
+    results, stored = asyncio.run(with_db(run))
+    assert all(response.startswith("Fake ") for response, _ in results)
+    assert [needs_summary for _, needs_summary in results] == [False, False, True]  # 6 unsummarized > 4
+    assert stored == [1, 2, 3, 4, 5, 6]
+
+
+def test_summarize_folds_old_messages_and_deletes_them(monkeypatch):
+    service = fake_service()
+    monkeypatch.setattr(llm_conversation, "get_llm_service", lambda: service)
+
+    async def run():
+        conversation = await new_conversation(6)
+        await summarize_conversation(conversation.id)
+        conversation = await LLMConversation.get(id=conversation.id)
+        return conversation, await seqs(conversation.id), await build_conversation_context(conversation)
+
+    conversation, stored, (system_prompt, messages) = asyncio.run(with_db(run))
+    assert conversation.summarized_through == 4
+    assert conversation.summary.startswith("Fake ")
+    assert stored == [5, 6]
+    assert conversation.summary in system_prompt
+    assert [m["content"] for m in messages] == ["message 5", "message 6"]
+
+
+def test_summary_is_dropped_when_another_summarization_won(monkeypatch):
+    class RacingService:
+        async def generate_text(self, prompt, system_prompt, task):
+            # Another summarization commits while this one waits on the LLM
+            await LLMConversationRepository.update_summary(
+                conversation_id, expected_through=0, summary="theirs", summarized_through=2
+            )
+            return "ours"
+
+    monkeypatch.setattr(llm_conversation, "get_llm_service", lambda: RacingService())
+
+    async def run():
+        nonlocal conversation_id
+        conversation = await new_conversation(6)
+        conversation_id = conversation.id
+        await summarize_conversation(conversation.id)
+        return await LLMConversation.get(id=conversation.id), await seqs(conversation.id)
+
+    conversation_id = None
+    conversation, stored = asyncio.run(with_db(run))
+    assert (conversation.summary, conversation.summarized_through) == ("theirs", 2)
+    assert stored == [1, 2, 3, 4, 5, 6]  # The losing summarization deletes nothing
+
+
+def sse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines.get("event"), json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(llm_router)
+    app.dependency_overrides[get_llm_service] = fake_service
+    register_tortoise(
+        app,
+        config={**TORTOISE_ORM, "connections": {"default": "sqlite://:memory:"}},
+        generate_schemas=True,
+    )
+    with TestClient(app) as client:
+        conversation = client.portal.call(new_conversation, 4)
+        user = client.portal.call(lambda: get(User, id=conversation.user_id))
+        app.dependency_overrides[get_current_user] = lambda: user
+        client.conversation = conversation
+        yield client
+
+
+def test_stream_stores_the_turn_before_done(client, monkeypatch):
+    service = fake_service()
+    monkeypatch.setattr(llm_conversation, "get_llm_service", lambda: service)
+    conversation_id = str(client.conversation.id)
+
+    response = client.post("/llm/chat/stream", json={
+        "messages": [{"role": "user", "content": "And next quarter?"}],
+        "conversation_id": conversation_id,
+    })
+    events = sse_events(response.text)
+    assert events[-1][0] == "done"
+    assert events[-1][1]["conversation_id"] == conversation_id
+    reply = "".join(data["token"] for event, data in events if event == "token")
+
+    # 6 messages > the window of 4: summarized after the response
+    conversation = client.portal.call(lambda: get(LLMConversation, id=conversation_id))
+    assert conversation.last_seq == 6
+    assert conversation.summarized_through == 4
+    messages = client.portal.call(LLMConversationRepository.get_messages_after, conversation_id, 0)
+    assert [(m.role, m.content) for m in messages] == [("user", "And next quarter?"), ("assistant", reply)]
+
+
+def test_stream_unknown_conversation_is_404(client):
+    response = client.post("/llm/chat/stream", json={
+        "messages": [{"role": "user", "content": "Hi"}],
+        "conversation_id": "00000000-0000-0000-0000-000000000000",
+    })
+    assert response.status_code == 404
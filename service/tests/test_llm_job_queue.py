@@ -0,0 +1,91 @@
+import asyncio
+import httpx
+from fastapi import FastAPI
+from tortoise import Tortoise
+from app.router import llm as llm_router_module
+from app.config import TORTOISE_ORM
+from app.middleware.auth import get_current_user
+from app.models.llm_job import LLMJob
+from app.models.user import User
+from app.repositories.llm_job_repo import LLMJobRepository
+from app.services.llm_job_queue import LLMJobQueue, LLMJobTask, QueueFullError
+
+
+async def with_db(fn):
+    await Tortoise.init(config={**TORTOISE_ORM, "connections": {"default": "sqlite://:memory:"}})
+    await Tortoise.generate_schemas()
+    try:
+        return await fn()
+    finally:
+        await Tortoise.close_connections()
+
+
+def test_concurrent_enqueues_never_overfill():
+    async def run():
+        user = await User.create(email="a@example.com", name="A", google_id="1")
+        queue = LLMJobQueue(worker_count=0, max_size=3, poll_interval=60)
+        await queue.start()
+        results = await asyncio.gather(
+            *(queue.enqueue(user.id, LLMJobTask.PARSE, {"nlp_input": str(i)}) for i in range(6)),
+            return_exceptions=True,
+        )
+        await queue.stop()
+        return results
+
+    results = asyncio.run(with_db(run))
+    accepted = [r for r in results if isinstance(r, LLMJob)]
+    assert len(accepted) == 3
+    assert all(isinstance(r, QueueFullError) for r in results if r not in accepted)
+
+
+def test_backlog_drains_as_slots_free_up(monkeypatch):
+    processed = []
+
+    async def fake_process(self, job_id):
+        processed.append(job_id)
+        await LLMJobRepository.complete_job(job_id, {"ok": True})
+
+    monkeypatch.setattr(LLMJobQueue, "_process", fake_process)
+
+    async def run():
+        user = await User.create(email="a@example.com", name="A", google_id="1")
+        for i in range(5):
+            await LLMJobRepository.create_job(user.id, LLMJobTask.PARSE.value, {"nlp_input": str(i)})
+        queue = LLMJobQueue(worker_count=1, max_size=2, poll_interval=60)
+        await queue.start()
+        for _ in range(100):
+            if len(processed) == 5:
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+
+    asyncio.run(with_db(run))
+    assert len(processed) == 5
+    assert len(set(processed)) == 5
+
+
+def test_job_events_end_with_error_when_the_job_is_deleted(monkeypatch):
+    monkeypatch.setattr(llm_router_module, "JOB_EVENTS_POLL_SECONDS", 0.02)
+    app = FastAPI()
+    app.include_router(llm_router_module.router)
+
+    async def run():
+        user = await User.create(email="a@example.com", name="A", google_id="1")
+        job = await LLMJobRepository.create_job(user.id, LLMJobTask.PARSE.value, {"nlp_input": "x"})
+        app.dependency_overrides[get_current_user] = lambda: user
+
+        async def delete_job():
+            await asyncio.sleep(0.05)
+            await LLMJob.filter(id=job.id).delete()
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response, _ = await asyncio.wait_for(
+                asyncio.gather(client.get(f"/llm/jobs/{job.id}/events"), delete_job()), 2
+            )
+        return job, response.text
+
+    job, body = asyncio.run(with_db(run))
+    events = [block.split("\n")[0] for block in body.strip().split("\n\n")]
+    assert set(events[:-1]) == {"event: status"}
+    assert events[-1] == "event: error"
+    assert f"Job with ID {job.id} no longer exists" in body
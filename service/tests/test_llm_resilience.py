@@ -0,0 +1,113 @@
+import asyncio
+import time
+import httpx
+import openai
+import pytest
+from app.config import settings
+from app.router.llm import _llm_http_error
+from app.services.default.fake_llm_provider import FakeLLMProvider
+from app.services.llm_service import LLMService
+from app.services.model_router import LLMTask
+from app.utils.resilience import CircuitBreaker, CircuitOpenError
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 1)
+    monkeypatch.setattr(settings, "LLM_RETRY_BASE_DELAY_SECONDS", 0.001)
+    monkeypatch.setattr(settings, "LLM_RETRY_MAX_DELAY_SECONDS", 0.001)
+
+
+def make_service(ttft_ms: float = 0, error_rate: float = 0.0) -> LLMService:
+    provider = FakeLLMProvider(
+        latency_distribution="constant", ttft_ms=ttft_ms, token_ms=0,
+        response_words=20, error_rate=error_rate, seed=1,
+    )
+    return LLMService(provider)
+
+
+def half_open(service: LLMService) -> None:
+    """Put the breaker where the next call is its half-open trial"""
+    breaker = service.circuit_breaker
+    breaker.state = CircuitBreaker.OPEN
+    breaker.opened_at = time.monotonic() - breaker.reset_timeout - 1
+
+
+def test_generate_text_succeeds():
+    service = make_service()
+    text = asyncio.run(service.generate_text("How long is our runway?"))
+    assert text.startswith("Fake")
+    assert service.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+def test_transient_errors_open_the_breaker():
+    service = make_service(error_rate=1.0)
+    threshold = service.circuit_breaker.failure_threshold
+
+    async def run():
+        for i in range(threshold):
+            with pytest.raises(openai.APIConnectionError):
+                await service.generate_text(f"prompt {i}")
+        with pytest.raises(CircuitOpenError):
+            await service.generate_text("one more")
+
+    asyncio.run(run())
+    assert service.circuit_breaker.state == CircuitBreaker.OPEN
+
+
+def test_half_open_success_closes_the_breaker():
+    service = make_service()
+    half_open(service)
+    asyncio.run(service.generate_text("trial"))
+    assert service.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_trial_does_not_close_the_breaker():
+    service = make_service(ttft_ms=1000)
+    half_open(service)
+    messages = service._to_langchain_messages([{"role": "user", "content": "slow"}])
+
+    async def run():
+        call = asyncio.create_task(service._invoke(LLMTask.CHAT, messages))
+        await asyncio.sleep(0.05)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+    asyncio.run(run())
+    breaker = service.circuit_breaker
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.consecutive_failures == 0
+    breaker.before_call()  # Trial slot was released for the next caller
+
+
+def test_abandoned_stream_does_not_close_the_breaker():
+    service = make_service()
+    half_open(service)
+
+    async def run():
+        stream = service.stream_text("Tell me about our burn")
+        assert await stream.__anext__()
+        await stream.aclose()  # Client disconnected
+
+    asyncio.run(run())
+    assert service.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_completed_stream_closes_the_breaker():
+    service = make_service()
+    half_open(service)
+
+    async def run():
+        return [chunk async for chunk in service.stream_text("Tell me about our burn")]
+
+    assert "".join(asyncio.run(run())).startswith("Fake")
+    assert service.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+def test_timeouts_map_to_504():
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    assert _llm_http_error(openai.APITimeoutError(request=request)).status_code == 504
+    assert _llm_http_error(asyncio.TimeoutError()).status_code == 504
+    assert _llm_http_error(CircuitOpenError("llm", 5)).status_code == 503
+    assert _llm_http_error(ValueError("boom")).status_code == 500
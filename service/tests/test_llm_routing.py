@@ -0,0 +1,93 @@
+import asyncio
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.middleware.auth import get_current_user
+from app.router.llm import router as llm_router
+from app.services.base.llm_provider import LLMProvider
+from app.services.default.fake_llm_provider import FakeLLMProvider
+from app.services.llm_service import LLMService, get_llm_service
+from app.services.model_router import LLMTask
+
+PROFILES = {
+    "default": {"model": "default-model", "temperature": 0.0, "max_tokens": 256, "timeout": 5, "latency_slo": 5},
+    "strong": {"model": "strong-model", "temperature": 0.0, "max_tokens": 256, "timeout": 5, "latency_slo": 0.05},
+}
+
+
+class PerProfileProvider(LLMProvider):
+    """Fake provider with its own latency per model profile"""
+
+    name = "fake"
+
+    def __init__(self, **providers: FakeLLMProvider):
+        self.providers = providers
+
+    def create_chat_model(self, profile):
+        return self.providers[profile.name].create_chat_model(profile)
+
+
+def fake(ttft_ms: float, token_ms: float = 0, words: int = 20) -> FakeLLMProvider:
+    return FakeLLMProvider(latency_distribution="constant", ttft_ms=ttft_ms, token_ms=token_ms, response_words=words, seed=1)
+
+
+@pytest.fixture(autouse=True)
+def routes(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MODEL_PROFILES", PROFILES)
+    monkeypatch.setattr(settings, "LLM_TASK_ROUTES", {"chat": ["strong", "default"], "comparison": ["strong", "default"]})
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 0)
+
+
+def test_long_answer_is_not_cut_off_at_the_slo():
+    # First token well within the 50 ms SLO, whole answer ~200 ms
+    service = LLMService(PerProfileProvider(strong=fake(ttft_ms=5, token_ms=5, words=40), default=fake(ttft_ms=0)))
+    text = asyncio.run(service.generate_text("Compare these", task=LLMTask.COMPARISON))
+    assert text.startswith("Fake strong response")
+    stats = service.router.stats()["profiles"]
+    assert stats["strong"]["slo_misses"] == 0
+    assert stats["default"]["calls"] == 0
+
+
+def test_slow_first_token_falls_back_and_demotes_the_profile():
+    service = LLMService(PerProfileProvider(strong=fake(ttft_ms=300), default=fake(ttft_ms=0)))
+
+    async def run():
+        first = await service.generate_text("Compare these", task=LLMTask.COMPARISON)
+        second = await service.generate_text("Compare those", task=LLMTask.COMPARISON)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.startswith("Fake default response")
+    assert second.startswith("Fake default response")
+    stats = service.router.stats()["profiles"]
+    assert stats["strong"]["slo_misses"] == 1  # Demoted: the second call didn't wait for it again
+    assert stats["strong"]["degraded"] is True
+    assert [profile.name for profile in service.router.route(LLMTask.COMPARISON)] == ["default", "strong"]
+
+
+def sse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines.get("event"), json.loads(lines["data"])))
+    return events
+
+
+def make_client(service: LLMService) -> TestClient:
+    app = FastAPI()
+    app.include_router(llm_router)
+    app.dependency_overrides[get_current_user] = lambda: None
+    app.dependency_overrides[get_llm_service] = lambda: service
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("strong_ttft_ms, model", [(0, "strong-model"), (300, "default-model")])
+def test_stream_done_event_reports_the_model_that_answered(strong_ttft_ms, model):
+    service = LLMService(PerProfileProvider(strong=fake(ttft_ms=strong_ttft_ms), default=fake(ttft_ms=0)))
+    response = make_client(service).post("/llm/chat/stream", json={"messages": [{"role": "user", "content": "Hi"}]})
+    events = sse_events(response.text)
+    assert events[0][0] == "token"
+    assert events[-1][0] == "done"
+    assert events[-1][1]["model"] == model
@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from tortoise import Tortoise
+from app.config import TORTOISE_ORM, settings
+from app.models.llm_usage import LLMUsage
+from app.models.user import User
+from app.services import llm_service as llm_service_module
+from app.services.default.fake_llm_provider import FakeLLMProvider
+from app.services.llm_service import LLMService
+from app.services.llm_telemetry import CacheStatus, LLMCallRecord, LLMTelemetry, estimate_cost_usd
+from app.services.model_router import LLMTask
+from app.utils.request_context import current_user_id
+
+PROFILES = {
+    "default": {"model": "gpt-4o-mini", "temperature": 0.0, "max_tokens": 256, "timeout": 5, "latency_slo": 5},
+}
+
+
+@pytest.fixture
+def telemetry(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MODEL_PROFILES", PROFILES)
+    monkeypatch.setattr(settings, "LLM_TASK_ROUTES", {"chat": ["default"]})
+    telemetry = LLMTelemetry(flush_interval=60)
+    monkeypatch.setattr(llm_service_module, "llm_telemetry", telemetry)
+    return telemetry
+
+
+def fake_service() -> LLMService:
+    return LLMService(FakeLLMProvider(latency_distribution="constant", ttft_ms=5, token_ms=0, response_words=20, seed=1))
+
+
+async def with_db(fn):
+    await Tortoise.init(config={**TORTOISE_ORM, "connections": {"default": "sqlite://:memory:"}})
+    await Tortoise.generate_schemas()
+    try:
+        return await fn()
+    finally:
+        await Tortoise.close_connections()
+
+
+def test_estimate_cost_usd():
+    assert estimate_cost_usd("gpt-4o", 1_000_000, 1_000_000) == pytest.approx(12.5)
+    assert estimate_cost_usd("gpt-4o-mini", 2000, 1000) == pytest.approx((2000 * 0.15 + 1000 * 0.60) / 1_000_000)
+    assert estimate_cost_usd("unpriced-model", 1000, 1000) == 0.0
+
+
+def test_per_task_histograms(telemetry):
+    service = fake_service()
+
+    async def run():
+        await service.chat([{"role": "user", "content": "How long is our runway?"}])
+        await asyncio.gather(*(service.generate_text("Summarize Q3", task=LLMTask.SUMMARIZATION) for _ in range(2)))
+        return [chunk async for chunk in service.stream_text("Summarize Q4", task=LLMTask.SUMMARIZATION)]
+
+    asyncio.run(run())
+    chat, summarization = telemetry.stats()["chat"], telemetry.stats()["summarization"]
+    assert (chat["calls"], chat["streamed"], chat["cache"]) == (1, 0, {CacheStatus.MISS: 1})
+    assert chat["models"] == {"gpt-4o-mini": 1}
+    assert chat["ttft_ms"]["count"] == 0
+    assert summarization["calls"] == 3
+    assert summarization["streamed"] == 1
+    assert summarization["cache"] == {CacheStatus.MISS: 2, CacheStatus.COALESCED: 1}
+    assert summarization["latency_ms"]["count"] == 3
+    assert summarization["ttft_ms"]["count"] == 1  # Streaming calls only
+    assert summarization["prompt_tokens"]["count"] == 2  # Coalesced calls spend no tokens
+    assert chat["estimated_cost_usd"] == pytest.approx(
+        estimate_cost_usd("gpt-4o-mini", chat["prompt_tokens"]["sum"], chat["completion_tokens"]["sum"]), abs=1e-6
+    )
+
+
+def test_usage_rows_after_a_call_and_flush(telemetry):
+    service = fake_service()
+
+    async def run():
+        user = await User.create(email="a@example.com", name="A", google_id="1")
+        current_user_id.set(user.id)
+        await service.chat([{"role": "user", "content": "How long is our runway?"}])
+        await service.parse_nlp_to_template("hire 2 engineers in month 3")  # Fast path
+        await telemetry.flush()
+        await service.chat([{"role": "user", "content": "And if we hire two more?"}])
+        telemetry.record(LLMCallRecord(task="chat", model="gpt-4o-mini", cache_status=CacheStatus.MISS,
+                                       latency_ms=10, error="APIConnectionError"))  # No user: not stored
+        await telemetry.flush()
+        return {row.task: row for row in await LLMUsage.filter(user_id=user.id)}
+
+    rows = asyncio.run(with_db(run))
+    chat, extraction = rows["chat"], rows["extraction"]
+    assert (chat.model, chat.calls, chat.errors, chat.cache_hits) == ("gpt-4o-mini", 2, 0, 0)
+    assert chat.prompt_tokens > 0 and chat.completion_tokens > 0
+    assert float(chat.cost_usd) == pytest.approx(
+        estimate_cost_usd("gpt-4o-mini", chat.prompt_tokens, chat.completion_tokens), abs=1e-6
+    )
+    assert chat.total_latency_ms > 0
+    assert (extraction.model, extraction.calls, extraction.cache_hits, extraction.prompt_tokens) == ("local", 1, 1, 0)
+    assert float(extraction.cost_usd) == 0
+    assert telemetry.stats()["chat"]["errors"] == {"APIConnectionError": 1}
@@ -0,0 +1,57 @@
+import asyncio
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.middleware.loop_guard import BlockingCallGuardMiddleware
+from app.utils.loop_monitor import BlockingCallError, LoopLagMonitor
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(BlockingCallGuardMiddleware, max_block_ms=50)
+
+    @app.get("/blocking")
+    async def blocking():
+        time.sleep(0.2)
+        return {"ok": True}
+
+    @app.get("/yielding")
+    async def yielding():
+        for _ in range(5):
+            await asyncio.sleep(0.04)  # 200 ms in total, but never 50 ms without yielding
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_blocking_handler_fails_the_request(client):
+    with pytest.raises(BlockingCallError, match=r"GET /blocking blocked the event loop for \d+ ms \(limit 50 ms\)"):
+        client.get("/blocking")
+
+
+def test_yielding_handler_passes(client):
+    assert client.get("/yielding").json() == {"ok": True}
+
+
+def test_watchdog_captures_the_blocking_stack():
+    def busy_helper():
+        time.sleep(0.2)
+
+    async def run():
+        monitor = LoopLagMonitor(interval=0.01, block_threshold_ms=50)
+        await monitor.start()
+        await asyncio.sleep(0.05)
+        busy_helper()
+        await asyncio.sleep(0.05)  # Let the monitor task record how long the block lasted
+        await monitor.stop()
+        return monitor
+
+    monitor = asyncio.run(run())
+    assert monitor.blocks == 1
+    block = monitor.recent_blocks[0]
+    assert "busy_helper" in block["stack"][-1]
+    assert block["captured_after_ms"] >= 50
+    assert block["duration_ms"] >= 150
+    assert monitor.stats()["block_ms"]["count"] == 1
@@ -0,0 +1,40 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.router.metrics import router as metrics_router
+from app.services.app_metrics import AppMetrics
+from app.utils.prometheus import SnapshotStore, add_sample, family
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(metrics_router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("token", ["", "secret"])
+def test_metrics_requires_the_token(monkeypatch, token):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", token)
+    client = make_client()
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer "}).status_code == 401
+
+
+def test_metrics_with_token(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "secret")
+    response = make_client().get("/metrics", headers={"Authorization": "Bearer secret"})
+    assert response.status_code == 200
+    assert "app_workers 1" in response.text
+
+
+def test_peer_snapshots_are_merged(tmp_path):
+    peer = SnapshotStore(str(tmp_path), interval=60)
+    peer.path = str(tmp_path / "peer.json")
+    workers = family("app_workers", "gauge", "Worker processes reporting metrics")
+    add_sample(workers, 1)
+    peer.write([workers])
+
+    metrics = AppMetrics(multiproc_dir=str(tmp_path), snapshot_interval=60, loop_interval=1, block_threshold_ms=0)
+    assert "app_workers 2" in asyncio.run(metrics.render())
@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from app.config import settings
+from app.services.default.fake_llm_provider import FakeLLMProvider
+from app.services.llm_service import LLMService
+from app.services.nlp_batch import parse_nlp_batch
+
+FAST = "hire 2 engineers in month 3"
+NEEDS_LLM = "Plan a marketing push for our B2B launch with a small agency"
+ALSO_NEEDS_LLM = "Open a sales office in Berlin staffed by contractors"
+
+
+@pytest.fixture(autouse=True)
+def no_retries(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 0)
+
+
+def fake_service(error_rate: float = 0.0) -> LLMService:
+    return LLMService(FakeLLMProvider(
+        latency_distribution="constant", ttft_ms=5, token_ms=0, error_rate=error_rate, seed=1
+    ))
+
+
+def run_batch(service: LLMService, nlp_inputs, concurrency: int = 4):
+    async def run():
+        return [item async for item in parse_nlp_batch(service, nlp_inputs, concurrency)]
+
+    items = asyncio.run(run())
+    return items[:-1], items[-1]["summary"]
+
+
+def test_local_results_come_first():
+    results, summary = run_batch(fake_service(), [NEEDS_LLM, FAST, ALSO_NEEDS_LLM, FAST])
+    assert [(r["index"], r["source"]) for r in results[:2]] == [(1, "fast_path"), (3, "fast_path")]
+    assert sorted(r["index"] for r in results[2:]) == [0, 2]
+    assert all(r["status"] == "ok" and r["source"] == "llm" for r in results[2:])
+    assert all(r["result"]["costs"] for r in results)
+    assert summary == {"total": 4, "ok": 4, "error": 0, "sources": {"fast_path": 2, "cache": 0, "llm": 2}}
+
+
+def test_queued_duplicates_reuse_earlier_llm_results():
+    service = fake_service()
+    results, summary = run_batch(service, [NEEDS_LLM, NEEDS_LLM], concurrency=1)
+    assert [(r["index"], r["source"]) for r in results] == [(0, "llm"), (1, "cache")]
+    assert results[0]["result"] == results[1]["result"]
+    assert summary["sources"] == {"fast_path": 0, "cache": 1, "llm": 1}
+    assert service.provider.synthesized == 1
+
+
+def test_provider_errors_become_per_input_errors():
+    results, summary = run_batch(fake_service(error_rate=1.0), [NEEDS_LLM, FAST, ALSO_NEEDS_LLM])
+    by_index = {r["index"]: r for r in results}
+    assert by_index[1]["status"] == "ok"
+    for index in (0, 2):
+        assert by_index[index]["status"] == "error"
+        assert by_index[index]["error"]
+        assert "result" not in by_index[index]
+    assert summary == {"total": 3, "ok": 1, "error": 2, "sources": {"fast_path": 1, "cache": 0, "llm": 0}}
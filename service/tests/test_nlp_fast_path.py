@@ -0,0 +1,20 @@
+from app.services.nlp_fast_path import parse_fast_path
+
+
+def test_headcount_with_start_month():
+    result = parse_fast_path("hire 2 engineers in month 3")
+    assert result.confidence == 1.0
+    costs = result.data["costs"]
+    assert len(costs) == 2
+    assert all(cost["starts_at"] == "3" for cost in costs)
+
+
+def test_out_of_range_month_is_left_to_the_llm():
+    assert parse_fast_path("hire 2 engineers in month 13") is None
+
+
+def test_out_of_range_month_lowers_confidence():
+    result = parse_fast_path("hire 2 engineers in month 13 and raise $1M seed")
+    assert result is not None
+    assert result.confidence < 1.0
+    assert result.data["costs"] == []
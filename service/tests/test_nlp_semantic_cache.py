@@ -0,0 +1,51 @@
+from app.services.nlp_semantic_cache import SemanticParseCache
+
+
+def make_cache():
+    return SemanticParseCache(threshold=0.95, max_entries=10)
+
+
+def plan(costs=None, revenues=None, funding=0):
+    return {"scenario": {"name": "Plan", "funding": funding}, "costs": costs or [], "revenues": revenues or []}
+
+
+def engineers(count):
+    return [
+        {"title": f"Software Engineer #{seat}", "category": "Engineering", "value": "12500"}
+        for seat in range(1, count + 1)
+    ]
+
+
+def test_reordered_input_hits():
+    cache = make_cache()
+    cache.store("hire 3 engineers, 1M funding", plan(engineers(3), funding=1000000))
+    assert cache.lookup("1M funding and 3 engineers") is not None
+    assert cache.hits == 1
+
+
+def test_headcount_is_adjusted():
+    cache = make_cache()
+    cache.store("hire 3 engineers", plan(engineers(3)))
+    result = cache.lookup("hire 4 engineers")
+    assert [cost["title"] for cost in result["costs"]] == [f"Software Engineer #{seat}" for seat in range(1, 5)]
+    assert cache.adjusted_hits == 1
+
+
+def test_different_provider_misses():
+    cache = make_cache()
+    cache.store("AWS hosting 2K per month", plan([{"title": "AWS", "category": "Hosting", "value": "2000"}]))
+    assert cache.lookup("GCP hosting 2K per month") is None
+
+
+def test_different_frequency_misses():
+    cache = make_cache()
+    cache.store("hosting 2K per month", plan([{"title": "Hosting", "category": "Hosting", "value": "2000"}]))
+    assert cache.lookup("hosting 2K per year") is None
+
+
+def test_negated_or_opposite_input_misses():
+    cache = make_cache()
+    cache.store("hire 3 engineers", plan(engineers(3)))
+    assert cache.lookup("do not hire 3 engineers") is None
+    assert cache.lookup("fire 3 engineers") is None
+    assert cache.hits == 0
@@ -0,0 +1,25 @@
+import asyncio
+from app.utils import profiling
+from app.utils.profiling import CoroutineProfile
+
+
+async def handler():
+    await asyncio.sleep(0.01)
+    return "done"
+
+
+def test_await_sites_point_at_application_code(monkeypatch):
+    # Treat this test module as application code
+    monkeypatch.setattr(profiling, "_APP_DIR", __file__.rsplit("/", 1)[0])
+    profile = CoroutineProfile(cpu=False)
+    assert asyncio.run(profile.run(handler())) == "done"
+    sites = [entry["site"] for entry in profile.top_awaits()]
+    assert sites and sites[0].startswith("tests/test_profiling.py:")
+    assert sites[0].endswith(" handler")
+
+
+def test_await_site_falls_back_to_innermost_frame():
+    # Outside app/, nothing is application code: the library frame is all there is
+    profile = CoroutineProfile(cpu=False)
+    asyncio.run(profile.run(handler()))
+    assert profile.top_awaits()[0]["site"].endswith(" sleep")
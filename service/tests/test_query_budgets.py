@@ -0,0 +1,78 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from tortoise.contrib.fastapi import register_tortoise
+from app.config import TORTOISE_ORM
+from app.middleware.auth import get_current_user
+from app.models.cost import Cost
+from app.models.revenue import Revenue
+from app.models.scenario import Scenario
+from app.models.user import User
+from app.router.costs import router as costs_router
+from app.services.scenario_comparison import load_comparison_data, load_multi_comparison
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(costs_router)
+    app.dependency_overrides[get_current_user] = lambda: None
+    register_tortoise(
+        app,
+        config={**TORTOISE_ORM, "connections": {"default": "sqlite://:memory:"}},
+        generate_schemas=True,
+    )
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def scenario_ids(client):
+    async def seed():
+        user = await User.create(email="a@example.com", name="A", google_id="1")
+        ids = []
+        for n in range(3):
+            scenario = await Scenario.create(name=f"Plan {n}", funding=1000000, user=user)
+            for month in range(1, 6):
+                await Cost.create(title=f"Engineer {month}", value=150000, category="Engineering",
+                                  starts_at=month, freq="annual", scenario=scenario)
+                await Revenue.create(title=f"Plan {month}", value=12000, category="Revenue",
+                                     starts_at=month, freq="annual", scenario=scenario)
+            ids.append(str(scenario.id))
+        return ids
+
+    return client.portal.call(seed)
+
+
+def cost(scenario_id, n):
+    return {"title": f"Engineer {n}", "value": 150000, "category": "Engineering", "starts_at": 1,
+            "freq": "annual", "scenario_id": scenario_id}
+
+
+@pytest.mark.parametrize("count", [1, 25])
+def test_bulk_costs_do_not_query_per_item(client, scenario_ids, query_capture, count):
+    response = client.post("/costs/bulk", json={"costs": [cost(scenario_ids[n % 2], n) for n in range(count)]})
+    assert response.status_code == 201
+    assert len(response.json()) == count
+    query_capture.assert_max_queries(2)  # Scenario lookup + one insert
+    query_capture.assert_no_repeated_queries()
+
+
+def test_bulk_costs_unknown_scenario(client, scenario_ids):
+    response = client.post("/costs/bulk", json={"costs": [cost("00000000-0000-0000-0000-000000000000", 1)]})
+    assert response.status_code == 500
+    assert client.portal.call(Cost.filter(title="Engineer 1", starts_at=1).count) == 3
+
+
+def test_compare_scenarios(client, scenario_ids, query_capture):
+    scenario1, scenario2, data1, data2 = client.portal.call(load_comparison_data, *scenario_ids[:2])
+    assert {str(scenario1.id), str(scenario2.id)} == set(scenario_ids[:2])
+    query_capture.assert_max_queries(3)  # Scenarios, costs, revenues
+    query_capture.assert_no_repeated_queries()
+
+
+def test_multi_comparison(client, scenario_ids, query_capture):
+    scenarios, rows = client.portal.call(load_multi_comparison, scenario_ids)
+    assert [row["id"] for row in rows] == scenario_ids
+    query_capture.assert_max_queries(3)
+    query_capture.assert_no_repeated_queries()
@@ -0,0 +1,213 @@
+import asyncio
+import json
+from uuid import uuid4
+import httpx
+import pytest
+from fastapi import FastAPI
+from tortoise import Tortoise
+from app.config import TORTOISE_ORM
+from app.middleware.auth import get_current_user
+from app.models.cost import Cost
+from app.models.scenario import Scenario
+from app.models.user import User
+from app.router.costs import router as costs_router
+from app.router.scenarios import router as scenarios_router
+from app.services import scenario_events as scenario_events_module
+from app.services.scenario_events import ScenarioEventHub, scenario_events
+
+DEBOUNCE = 0.01
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    """Headline metrics by scenario ID, without a database (missing = deleted)"""
+    by_scenario = {}
+
+    async def load(scenario_id):
+        return by_scenario.get(scenario_id)
+
+    monkeypatch.setattr(scenario_events_module, "load_headline_metrics", load)
+    return by_scenario
+
+
+def drain(queue: asyncio.Queue):
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+def test_changes_within_the_debounce_window_are_merged(metrics):
+    scenario_id = uuid4()
+    metrics[scenario_id] = {"net_burn": 10.0}
+
+    async def run():
+        hub = ScenarioEventHub(debounce_seconds=DEBOUNCE, queue_size=10)
+        queue = hub.subscribe(scenario_id)
+        hub.publish(scenario_id, "costs", rows=[{"id": "a", "value": 1}, {"id": "b", "value": 1}])
+        hub.publish(scenario_id, "costs", rows=[{"id": "a", "value": 2}])
+        hub.publish(scenario_id, "costs", deleted_ids=["b"])
+        hub.publish(scenario_id, "revenues", deleted_ids=["r"])
+        hub.publish(scenario_id, "revenues", rows=[{"id": "r", "value": 5}])
+        hub.publish(scenario_id, "scenario", rows=[{"id": str(scenario_id), "name": "Renamed"}])
+        await asyncio.sleep(DEBOUNCE * 5)
+        return drain(queue)
+
+    [(event, delta)] = asyncio.run(run())
+    assert event == "delta"
+    assert delta["seq"] == 1
+    assert delta["metrics"] == {"net_burn": 10.0}
+    assert delta["scenario"]["name"] == "Renamed"
+    assert delta["costs"] == {"upserted": [{"id": "a", "value": 2}], "deleted": ["b"]}
+    assert delta["revenues"] == {"upserted": [{"id": "r", "value": 5}], "deleted": []}
+
+
+def test_publish_without_subscribers_is_a_no_op(metrics):
+    async def run():
+        hub = ScenarioEventHub(debounce_seconds=DEBOUNCE, queue_size=10)
+        hub.publish(uuid4(), "costs", rows=[{"id": "a"}])
+        return hub._pending
+
+    assert asyncio.run(run()) == {}
+
+
+def test_full_queue_is_replaced_by_resync(metrics):
+    scenario_id = uuid4()
+    metrics[scenario_id] = {"net_burn": 10.0}
+
+    async def run():
+        hub = ScenarioEventHub(debounce_seconds=DEBOUNCE, queue_size=2)
+        slow = hub.subscribe(scenario_id)
+        fast = hub.subscribe(scenario_id)
+        fast_events = []
+        for n in range(3):
+            hub.publish(scenario_id, "costs", rows=[{"id": str(n)}])
+            await asyncio.sleep(DEBOUNCE * 5)
+            fast_events += drain(fast)
+        return drain(slow), fast_events
+
+    slow_events, fast_events = asyncio.run(run())
+    assert slow_events == [("resync", {"scenario_id": str(scenario_id)})]
+    assert [delta["seq"] for _, delta in fast_events] == [1, 2, 3]
+
+
+def test_deleted_scenario_gets_a_deleted_event(metrics):
+    scenario_id = uuid4()
+
+    async def run():
+        hub = ScenarioEventHub(debounce_seconds=DEBOUNCE, queue_size=10)
+        queue = hub.subscribe(scenario_id)
+        hub.publish(scenario_id, "scenario", deleted_ids=[scenario_id])
+        await asyncio.sleep(DEBOUNCE * 5)
+        return drain(queue)
+
+    assert asyncio.run(run()) == [("deleted", {"scenario_id": str(scenario_id), "seq": 1})]
+
+
+async def with_app(fn):
+    app = FastAPI()
+    app.include_router(costs_router)
+    app.include_router(scenarios_router)
+    app.dependency_overrides[get_current_user] = lambda: None
+    await Tortoise.init(config={**TORTOISE_ORM, "connections": {"default": "sqlite://:memory:"}})
+    await Tortoise.generate_schemas()
+    try:
+        user = await User.create(email="a@example.com", name="A", google_id="1")
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await fn(app, client, user)
+    finally:
+        await Tortoise.close_connections()
+
+
+async def open_stream(app: FastAPI, path: str):
+    """Run a streaming GET as a task; returns it and a queue of (event, data) tuples"""
+    events: asyncio.Queue = asyncio.Queue()
+    buffer = ""
+
+    async def receive():
+        await asyncio.Event().wait()  # The client never disconnects
+
+    async def send(message):
+        nonlocal buffer
+        if message["type"] != "http.response.body":
+            return
+        buffer += message.get("body", b"").decode()
+        while "\n\n" in buffer:
+            block, buffer = buffer.split("\n\n", 1)
+            lines = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+            if lines:
+                events.put_nowait((lines["event"], json.loads(lines["data"])))
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "server": ("test", 80), "client": ("test", 1),
+    }
+    task = asyncio.create_task(app(scope, receive, send))
+    return task, events
+
+
+def cost_body(scenario_id):
+    return {"title": "Engineer", "value": 120000, "category": "Engineering", "starts_at": 1,
+            "freq": "annual", "scenario_id": str(scenario_id)}
+
+
+def test_events_endpoint_streams_snapshot_deltas_and_ends_on_delete():
+    async def run(app, client, user):
+        scenario = await Scenario.create(name="Plan", funding=1000000, user=user)
+        task, events = await open_stream(app, f"/scenarios/{scenario.id}/events")
+        snapshot = await asyncio.wait_for(events.get(), 1)
+
+        created = (await client.post("/costs", json=cost_body(scenario.id))).json()
+        delta = await asyncio.wait_for(events.get(), 1)
+
+        assert (await client.delete(f"/scenarios/{scenario.id}")).status_code == 204
+        deleted = await asyncio.wait_for(events.get(), 1)
+        await asyncio.wait_for(task, 1)  # The stream ends after `deleted`
+        return scenario, created, snapshot, delta, deleted
+
+    scenario, created, snapshot, delta, deleted = asyncio.run(with_app(run))
+    assert snapshot[0] == "snapshot"
+    assert snapshot[1]["metrics"]["total_costs"] == 0
+    assert delta[0] == "delta"
+    assert delta[1]["costs"]["upserted"][0]["id"] == created["id"]
+    assert delta[1]["metrics"]["total_costs"] == 120000
+    assert deleted == ("deleted", {"scenario_id": str(scenario.id), "seq": delta[1]["seq"] + 1})
+    assert scenario.id not in scenario_events._subscribers
+
+
+def test_events_endpoint_unknown_scenario_is_404():
+    async def run(app, client, user):
+        response = await client.get(f"/scenarios/{uuid4()}/events")
+        return response.status_code, dict(scenario_events._subscribers)
+
+    status_code, subscribers = asyncio.run(with_app(run))
+    assert status_code == 404
+    assert subscribers == {}
+
+
+def test_moved_cost_is_deleted_from_the_old_scenario():
+    async def run(app, client, user):
+        source = await Scenario.create(name="Source", funding=1000000, user=user)
+        target = await Scenario.create(name="Target", funding=1000000, user=user)
+        cost = await Cost.create(title="Engineer", value=120000, category="Engineering", starts_at=1,
+                                 freq="annual", scenario=source)
+        source_updates = scenario_events.subscribe(source.id)
+        target_updates = scenario_events.subscribe(target.id)
+        try:
+            response = await client.put(f"/costs/{cost.id}", json={"scenario_id": str(target.id)})
+            assert response.status_code == 200
+            source_event = await asyncio.wait_for(source_updates.get(), 1)
+            target_event = await asyncio.wait_for(target_updates.get(), 1)
+        finally:
+            scenario_events.unsubscribe(source.id, source_updates)
+            scenario_events.unsubscribe(target.id, target_updates)
+        return str(cost.id), source_event, target_event
+
+    cost_id, (source_event, source_delta), (target_event, target_delta) = asyncio.run(with_app(run))
+    assert source_event == target_event == "delta"
+    assert source_delta["costs"] == {"upserted": [], "deleted": [cost_id]}
+    assert source_delta["metrics"]["total_costs"] == 0
+    assert [row["id"] for row in target_delta["costs"]["upserted"]] == [cost_id]
+    assert target_delta["costs"]["deleted"] == []
+    assert target_delta["metrics"]["total_costs"] == 120000
@@ -0,0 +1,53 @@
+import re
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from tortoise.contrib.fastapi import register_tortoise
+from app.config import TORTOISE_ORM
+from app.middleware.auth import get_current_user
+from app.middleware.server_timing import ServerTimingMiddleware, install_phase_hooks
+from app.router.costs import router as costs_router
+from app.utils.db_hooks import add_query_listener, install_query_hooks, remove_query_listener
+from app.utils.request_timing import record_query
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(costs_router)
+    app.add_middleware(ServerTimingMiddleware, emit_header=True)
+    app.dependency_overrides[get_current_user] = lambda: None
+    install_phase_hooks()
+    add_query_listener(record_query)
+    register_tortoise(
+        app,
+        config={**TORTOISE_ORM, "connections": {"default": "sqlite://:memory:"}},
+        generate_schemas=True,
+    )
+    try:
+        with TestClient(app) as client:
+            install_query_hooks()
+            yield client
+    finally:
+        remove_query_listener(record_query)
+
+
+def test_server_timing_header_has_db_handler_and_serialize_phases(client):
+    response = client.get("/costs")
+    assert response.status_code == 200
+    # Fails if a FastAPI upgrade stops looking up the hooked functions at call time
+    phases = dict(re.findall(r'(\w+);(?:desc="[^"]*";)?dur=([\d.]+)', response.headers["Server-Timing"]))
+    assert {"db", "handler", "serialize", "total"} <= phases.keys()
+    assert float(phases["handler"]) >= float(phases["db"])  # The handler phase includes its queries
+
+
+def test_no_header_unless_enabled():
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware, emit_header=False)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    install_phase_hooks()
+    assert "Server-Timing" not in TestClient(app).get("/ping").headers
@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from app.services.default.fake_llm_provider import FakeLLMProvider
+from app.services.llm_service import LLMService
+from app.utils.singleflight import SingleFlight
+
+
+def test_joiners_share_one_provider_call():
+    provider = FakeLLMProvider(latency_distribution="constant", ttft_ms=50, token_ms=0, response_words=10, seed=1)
+    service = LLMService(provider)
+    messages = [{"role": "user", "content": "Summarize my runway"}]
+
+    async def run():
+        return await asyncio.gather(*(service.chat(messages) for _ in range(5)))
+
+    responses = asyncio.run(run())
+    assert len(set(responses)) == 1
+    assert provider.generated == 1
+    assert service.singleflight.stats()["executed"] == 1
+    assert service.singleflight.stats()["coalesced"] == 4
+
+
+def test_cancelling_a_joiner_does_not_cancel_the_shared_call():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        first = asyncio.create_task(flight.do("key", work))
+        second = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await asyncio.gather(first, second, return_exceptions=True)
+
+    first, second = asyncio.run(run())
+    assert isinstance(first, asyncio.CancelledError)
+    assert second == "done"
+    assert calls == 1
+
+
+def test_exception_reaches_every_joiner():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("provider down")
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", work) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert [type(result) for result in results] == [ValueError] * 3
+    assert all(result is results[0] for result in results)
+    assert (flight.executed, flight.coalesced) == (1, 2)
+
+
+@pytest.mark.parametrize("fails", [False, True])
+def test_key_is_evicted_after_completion(fails):
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0)
+        if fails:
+            raise ValueError("provider down")
+        return "done"
+
+    async def run():
+        call = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        in_flight = flight.in_flight("key")
+        await asyncio.gather(call, return_exceptions=True)
+        await asyncio.gather(flight.do("key", work), return_exceptions=True)  # Runs again, no stale result
+        return in_flight
+
+    assert asyncio.run(run()) is True
+    assert not flight.in_flight("key")
+    assert flight.stats() == {"in_flight": 0, "executed": 2, "coalesced": 0, "coalesced_ratio": 0.0}
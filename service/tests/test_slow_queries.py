@@ -0,0 +1,34 @@
+import asyncio
+from tortoise import Tortoise, connections
+from tortoise.transactions import in_transaction
+from app.config import TORTOISE_ORM
+from app.models.scenario import Scenario
+from app.services.slow_queries import SlowQueryLog, base_client
+from app.utils.db_hooks import add_query_listener, install_query_hooks, remove_query_listener
+from app.utils.query_capture import capture_queries
+
+
+def test_explain_runs_outside_the_transaction_and_request_context():
+    log = SlowQueryLog(threshold_ms=0, sample_size=10, explain=True)
+
+    async def run():
+        await Tortoise.init(config={**TORTOISE_ORM, "connections": {"default": "sqlite://:memory:"}})
+        await Tortoise.generate_schemas()
+        install_query_hooks()
+        add_query_listener(log.record)
+        try:
+            with capture_queries(current_context_only=True) as request_queries:
+                async with in_transaction() as transaction:
+                    assert base_client("default") is not transaction
+                    assert base_client("default") is transaction._parent
+                    await Scenario.filter(name="Plan").first()
+            await asyncio.gather(*log._tasks)
+            return request_queries
+        finally:
+            remove_query_listener(log.record)
+            await connections.close_all()
+
+    request_queries = asyncio.run(run())
+    select = next(sample for sample in log.samples if sample["sql"].startswith("SELECT"))
+    assert select["plan"] and not select["plan"].startswith("EXPLAIN failed")
+    assert not any(statement.startswith("EXPLAIN") for statement in request_queries.statements)
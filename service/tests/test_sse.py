@@ -0,0 +1,100 @@
+import asyncio
+import json
+import pytest
+from app.config import settings
+from app.services.default.fake_llm_provider import FakeLLMProvider
+from app.services.llm_service import LLMService
+from app.utils.sse import format_sse, stream_llm_events
+
+
+@pytest.fixture(autouse=True)
+def no_retries(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 0)
+
+
+def fake_service(error_rate: float = 0.0) -> LLMService:
+    return LLMService(FakeLLMProvider(
+        latency_distribution="constant", ttft_ms=30, token_ms=1, response_words=10, error_rate=error_rate, seed=1
+    ))
+
+
+def parse(events):
+    parsed = []
+    for message in events:
+        event_line, data_line = message.rstrip("\n").split("\n")
+        parsed.append((event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))))
+    return parsed
+
+
+def collect(chunks, metadata=None, on_complete=None):
+    async def run():
+        return [event async for event in stream_llm_events(chunks(), metadata, on_complete)]
+
+    return parse(asyncio.run(run()))
+
+
+def test_tokens_then_done_with_timings():
+    service = fake_service()
+    stream = None
+
+    def chunks():
+        nonlocal stream
+        stream = service.stream_text("Explain our burn rate")
+        return stream
+
+    events = collect(chunks, {"scenario_id": "abc"})
+    tokens = [data["token"] for event, data in events[:-1]]
+    assert [event for event, _ in events[:-1]] == ["token"] * len(tokens)
+    assert "".join(tokens).startswith("Fake ")
+
+    event, done = events[-1]
+    assert event == "done"
+    assert done["scenario_id"] == "abc"
+    assert done["model"] == stream.model
+    assert done["chunks"] == len(tokens)
+    assert done["characters"] == len("".join(tokens))
+    assert 30 <= done["time_to_first_token_ms"] <= done["elapsed_ms"]
+
+
+def test_provider_failure_is_an_error_event():
+    service = fake_service(error_rate=1.0)
+    events = collect(lambda: service.stream_text("Explain our burn rate"))
+    assert [event for event, _ in events] == ["error"]
+    assert events[0][1]["detail"].startswith("LLM error: ")
+
+
+def test_failure_mid_stream_follows_the_tokens_sent_so_far():
+    async def chunks():
+        yield "Partial"
+        raise ConnectionError("stream reset")
+
+    events = collect(chunks)
+    assert events == [("token", {"token": "Partial"}), ("error", {"detail": "LLM error: stream reset"})]
+
+
+def test_on_complete_gets_the_full_text_before_done():
+    async def chunks():
+        for chunk in ("Hello", ", ", "world"):
+            yield chunk
+
+    completed = []
+
+    async def store(text):
+        completed.append(text)
+
+    events = collect(chunks, on_complete=store)
+    assert completed == ["Hello, world"]
+    assert events[-1][0] == "done"
+
+    async def fail(text):
+        raise RuntimeError("database is gone")
+
+    events = collect(chunks, on_complete=fail)
+    assert events[-1] == ("error", {"detail": "Failed to store response: database is gone"})
+    assert "done" not in [event for event, _ in events]
+
+
+def test_multiline_tokens_survive_the_framing():
+    message = format_sse({"token": "line one\n\nline two"}, event="token")
+    assert message.count("\n\n") == 1 and message.endswith("\n\n")
+    assert parse([message]) == [("token", {"token": "line one\n\nline two"})]
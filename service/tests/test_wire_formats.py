@@ -0,0 +1,48 @@
+import datetime
+import uuid
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.middleware.compression import CompressionMiddleware
+from app.utils.wire_format import ListLayout, list_response
+
+ROWS = [
+    {"id": uuid.UUID(int=i), "title": f"Engineer {i}", "created_at": datetime.datetime(2026, 1, 1)}
+    for i in range(50)
+]
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/rows")
+    async def rows(request: Request, layout: ListLayout = ListLayout.ROWS):
+        return list_response(request, ROWS, ("id", "title", "created_at"), layout)
+
+    return TestClient(app)
+
+
+def test_gzip_json_rows():
+    response = make_client().get("/rows", headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()[0] == {"id": str(uuid.UUID(int=0)), "title": "Engineer 0", "created_at": "2026-01-01T00:00:00"}
+
+
+def test_brotli_is_preferred_when_installed():
+    pytest.importorskip("brotli")
+    response = make_client().get("/rows", headers={"accept-encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert len(response.json()) == 50
+
+
+def test_msgpack_columns_when_installed():
+    msgpack = pytest.importorskip("msgpack")
+    response = make_client().get(
+        "/rows", params={"layout": "columns"},
+        headers={"accept": "application/msgpack", "accept-encoding": "identity"},
+    )
+    assert response.headers["content-type"] == "application/msgpack"
+    body = msgpack.unpackb(response.content)
+    assert body["count"] == 50
+    assert body["columns"]["title"][:2] == ["Engineer 0", "Engineer 1"]